@@ -0,0 +1,144 @@
+"""
+Metrics Benchmark - Dashboard and Inventory Numbers at Scale
+============================================================
+
+Times every number the Dashboard and Inventory views show (status totals,
+top-5 available components, per-component Available/Issued/Damaged and the
+course breakdown) for a synthetic items table, comparing:
+
+1. LOOPS:   the previous per-item Python generator sums over item dictionaries
+2. METRICS: mainV12.ItemMetrics over the columnar ItemStore (np.bincount)
+
+Also reports the memory held by the item dictionaries versus the ItemStore.
+
+Usage:
+    python benchmarks/metrics_bench.py
+    python benchmarks/metrics_bench.py --items 1000000 --components 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mainV12 import ItemMetrics, ItemStore, NUMPY_AVAILABLE  # noqa: E402
+
+STATUSES = ("Available", "Issued", "Damaged")
+
+
+def build_dataset(num_components: int, num_items: int):
+    """Create synthetic inventory and items shaped like the Supabase tables."""
+    courses = ["ECE101", "CS201", "ME210", "AE305", None]
+    inventory = [
+        {"id": i, "name": f"Component {i:04d}", "course": courses[i % len(courses)]}
+        for i in range(1, num_components + 1)
+    ]
+    weights = ["Available"] * 7 + ["Issued"] * 2 + ["Damaged"]
+    items = [
+        {
+            "id": i,
+            "serial_number": f"CMP{i:07d}",
+            "status": weights[(i * 7) % len(weights)],
+            "inventory_id": (i % num_components) + 1,
+        }
+        for i in range(1, num_items + 1)
+    ]
+    # Round-trip through JSON so the dictionaries look like a decoded API response
+    return inventory, json.loads(json.dumps(items))
+
+
+def loop_metrics(inventory, items):
+    """The previous approach: generator sums per card, chart and inventory row."""
+    total = len(items)
+    issued = sum(1 for item in items if item.get("status") == "Issued")
+    pie = {status: sum(1 for item in items if item.get("status") == status) for status in STATUSES}
+    per_component = {}
+    for inv in inventory:
+        per_component[inv["id"]] = {
+            status: sum(1 for item in items
+                        if item.get("inventory_id") == inv["id"] and item.get("status") == status)
+            for status in STATUSES
+        }
+    top = sorted(inventory, key=lambda inv: per_component[inv["id"]]["Available"], reverse=True)[:5]
+    return total, issued, pie, per_component, top
+
+
+def engine_metrics(inventory, metrics: ItemMetrics):
+    """The same numbers from the vectorized engine."""
+    total = metrics.total
+    issued = metrics.count("Issued")
+    pie = metrics.status_counts(STATUSES)
+    per_component = {inv["id"]: metrics.inventory_status_counts(inv["id"]) for inv in inventory}
+    top = metrics.top_components(inventory, n=5, status="Available")
+    courses = metrics.course_counts(inventory)
+    return total, issued, pie, per_component, top, courses
+
+
+def best_of(rounds: int, fn) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--components", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--loop-items", type=int, default=50_000,
+                        help="Items for the (slow) loop baseline; it scales linearly")
+    args = parser.parse_args()
+
+    inventory, items = build_dataset(args.components, args.items)
+
+    tracemalloc.start()
+    store = ItemStore(items)
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    decoded = json.loads(json.dumps(items[:100_000]))
+    dict_bytes = tracemalloc.get_traced_memory()[0] / min(len(items), 100_000) * len(items)
+    tracemalloc.stop()
+    del decoded
+
+    metrics = ItemMetrics(store)
+    engine_metrics(inventory, metrics)  # Warm the column copies
+
+    def recompute():
+        metrics._version = None  # Force a full recount (as after a sync or mutation)
+        engine_metrics(inventory, metrics)
+
+    cold_ms = best_of(args.rounds, recompute)
+    warm_ms = best_of(args.rounds, lambda: engine_metrics(inventory, metrics))
+
+    loop_items = items[:args.loop_items]
+    loop_ms = best_of(1, lambda: loop_metrics(inventory, loop_items)) * (len(items) / len(loop_items))
+
+    # Sanity check: both approaches agree on a subset
+    subset = ItemMetrics(ItemStore(loop_items))
+    _, issued, pie, per_component, top = loop_metrics(inventory, loop_items)
+    assert subset.count("Issued") == issued and subset.status_counts(STATUSES) == pie
+    assert all(subset.inventory_status_counts(i) == c for i, c in per_component.items())
+    assert [inv["id"] for inv, _ in subset.top_components(inventory)] == [inv["id"] for inv in top]
+
+    print(f"Items: {len(items):,}  Components: {len(inventory)}  NumPy: {NUMPY_AVAILABLE}")
+    print()
+    print(f"{'approach':<28} {'ms':>12}")
+    print(f"{'loops (extrapolated)':<28} {loop_ms:>12.1f}")
+    print(f"{'metrics, full recount':<28} {cold_ms:>12.2f}")
+    print(f"{'metrics, cached':<28} {warm_ms:>12.2f}")
+    print()
+    print(f"Memory: dicts ~{dict_bytes / 1e6:.1f} MB, ItemStore {store_bytes / 1e6:.1f} MB "
+          f"({dict_bytes / store_bytes:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
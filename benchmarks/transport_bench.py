@@ -0,0 +1,265 @@
+"""
+Transport Benchmark - Full Sync over the Shared HTTP Client
+============================================================
+
+Measures how many bytes and how much wall-clock time a full LabTrack sync
+(inventory, items, students, staff) costs with:
+
+1. BASELINE: a fresh connection per request, no compression, one table at a time
+2. SHARED:   the shared pool from mainV12.get_shared_http_client()
+             (keep-alive, gzip/brotli, tables fetched in parallel)
+
+By default the benchmark starts a small PostgREST-compatible stand-in server
+on localhost that serves synthetic lab data. It simulates network cost with
+--rtt-ms (per request) and --handshake-ms (per new connection, i.e. TCP + TLS).
+The stand-in speaks HTTP/1.1 only, so it shows the pooling and compression
+savings. Point --url/--key at a real PostgREST or Supabase project to
+include HTTP/2 multiplexing in the measurement.
+
+Usage:
+    python benchmarks/transport_bench.py
+    python benchmarks/transport_bench.py --items 50000 --rtt-ms 40
+    python benchmarks/transport_bench.py --url https://xyz.supabase.co --key <anon key>
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# The same selects DatabaseManager.fetch_all_tables() sends
+SYNC_QUERIES = [
+    ("inventory", "*"),
+    ("items", "id, serial_number, status, inventory_id"),
+    ("students", "*"),
+    ("staff", "*"),
+]
+
+# Items select used before the normalized fetch (inventory embedded per item)
+EMBEDDED_ITEMS_SELECT = "id, serial_number, status, inventory_id, inventory(name, course)"
+
+
+def build_dataset(num_components: int, num_items: int, num_students: int) -> dict:
+    """Create synthetic lab data shaped like the Supabase tables."""
+    courses = ["ECE101", "CS201", "ME210", "AE305", None]
+    inventory = [
+        {
+            "id": i,
+            "name": f"Component {i:04d}",
+            "total_qty": num_items // num_components,
+            "course": courses[i % len(courses)],
+            "description": "Synthetic component for benchmarking",
+            "custom_fields": {},
+            "created_at": "2024-01-15T10:30:00+00:00",
+            "updated_at": "2024-01-15T10:30:00+00:00",
+        }
+        for i in range(1, num_components + 1)
+    ]
+    statuses = ["Available"] * 7 + ["Issued"] * 2 + ["Damaged"]
+    items = [
+        {
+            "id": i,
+            "serial_number": f"CMP{i:06d}",
+            "status": statuses[i % len(statuses)],
+            "inventory_id": (i % num_components) + 1,
+        }
+        for i in range(1, num_items + 1)
+    ]
+    students = [
+        {
+            "id": i,
+            "name": f"Student {i}",
+            "student_id": f"STU{i:05d}",
+            "phone": f"555-{i:04d}",
+            "email": f"student{i}@university.edu",
+        }
+        for i in range(1, num_students + 1)
+    ]
+    staff = [{"id": i, "name": f"Staff {i}", "staff_id": f"STAFF{i:03d}"} for i in range(1, 6)]
+    return {"inventory": inventory, "items": items, "students": students, "staff": staff}
+
+
+class StandInServer:
+    """Minimal PostgREST-compatible server for GET /rest/v1/<table>?select=..."""
+
+    def __init__(self, dataset: dict, rtt_ms: float, handshake_ms: float):
+        self.dataset = dataset
+        self.inventory_by_id = {inv["id"]: inv for inv in dataset["inventory"]}
+        self.rtt = rtt_ms / 1000.0
+        self.handshake = handshake_ms / 1000.0
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def _render(self, table: str, select: str) -> bytes:
+        rows = self.dataset.get(table, [])
+        if table == "items" and "inventory(" in select:
+            # Embedded resource, exactly like PostgREST does it
+            rows = [
+                {**row, "inventory": {
+                    "name": self.inventory_by_id[row["inventory_id"]]["name"],
+                    "course": self.inventory_by_id[row["inventory_id"]]["course"],
+                }}
+                for row in rows
+            ]
+        return json.dumps(rows, separators=(",", ":")).encode()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive capable
+
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+                time.sleep(server.handshake)  # Simulated TCP + TLS setup
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                table = parsed.path.rsplit("/", 1)[-1]
+                select = parse_qs(parsed.query).get("select", ["*"])[0]
+                body = server._render(table, select)
+
+                accept = self.headers.get("Accept-Encoding", "")
+                encoding = None
+                if "br" in accept and BROTLI_AVAILABLE:
+                    body, encoding = brotli.compress(body, quality=4), "br"
+                elif "gzip" in accept:
+                    body, encoding = gzip.compress(body, compresslevel=5), "gzip"
+
+                time.sleep(server.rtt)  # Simulated network round trip
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if encoding:
+                    self.send_header("Content-Encoding", encoding)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+
+    def reset(self):
+        with self.lock:
+            self.connections = 0
+
+
+def _request(client: httpx.Client, base_url: str, key: str, table: str, select: str) -> int:
+    headers = {"apikey": key, "Authorization": f"Bearer {key}"} if key else {}
+    response = client.get(f"{base_url}/rest/v1/{table}", params={"select": select}, headers=headers)
+    response.raise_for_status()
+    return response.num_bytes_downloaded
+
+
+def run_baseline(base_url: str, key: str) -> int:
+    """One new connection per table, uncompressed, sequential."""
+    total = 0
+    for table, select in SYNC_QUERIES:
+        with httpx.Client(headers={"Accept-Encoding": "identity"}) as client:
+            total += _request(client, base_url, key, table, select)
+    return total
+
+
+def run_shared(client: httpx.Client, base_url: str, key: str) -> int:
+    """Shared pooled client, compressed, tables in parallel."""
+    with ThreadPoolExecutor(max_workers=len(SYNC_QUERIES)) as pool:
+        futures = [pool.submit(_request, client, base_url, key, t, s) for t, s in SYNC_QUERIES]
+        return sum(f.result() for f in futures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Real PostgREST/Supabase URL (default: local stand-in)")
+    parser.add_argument("--key", default=os.getenv("SUPABASE_KEY", ""), help="API key for --url")
+    parser.add_argument("--components", type=int, default=200)
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=30.0, help="Stand-in: delay per request")
+    parser.add_argument("--handshake-ms", type=float, default=60.0, help="Stand-in: delay per new connection")
+    parser.add_argument("--rounds", type=int, default=5, help="Full syncs per scenario")
+    parser.add_argument("--embedded", action="store_true",
+                        help="Use the old items select with embedded inventory(name, course)")
+    args = parser.parse_args()
+
+    if args.embedded:
+        SYNC_QUERIES[1] = ("items", EMBEDDED_ITEMS_SELECT)
+
+    from mainV12 import HTTP2_AVAILABLE, get_shared_http_client
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = StandInServer(
+            build_dataset(args.components, args.items, args.students),
+            args.rtt_ms, args.handshake_ms
+        )
+        server.start()
+        base_url = server.url
+
+    shared_client = get_shared_http_client()
+    print(f"Target: {base_url}")
+    print(f"Shared client: http2={HTTP2_AVAILABLE}, "
+          f"Accept-Encoding='{shared_client.headers.get('Accept-Encoding')}'")
+    print()
+
+    results = []
+    for name, run in [("baseline", lambda: run_baseline(base_url, args.key)),
+                      ("shared", lambda: run_shared(shared_client, base_url, args.key))]:
+        if server:
+            server.reset()
+        timings = []
+        wire_bytes = 0
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            wire_bytes += run()
+            timings.append((time.perf_counter() - start) * 1000)
+        wire_bytes //= args.rounds
+        timings.sort()
+        results.append((name, timings[len(timings) // 2], min(timings), wire_bytes,
+                        server.connections if server else None))
+
+    print(f"{'scenario':<10} {'median ms':>10} {'best ms':>10} {'bytes/sync':>12} {'connections':>12}")
+    for name, median, best, wire_bytes, connections in results:
+        print(f"{name:<10} {median:>10.1f} {best:>10.1f} {wire_bytes:>12} "
+              f"{connections if connections is not None else '-':>12}")
+
+    base, shared = results[0], results[1]
+    print()
+    print(f"Latency saved per full sync: {base[1] - shared[1]:.1f} ms ({(1 - shared[1] / base[1]) * 100:.0f}%)")
+    print(f"Bytes saved per full sync:   {base[3] - shared[3]} ({(1 - shared[3] / base[3]) * 100:.0f}%)")
+
+    if server:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
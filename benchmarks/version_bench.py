@@ -0,0 +1,237 @@
+"""
+Version Benchmark - DatabaseManager Across mainV1 ... mainV12
+=============================================================
+
+Loads the DatabaseManager of every snapshot (mainV1.py ... mainV12.py) in
+mock mode, swaps in the same large synthetic dataset, and runs a standard
+workload against each:
+
+1. serial lookup   get_item_by_serial
+2. name lookup     get_available_items_by_name
+3. issue           create_transaction (one cart of --cart items)
+4. return          return_item (the items issued in step 3)
+5. overdue scan    get_overdue_items(7)
+6. recent activity get_recent_transactions(5)
+7. bulk import     bulk_import_inventory (new and existing components)
+
+The output is a version-by-version table of the median milliseconds per
+call and the peak memory allocated by the workload, so you can see which
+refactors sped things up or slowed them down. A "-" means the version
+does not have that method yet.
+
+Each version runs in mock mode, so the timings measure the Python work
+in each version (scans, indexes, caches), not network round trips.
+
+Usage:
+    python benchmarks/version_bench.py
+    python benchmarks/version_bench.py --items 100000 --versions 4,8,11,12
+    python benchmarks/version_bench.py --json results.json
+"""
+
+import argparse
+import contextlib
+import copy
+import glob
+import importlib.util
+import io
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Force mock mode: an empty value also stops load_dotenv() from filling these in
+os.environ["SUPABASE_URL"] = ""
+os.environ["SUPABASE_KEY"] = ""
+
+OPERATIONS = ("serial lookup", "name lookup", "issue", "return", "overdue scan",
+              "recent activity", "bulk import")
+
+
+def build_dataset(num_components: int, num_items: int, num_students: int,
+                  num_loans: int, seed: int = 7) -> dict:
+    """Create synthetic mock tables shaped like DatabaseManager.mock_* (every version)."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    courses = ["ECE101", "CS201", "ME210", "AE305"]
+    inventory = [
+        {"id": i, "name": f"Component {i:04d}", "total_qty": 0, "course": courses[i % len(courses)],
+         "description": "Synthetic component"}
+        for i in range(1, num_components + 1)
+    ]
+    items = []
+    for i in range(1, num_items + 1):
+        inventory_id = (i % num_components) + 1
+        inventory[inventory_id - 1]["total_qty"] += 1
+        items.append({"id": i, "serial_number": f"CMP{i:07d}", "status": "Available",
+                      "inventory_id": inventory_id})
+    students = [
+        {"id": i, "name": f"Student {i}", "student_id": f"STU{i:05d}",
+         "phone": f"555-{i:04d}", "email": f"student{i}@university.edu"}
+        for i in range(1, num_students + 1)
+    ]
+    staff = [{"id": i, "name": f"Staff {i}", "staff_id": f"STAFF{i:03d}"} for i in range(1, 6)]
+
+    # Active loans, a third of them overdue; each holds 1-3 items
+    transactions, transaction_items = [], []
+    loan_items = iter(rng.sample(range(num_items), min(num_items // 2, num_loans * 3)))
+    for t in range(1, num_loans + 1):
+        issued = now - timedelta(days=10 if t % 3 == 0 else rng.randint(0, 5), minutes=t)
+        transactions.append({"id": t, "student_id": rng.randint(1, num_students), "issuer_id": 1,
+                             "status": "Active", "created_at": issued.isoformat(),
+                             "issue_date": issued.isoformat(), "expected_return_date": None})
+        for _ in range(rng.randint(1, 3)):
+            index = next(loan_items, None)
+            if index is None:
+                break
+            items[index]["status"] = "Issued"
+            transaction_items.append({"id": len(transaction_items) + 1, "transaction_id": t,
+                                      "item_id": items[index]["id"]})
+    return {"inventory": inventory, "items": items, "students": students, "staff": staff,
+            "transactions": transactions, "transaction_items": transaction_items}
+
+
+def load_version(path: str):
+    """Import one mainV<n>.py under a private module name."""
+    name = "labtrack_" + os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_db(module, dataset: dict):
+    """A mock-mode DatabaseManager holding a private copy of the dataset."""
+    db = module.DatabaseManager(url="", key="")
+    assert db.use_mock, "expected mock mode (unset SUPABASE_URL / SUPABASE_KEY)"
+    tables = copy.deepcopy(dataset)
+    db.mock_inventory = tables["inventory"]
+    db.mock_items = tables["items"]
+    db.mock_students = tables["students"]
+    db.mock_transactions = tables["transactions"]
+    db.mock_transaction_items = tables["transaction_items"]
+    if hasattr(db, "mock_staff"):
+        db.mock_staff = tables["staff"]
+    return db
+
+
+def run_workload(db, dataset: dict, calls: int, cart: int, seed: int = 11) -> dict:
+    """Time each operation (median ms per call); missing methods are reported as None."""
+    rng = random.Random(seed)
+    items, inventory = dataset["items"], dataset["inventory"]
+    available = [item["id"] for item in items if item["status"] == "Available"]
+    rng.shuffle(available)
+    results = {}
+
+    def timed(op, fn, args_list):
+        if fn is None:
+            results[op] = None
+            return []
+        timings, outputs = [], []
+        for args in args_list:
+            start = time.perf_counter()
+            outputs.append(fn(*args))
+            timings.append((time.perf_counter() - start) * 1000)
+        results[op] = statistics.median(timings)
+        return outputs
+
+    timed("serial lookup", db.get_item_by_serial,
+          [(rng.choice(items)["serial_number"],) for _ in range(calls)])
+    timed("name lookup", db.get_available_items_by_name,
+          [(rng.choice(inventory)["name"],) for _ in range(calls)])
+
+    carts = [available[i * cart:(i + 1) * cart] for i in range(calls)]
+    student_ids = [rng.randint(1, len(dataset["students"])) for _ in range(calls)]
+    transaction_ids = timed("issue", db.create_transaction,
+                            [(student_id, list(c)) for student_id, c in zip(student_ids, carts)])
+
+    return_item = getattr(db, "return_item", None)
+    returns = [(item_id, transaction_id) for c, transaction_id in zip(carts, transaction_ids)
+               if transaction_id for item_id in c][:calls]
+    timed("return", return_item, returns)
+
+    timed("overdue scan", getattr(db, "get_overdue_items", None), [(7,)] * calls)
+    timed("recent activity", getattr(db, "get_recent_transactions", None), [(5,)] * calls)
+
+    # Half new components, half restocks of existing ones
+    bulk_rows = [[{"Component Name": f"Imported {i:03d}-{j}", "Quantity": "5", "Description": ""}
+                  for j in range(10)] +
+                 [{"Component Name": rng.choice(inventory)["name"], "Quantity": "5", "Description": ""}
+                  for _ in range(10)]
+                 for i in range(max(1, calls // 10))]
+    timed("bulk import", getattr(db, "bulk_import_inventory", None), [(rows,) for rows in bulk_rows])
+    return results
+
+
+def version_number(path: str) -> int:
+    return int(re.search(r"mainV(\d+)\.py$", path).group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", type=int, default=200)
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--loans", type=int, default=1000, help="Active transactions in the dataset")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per operation (bulk import: calls / 10)")
+    parser.add_argument("--cart", type=int, default=3, help="Items per issue")
+    parser.add_argument("--versions", help="Comma-separated version numbers (default: all mainV*.py)")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(ROOT, "mainV*.py")), key=version_number)
+    if args.versions:
+        wanted = {int(v) for v in args.versions.split(",")}
+        paths = [p for p in paths if version_number(p) in wanted]
+
+    dataset = build_dataset(args.components, args.items, args.students, args.loans)
+    print(f"Items: {args.items:,}  Components: {args.components}  Students: {args.students:,}  "
+          f"Loans: {len(dataset['transactions']):,}  Calls/op: {args.calls}")
+    print()
+
+    columns = [(op, max(10, len(op) + 2)) for op in OPERATIONS]
+    print(f"{'version':<8}" + "".join(f"{op:>{w}}" for op, w in columns) + f"{'peak MB':>10}", flush=True)
+
+    rows = []
+    for path in paths:
+        version = f"V{version_number(path)}"
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):  # "Using mock data..." banners
+                module = load_version(path)
+                results = run_workload(make_db(module, dataset), dataset, args.calls, args.cart)
+
+                # Memory on a fresh copy with fewer calls (tracemalloc slows
+                # everything, so it is not running while timing)
+                db = make_db(module, dataset)
+                tracemalloc.start()
+                run_workload(db, dataset, max(2, args.calls // 5), args.cart)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        except Exception as e:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            print(f"{version:<8}failed ({type(e).__name__}: {e})", flush=True)
+            continue
+        rows.append({"version": version, "ms": results, "peak_mb": peak / 1e6})
+
+        cells = [f"{'-' if results[op] is None else f'{results[op]:.3f}':>{w}}" for op, w in columns]
+        print(f"{version:<8}" + "".join(cells) + f"{peak / 1e6:>10.1f}", flush=True)
+
+    print()
+    print("Median ms per call; peak MB = memory allocated while running the workload.")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,75 +19,2463 @@ ADD COLUMN IF NOT EXISTS expected_return_date DATE;
 
 This adds the expected_return_date column to the transactions table, allowing
 the application to store custom due dates for issued items.
+
+The offline write journal also needs an idempotency column and table
+(section 9 of supabase_setup.sql):
+
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS client_ref TEXT UNIQUE;
+
+CREATE TABLE IF NOT EXISTS client_writes (
+    op_key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    applied_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+Issuing goes through the issue_items() and issue_items_batch() database
+functions (atomic claim of all cart items). Run section 10 of
+supabase_setup.sql to create them.
+
+Auto-generated serial numbers come from the serial_counters table and the
+allocate_serials() function (section 11 of supabase_setup.sql).
+Restocks and CSV imports call restock_items() / restock_items_batch()
+(section 12), which insert the items and increment total_qty atomically.
+The Dashboard loads in one round trip through get_dashboard_snapshot()
+(section 13).
 ================================================================================
 """
 
-import customtkinter as ctk
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-import os
-from tkinter import filedialog
-import threading
+import customtkinter as ctk
+from datetime import datetime, timedelta
+from typing import Callable, List, Dict, NamedTuple, Optional, Tuple
+import os
+import tkinter as tk
+from tkinter import filedialog
+import threading
+import sys
+import time
+import json
+import math
+import re
+import sqlite3
+import uuid
+import contextvars
+import functools
+import hashlib
+import inspect
+import importlib.util
+import logging
+from logging.handlers import RotatingFileHandler
+from array import array
+from bisect import bisect_right
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# ============================================================
+# CONFIG ZONE: Logging
+# ============================================================
+# All diagnostics go through the "labtrack" logger hierarchy:
+#   labtrack.db   - DatabaseManager (connection, query errors)
+#   labtrack.sync - event bus, write-behind queue, offline journal
+#   labtrack.ui   - LabApp
+#   labtrack.hot  - per-row / per-keystroke debug output (hot paths)
+#
+# PERFORMANCE: labtrack.hot is off unless LABTRACK_LOG_HOT_PATH=1. Hot-path
+# calls use %-style arguments, so when the logger is off a call costs one
+# cached level check and the message is never formatted. (The catalog used
+# to print several lines per rendered row, which took seconds on a large
+# catalog with a console attached.)
+#
+# Environment variables:
+#   LABTRACK_LOG_LEVEL     Console/file level (default INFO)
+#   LABTRACK_LOG_FILE      Also write to this file, rotated at 1 MB (3 backups)
+#   LABTRACK_LOG_HOT_PATH  1 = enable labtrack.hot debug output
+LOG_LEVEL = os.getenv("LABTRACK_LOG_LEVEL", "INFO").strip().upper()
+LOG_FILE = os.getenv("LABTRACK_LOG_FILE", "").strip()
+LOG_HOT_PATH = os.getenv("LABTRACK_LOG_HOT_PATH", "0").strip() in ("1", "true", "yes")
+LOG_FILE_MAX_BYTES = 1_000_000
+LOG_FILE_BACKUPS = 3
+
+log = logging.getLogger("labtrack")
+db_log = logging.getLogger("labtrack.db")
+sync_log = logging.getLogger("labtrack.sync")
+ui_log = logging.getLogger("labtrack.ui")
+hot_log = logging.getLogger("labtrack.hot")
+hot_log.setLevel(logging.DEBUG if LOG_HOT_PATH else logging.WARNING)
+
+
+class KeyValueFormatter(logging.Formatter):
+    """
+    One line per record: time, level, logger, message, then key=value fields.
+
+    Fields come from extra={"fields": {...}}, e.g.
+        hot_log.debug("catalog rendered", extra={"fields": {"rows": 120, "ms": 35.2}})
+    """
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={json.dumps(value, default=str)}" for key, value in fields.items())
+        return line
+
+
+def configure_logging(level: str = LOG_LEVEL, log_file: str = LOG_FILE):
+    """
+    Attach the console (and optional rotating file) handlers to the labtrack logger.
+
+    Safe to call more than once; handlers are replaced, not duplicated.
+
+    Args:
+        level: Level name for both handlers (DEBUG, INFO, WARNING, ...)
+        log_file: Path of the rotating log file ("" = console only)
+    """
+    formatter = KeyValueFormatter()
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(RotatingFileHandler(log_file, maxBytes=LOG_FILE_MAX_BYTES,
+                                            backupCount=LOG_FILE_BACKUPS, encoding="utf-8"))
+    for handler in log.handlers[:]:
+        log.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        log.addHandler(handler)
+    log.setLevel(getattr(logging, level, logging.INFO))
+    log.propagate = False
+
+# ============================================================
+# CONFIG ZONE: Instrumentation
+# ============================================================
+# PERFORMANCE: Where does the time go? Every public DatabaseManager method
+# and every LabApp view builder (_show_*, _load_*) plus the dashboard chart
+# updates run inside a timing span. PERF collects per-operation call counts,
+# errors, latency histograms and payload sizes (rows returned, and response
+# bytes received over the shared HTTP client during the span), plus named
+# counters (query cache hits, coalesced reads). PERF is process-wide, so the
+# numbers survive a Sync, which replaces the DatabaseManager. They are shown
+# in the hidden Performance view (Ctrl+Shift+P) and exportable as JSON lines.
+#
+# A span costs two perf_counter() calls and one locked dict update (about
+# a microsecond), far below the cost of a network call or a widget.
+#
+# Environment variables:
+#   LABTRACK_PERF=0        Do not wrap anything (zero overhead)
+#   LABTRACK_PERF_PANEL=1  Show the Performance button in the sidebar at startup
+PERF_ENABLED = os.getenv("LABTRACK_PERF", "1").strip() != "0"
+PERF_PANEL = os.getenv("LABTRACK_PERF_PANEL", "0").strip() in ("1", "true", "yes")
+PERF_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)  # Histogram upper bounds
+PERF_RECENT_SPANS = 2000  # Individual spans kept for the export and sparklines
+
+
+class PerfRecorder:
+    """Thread-safe collector of timing spans (count, errors, histogram, rows, bytes per operation)."""
+
+    def __init__(self, buckets_ms=PERF_BUCKETS_MS, recent: int = PERF_RECENT_SPANS):
+        self._lock = threading.Lock()
+        self.buckets_ms = tuple(buckets_ms)
+        self._ops: Dict[str, Dict] = {}
+        self._counters: Dict[str, int] = {}
+        self._recent = deque(maxlen=recent)  # (unix time, name, ms, rows, bytes, ok)
+        self._received = threading.local()   # Response bytes read on this thread, ever
+        self.started_at = time.time()
+
+    def record(self, name: str, kind: str, ms: float, rows: Optional[int] = None, ok: bool = True,
+               nbytes: Optional[int] = None):
+        """
+        Add one finished span.
+
+        Args:
+            name: Operation name, e.g. "db.get_all_items"
+            kind: Span group ("db", "ui")
+            ms: Duration in milliseconds
+            rows: Payload size (rows returned), if known
+            ok: False if the operation raised
+            nbytes: Response bytes received during the span, if it made HTTP requests
+        """
+        with self._lock:
+            op = self._ops.get(name)
+            if op is None:
+                op = self._ops[name] = {"kind": kind, "count": 0, "errors": 0, "total_ms": 0.0,
+                                        "max_ms": 0.0, "rows": 0, "sized": 0, "bytes": 0, "fetched": 0,
+                                        "buckets": [0] * (len(self.buckets_ms) + 1)}
+            op["count"] += 1
+            op["total_ms"] += ms
+            op["max_ms"] = max(op["max_ms"], ms)
+            op["buckets"][bisect_right(self.buckets_ms, ms)] += 1
+            if not ok:
+                op["errors"] += 1
+            if rows is not None:
+                op["rows"] += rows
+                op["sized"] += 1
+            if nbytes is not None:
+                op["bytes"] += nbytes
+                op["fetched"] += 1
+            self._recent.append((time.time(), name, ms, rows, nbytes, ok))
+
+    def count(self, name: str, amount: int = 1):
+        """Add to a named counter, e.g. PERF.count("cache.hits.get_all_staff")."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def counters(self, prefix: str = "") -> Dict[str, int]:
+        """Counters whose names start with prefix (the prefix is stripped)."""
+        with self._lock:
+            return {name[len(prefix):]: value for name, value in self._counters.items()
+                    if name.startswith(prefix)}
+
+    def add_received(self, nbytes: int):
+        """Count response bytes read on the current thread (called by the HTTP response hook)."""
+        self._received.total = self.received() + nbytes
+        self.count("http.bytes", nbytes)
+
+    def received(self) -> int:
+        """Response bytes read on the current thread so far; spans diff this."""
+        return getattr(self._received, "total", 0)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "span"):
+        """Time a block: with PERF.span("ui.render_catalog", "ui"): ..."""
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(name, kind, (time.perf_counter() - start) * 1000, ok=ok)
+
+    def _percentile(self, buckets: List[int], fraction: float) -> float:
+        """Upper bound (ms) of the histogram bucket holding the given fraction of calls."""
+        target = sum(buckets) * fraction
+        seen = 0
+        for index, count in enumerate(buckets):
+            seen += count
+            if seen >= target and count:
+                return self.buckets_ms[index] if index < len(self.buckets_ms) else float("inf")
+        return 0.0
+
+    def snapshot(self) -> List[Dict]:
+        """
+        Per-operation summary, slowest total first.
+
+        Returns:
+            Dicts with name, kind, count, errors, total_ms, avg_ms, max_ms,
+            p50_ms, p95_ms (histogram bucket bounds), avg_rows, avg_bytes
+            (per call that made HTTP requests) and buckets
+        """
+        with self._lock:
+            ops = {name: dict(op, buckets=list(op["buckets"])) for name, op in self._ops.items()}
+        summary = []
+        for name, op in ops.items():
+            summary.append({
+                "name": name,
+                "kind": op["kind"],
+                "count": op["count"],
+                "errors": op["errors"],
+                "total_ms": round(op["total_ms"], 3),
+                "avg_ms": round(op["total_ms"] / op["count"], 3),
+                "max_ms": round(op["max_ms"], 3),
+                "p50_ms": self._percentile(op["buckets"], 0.5),
+                "p95_ms": self._percentile(op["buckets"], 0.95),
+                "avg_rows": round(op["rows"] / op["sized"], 1) if op["sized"] else None,
+                "avg_bytes": round(op["bytes"] / op["fetched"]) if op["fetched"] else None,
+                "buckets": dict(zip([f"<={bound}" for bound in self.buckets_ms] + ["inf"], op["buckets"])),
+            })
+        summary.sort(key=lambda op: op["total_ms"], reverse=True)
+        return summary
+
+    def recent(self, name: Optional[str] = None, limit: int = 50) -> List[float]:
+        """Durations (ms) of the latest spans, optionally of one operation, oldest first."""
+        with self._lock:
+            spans = [span[2] for span in self._recent if name is None or span[1] == name]
+        return spans[-limit:]
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._ops.clear()
+            self._counters.clear()
+            self._recent.clear()
+            self.started_at = time.time()
+
+    def export_jsonl(self, path: str, extra: Optional[Dict[str, Dict]] = None) -> int:
+        """
+        Write the summary and recent spans as JSON lines.
+
+        Line types: {"type": "op", ...} per operation (see snapshot()),
+        {"type": "span", "ts", "name", "ms", "rows", "bytes", "ok"} per recent
+        span, {"type": "counter", "name", "value"} per counter, and
+        {"type": <key>, ...} for each entry of extra (e.g. cache statistics).
+
+        Args:
+            path: Output file
+            extra: Additional named records to include
+
+        Returns:
+            Number of lines written
+        """
+        with self._lock:
+            spans = list(self._recent)
+        lines = [{"type": "op", **op} for op in self.snapshot()]
+        lines += [{"type": "span", "ts": ts, "name": name, "ms": round(ms, 3), "rows": rows,
+                   "bytes": nbytes, "ok": ok}
+                  for ts, name, ms, rows, nbytes, ok in spans]
+        lines += [{"type": "counter", "name": name, "value": value}
+                  for name, value in sorted(self.counters().items())]
+        for key, record in (extra or {}).items():
+            lines.append({"type": key, **record})
+        with open(path, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line, default=str) + "\n")
+        return len(lines)
+
+
+PERF = PerfRecorder()
+
+
+def _payload_rows(result) -> Optional[int]:
+    """Rows in a method result (lists, dicts, ItemStore), or None if it has no size."""
+    if isinstance(result, (str, bytes)) or not hasattr(result, "__len__"):
+        return None
+    return len(result)
+
+
+def timed(name: str, kind: str):
+    """Decorator recording every call of the function as a PERF span."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            received = PERF.received()
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                PERF.record(name, kind, (time.perf_counter() - start) * 1000, ok=False)
+                raise
+            nbytes = PERF.received() - received
+            PERF.record(name, kind, (time.perf_counter() - start) * 1000, _payload_rows(result),
+                        nbytes=nbytes or None)
+            return result
+        return wrapper
+    return decorator
+
+
+def instrumented(kind: str, prefixes: Optional[Tuple[str, ...]] = None):
+    """
+    Class decorator wrapping methods in timing spans named "<kind>.<method>".
+
+    Args:
+        kind: Span group and name prefix ("db", "ui")
+        prefixes: Wrap methods whose names start with one of these;
+            None wraps every public method
+    """
+    def decorator(cls):
+        if not PERF_ENABLED:
+            return cls
+        for name, attr in list(vars(cls).items()):
+            if not inspect.isfunction(attr) or name.startswith("__"):
+                continue
+            if prefixes is None and name.startswith("_"):
+                continue
+            if prefixes is not None and not name.startswith(prefixes):
+                continue
+            setattr(cls, name, timed(f"{kind}.{name}", kind)(attr))
+        return cls
+    return decorator
+
+
+# ============================================================
+# CONFIG ZONE: Query Audit
+# ============================================================
+# N+1 query detection. With LABTRACK_QUERY_AUDIT=1 (or QUERY_AUDIT.enabled =
+# True in a test) every backend request issued during one UI action is
+# recorded and grouped by target and shape:
+#   - Supabase: each HTTP request on the shared client, shaped as
+#     method + table (or rpc/<function>) + filter columns and operators,
+#     with the values dropped ("GET items?id=eq&select=*")
+#   - Mock backend: each outermost DatabaseManager call that is not a
+#     query cache hit, shaped as method + argument names
+# A UI action is one Tk callback (button press, key binding, after()),
+# or an explicit "with QUERY_AUDIT.action(name):" block. The action is
+# tracked in a context variable, so only requests made on its own thread,
+# or in worker threads it starts through QUERY_AUDIT.bind(), are counted;
+# the write-behind queue, journal replay and other background threads are
+# not. An action ends when its callback and all bound workers have
+# returned. When an action ends, shapes repeated QUERY_AUDIT_THRESHOLD times or more are reported
+# as N+1 suspects, naming the LabApp method that issued them (e.g. one
+# get_current_holder per catalog row). Suspects are logged, listed in
+# the Performance view, and assert_clean() raises for them (test gate).
+QUERY_AUDIT_ENABLED = os.getenv("LABTRACK_QUERY_AUDIT", "0").strip() in ("1", "true", "yes")
+QUERY_AUDIT_THRESHOLD = int(os.getenv("LABTRACK_QUERY_AUDIT_THRESHOLD", "5"))
+QUERY_AUDIT_REPORTS = 50  # Suspect reports kept for the Performance view
+QUERY_AUDIT_PARAMS_IGNORED = ("order", "limit", "offset", "on_conflict", "columns")
+
+
+class NPlusOneError(AssertionError):
+    """Raised by QueryAudit.assert_clean() when N+1 suspects were found."""
+
+
+class QueryAudit:
+    """Records backend requests per UI action and flags repeated same-shape queries."""
+
+    def __init__(self, threshold: int = QUERY_AUDIT_THRESHOLD, enabled: bool = QUERY_AUDIT_ENABLED):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.view_classes: Tuple[type, ...] = ()  # Classes whose methods count as "view methods"
+        self._lock = threading.Lock()
+        # {"name", "depth", "records": [(key, caller)]}; depth counts open blocks and bound workers
+        self._action: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar(
+            "query_audit_action", default=None)
+        self._db_depth = threading.local()
+        self.reports = deque(maxlen=QUERY_AUDIT_REPORTS)
+        self._tk_hooked = False
+
+    @contextmanager
+    def action(self, name: str):
+        """
+        Group the requests of one UI action (nested actions join the outer one).
+
+        Only requests made on this thread, or in workers started with bind()
+        while the action runs, are recorded.
+        """
+        if not self.enabled:
+            yield
+            return
+        action = self._action.get()
+        token = None
+        if action is None:
+            action = {"name": name, "depth": 0, "records": []}
+            token = self._action.set(action)
+        with self._lock:
+            action["depth"] += 1
+        try:
+            yield
+        finally:
+            if token is not None:
+                self._action.reset(token)
+            self._leave(action)
+
+    def bind(self, func: Callable) -> Callable:
+        """
+        Carry the current action into a worker thread or pool task.
+
+        Usage: threading.Thread(target=QUERY_AUDIT.bind(worker)). The action
+        stays open until the bound function returns.
+        """
+        action = self._action.get() if self.enabled else None
+        if action is None:
+            return func
+        with self._lock:
+            action["depth"] += 1
+        context = contextvars.copy_context()
+
+        @functools.wraps(func)
+        def bound(*args, **kwargs):
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                self._leave(action)
+        return bound
+
+    def _leave(self, action: Dict):
+        with self._lock:
+            action["depth"] -= 1
+            done = action["depth"] == 0
+        if done:
+            self._analyze(action)
+
+    def record(self, source: str, target: str, shape: str):
+        """
+        Record one backend request (ignored outside an action).
+
+        Args:
+            source: "http" or "mock"
+            target: Table, rpc/<function> or DatabaseManager method
+            shape: Request shape without values
+        """
+        action = self._action.get()
+        if action is None:
+            return
+        caller = self._calling_view_method()
+        with self._lock:
+            if action["depth"] > 0:
+                action["records"].append(((source, target, shape), caller))
+
+    def _calling_view_method(self) -> Optional[str]:
+        """Innermost method of a view class (LabApp) on this thread's stack."""
+        frame = sys._getframe(2)
+        while frame is not None:
+            owner = frame.f_locals.get("self")
+            if self.view_classes and isinstance(owner, self.view_classes):
+                return f"{type(owner).__name__}.{frame.f_code.co_name}"
+            frame = frame.f_back
+        return None
+
+    def _analyze(self, action: Dict):
+        groups: Dict[Tuple, Dict[Optional[str], int]] = {}
+        for key, caller in action["records"]:
+            callers = groups.setdefault(key, {})
+            callers[caller] = callers.get(caller, 0) + 1
+        for (source, target, shape), callers in groups.items():
+            count = sum(callers.values())
+            if count < self.threshold:
+                continue
+            report = {
+                "action": action["name"],
+                "source": source,
+                "target": target,
+                "shape": shape,
+                "count": count,
+                "requests_in_action": len(action["records"]),
+                "callers": sorted(callers, key=lambda c: -callers[c]),
+                "ts": time.time(),
+            }
+            self.reports.append(report)
+            log.warning("N+1 suspect: %dx %s during %s (from %s)", count, shape, action["name"],
+                        ", ".join(str(c or action["name"]) for c in report["callers"]))
+
+    def suspects(self) -> List[Dict]:
+        """Reports so far, oldest first (action, source, target, shape, count, callers)."""
+        return list(self.reports)
+
+    def clear(self):
+        """Forget the reports (e.g. between test cases)."""
+        self.reports.clear()
+
+    def assert_clean(self):
+        """
+        Raise NPlusOneError if any N+1 suspect was reported.
+
+        Example test gate:
+            QUERY_AUDIT.enabled = True
+            with QUERY_AUDIT.action("catalog"):
+                render_catalog()
+            QUERY_AUDIT.assert_clean()
+        """
+        if self.reports:
+            lines = [f"{r['count']}x {r['shape']} during {r['action']} (from {', '.join(map(str, r['callers']))})"
+                     for r in self.reports]
+            raise NPlusOneError("N+1 query suspects:\n" + "\n".join(lines))
+
+    def on_http_request(self, request):
+        """httpx request hook: record a Supabase REST/RPC request by shape."""
+        if self._action.get() is None:
+            return
+        path = request.url.path
+        target = path.split("/rest/v1/", 1)[-1] if "/rest/v1/" in path else path
+        filters = []
+        for key, value in sorted(request.url.params.multi_items()):
+            if key in QUERY_AUDIT_PARAMS_IGNORED:
+                continue
+            if key == "select":
+                filters.append(f"select={value}")
+            else:
+                operator = value.split(".", 1)[0] if "." in value else ""
+                filters.append(f"{key}={operator}")
+        shape = f"{request.method} {target}" + (f"?{'&'.join(filters)}" if filters else "")
+        self.record("http", target, shape)
+
+    def wrap_db_method(self, name: str, method: Callable) -> Callable:
+        """Record outermost mock-mode DatabaseManager calls (cache hits excluded)."""
+        params = [p for p in inspect.signature(method).parameters if p != "self"]
+
+        @functools.wraps(method)
+        def wrapper(db, *args, **kwargs):
+            if not self.enabled or not db.use_mock or getattr(self._db_depth, "value", 0):
+                return method(db, *args, **kwargs)
+            self._db_depth.value = 1
+            db._local.cache_hit = False
+            try:
+                return method(db, *args, **kwargs)
+            finally:
+                self._db_depth.value = 0
+                if not db._local.cache_hit:
+                    used = params[:len(args)] + sorted(kwargs)
+                    self.record("mock", name, f"{name}({', '.join(used)})")
+        return wrapper
+
+    def install_tk_hook(self):
+        """Treat every Tk callback (events, commands, after()) as one UI action."""
+        if self._tk_hooked:
+            return
+        self._tk_hooked = True
+        audit = self
+        original_call = tk.CallWrapper.__call__
+
+        def audited_call(wrapper, *args):
+            func = wrapper.func
+            with audit.action(getattr(func, "__qualname__", repr(func))):
+                return original_call(wrapper, *args)
+
+        tk.CallWrapper.__call__ = audited_call
+
+
+QUERY_AUDIT = QueryAudit()
+
+
+def query_audited(cls):
+    """Class decorator: record mock-mode calls of every public method in QUERY_AUDIT."""
+    for name, attr in list(vars(cls).items()):
+        if inspect.isfunction(attr) and not name.startswith("_"):
+            setattr(cls, name, QUERY_AUDIT.wrap_db_method(name, attr))
+    return cls
+
+
+# ============================================================
+# CONFIG ZONE: Stall Watchdog
+# ============================================================
+# Which handler froze the window? StallWatchdog schedules a heartbeat on
+# the Tk event loop every STALL_HEARTBEAT_MS. A helper thread watches the
+# heartbeats. When none has arrived for STALL_THRESHOLD_MS, it samples the
+# main thread's Python stack (sys._current_frames) until the loop comes
+# back, then logs the stall with its duration and the LabApp method
+# running in most samples (plus the stack of the first sample).
+# stall_summary() lists the worst stalls of the session; they are shown in
+# the Performance view and logged when the window closes.
+#
+# Environment variables:
+#   LABTRACK_STALL_WATCHDOG=0  Disable the watchdog
+#   LABTRACK_STALL_MS          Stall threshold in ms (default 500)
+STALL_WATCHDOG_ENABLED = os.getenv("LABTRACK_STALL_WATCHDOG", "1").strip() != "0"
+STALL_THRESHOLD_MS = int(os.getenv("LABTRACK_STALL_MS", "500"))
+STALL_HEARTBEAT_MS = 100      # Heartbeat interval on the Tk loop
+STALL_SAMPLE_MS = 50          # Stack sampling interval while stalled
+STALL_WORST_KEPT = 20         # Worst stalls kept per session
+STALL_STACK_DEPTH = 12        # Frames kept per report (innermost last)
+
+
+class StallWatchdog:
+    """Detects Tk main-loop stalls and records which method caused them."""
+
+    def __init__(self, widget, owner_class: Optional[type] = None,
+                 threshold_ms: float = STALL_THRESHOLD_MS, heartbeat_ms: int = STALL_HEARTBEAT_MS):
+        """
+        Args:
+            widget: Tk widget whose event loop is watched (the main window)
+            owner_class: Methods of this class are named in reports (LabApp)
+            threshold_ms: Heartbeat gap that counts as a stall
+            heartbeat_ms: Heartbeat interval
+        """
+        self.widget = widget
+        self.owner_class = owner_class
+        self.threshold = threshold_ms / 1000.0
+        self.heartbeat_ms = heartbeat_ms
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._lock = threading.Lock()
+        self._samples: List[Tuple[Optional[str], List[str]]] = []  # Taken during the current stall
+        self._stop = threading.Event()
+        self.stalls: List[Dict] = []  # Worst first, at most STALL_WORST_KEPT
+        self.stall_count = 0
+        self.max_lag_ms = 0.0
+
+    def start(self):
+        """Start the heartbeat (call on the main thread) and the helper thread."""
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self.widget.after(self.heartbeat_ms, self._beat)
+        threading.Thread(target=self._watch, name="stall-watchdog", daemon=True).start()
+
+    def stop(self):
+        """Stop the helper thread (the heartbeat stops with the window)."""
+        self._stop.set()
+
+    def _beat(self):
+        """Main-thread heartbeat: measure loop lag and close a detected stall."""
+        now = time.monotonic()
+        with self._lock:
+            gap = now - self._last_beat
+            self._last_beat = now
+            samples, self._samples = self._samples, []
+        lag_ms = max(0.0, gap * 1000 - self.heartbeat_ms)
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        if samples:
+            self._report(gap, samples)
+        if not self._stop.is_set():
+            try:
+                self.widget.after(self.heartbeat_ms, self._beat)
+            except Exception:
+                pass  # Window destroyed
+
+    def _watch(self):
+        """Helper thread: sample the main thread's stack while the loop is stalled."""
+        while not self._stop.wait(STALL_SAMPLE_MS / 1000.0):
+            with self._lock:
+                stalled = time.monotonic() - self._last_beat > self.threshold
+            if not stalled:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            sample = self._describe(frame)
+            with self._lock:
+                # Re-check: the heartbeat may have run while we walked the stack
+                if time.monotonic() - self._last_beat > self.threshold:
+                    self._samples.append(sample)
+
+    def _describe(self, frame) -> Tuple[Optional[str], List[str]]:
+        """Innermost owner-class method and a short stack (outermost first)."""
+        method = None
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            if len(stack) < STALL_STACK_DEPTH:
+                stack.append(f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}")
+            if method is None and self.owner_class is not None:
+                if isinstance(frame.f_locals.get("self"), self.owner_class):
+                    method = f"{self.owner_class.__name__}.{code.co_name}"
+            frame = frame.f_back
+        stack.reverse()
+        return method, stack
+
+    def _report(self, gap: float, samples: List[Tuple[Optional[str], List[str]]]):
+        counts: Dict[Optional[str], int] = {}
+        for method, _ in samples:
+            counts[method] = counts.get(method, 0) + 1
+        method = max(counts, key=counts.get)
+        stall = {
+            "ts": time.time(),
+            "duration_ms": round(gap * 1000, 1),
+            "method": method or "(outside LabApp)",
+            "methods": counts,
+            "samples": len(samples),
+            "stack": next(stack for m, stack in samples if m == method),
+        }
+        self.stall_count += 1
+        self.stalls.append(stall)
+        self.stalls.sort(key=lambda s: s["duration_ms"], reverse=True)
+        del self.stalls[STALL_WORST_KEPT:]
+        PERF.record("ui.loop_stall", "ui", stall["duration_ms"])
+        ui_log.warning("Main loop stalled %.0f ms in %s", stall["duration_ms"], stall["method"],
+                       extra={"fields": {"stack": stall["stack"][-4:]}})
+
+    def stall_summary(self, limit: int = 5) -> List[Dict]:
+        """The worst stalls of this session (longest first)."""
+        return self.stalls[:limit]
+
+# Pandas for CSV import functionality
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+    log.warning("Warning: Pandas not installed. CSV import will not be available.")
+
+# Matplotlib is an optional chart backend (see CONFIG ZONE: Charts). It is only
+# imported when LABTRACK_CHART_BACKEND=matplotlib and a chart is drawn, so here
+# we just check that it is installed.
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
+
+# NumPy powers the columnar item store (vectorized filters and counts)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# cachetools provides the TTL/LRU caches behind memoized DatabaseManager reads
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+# mmh3 (MurmurHash3) hashes serials for the serial-existence Bloom filter;
+# hashlib.blake2b is the slower fallback
+try:
+    import mmh3
+    MMH3_AVAILABLE = True
+except ImportError:
+    MMH3_AVAILABLE = False
+
+# Try to import supabase, fall back to mock if not available
+try:
+    from supabase import create_client, Client, ClientOptions
+    SUPABASE_AVAILABLE = True
+except ImportError:
+    SUPABASE_AVAILABLE = False
+    log.warning("Warning: Supabase not installed. Using mock data.")
+
+# httpx is the HTTP library underneath supabase-py. We import it directly so we
+# can build ONE shared, tuned connection pool for every Supabase call.
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# h2 enables HTTP/2 in httpx (multiplexing many requests over one connection)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# brotli lets httpx decode "br" compressed responses (smaller than gzip for JSON)
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Try to load environment variables from .env file
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass  # python-dotenv not installed, use system env vars
+
+
+# ============================================================
+# CONFIG ZONE: Network Transport
+# ============================================================
+# PERFORMANCE OPTIMIZATION: Shared HTTP/2 transport for all Supabase calls.
+#
+# Without this, supabase-py creates separate HTTP clients for PostgREST, auth
+# and storage, and every Sync creates a brand new DatabaseManager with brand
+# new connections (new TCP + TLS handshake each time).
+#
+# With one shared httpx.Client:
+# 1. HTTP/2 multiplexing: parallel queries share a single TLS connection
+# 2. Keep-alive pooling: connections survive between calls and between syncs
+# 3. Compression: large JSON payloads (get_all_items) arrive gzip/brotli encoded
+#
+# You can tune these values for slow or flaky lab networks:
+HTTP_MAX_CONNECTIONS = 10         # Upper bound on open connections
+HTTP_MAX_KEEPALIVE = 5            # Idle connections kept warm in the pool
+HTTP_KEEPALIVE_EXPIRY = 120.0     # Seconds before an idle connection is closed
+HTTP_TIMEOUT = 30.0               # Seconds before a request is abandoned
+SYNC_PARALLEL_REQUESTS = 4        # Tables fetched at once during a full sync
+DASHBOARD_COUNT_METHOD = "exact"  # Dashboard card counts: "exact", or "planned" for very large tables
+
+_shared_http_client = None
+_shared_http_client_lock = threading.Lock()
+
+
+def get_shared_http_client():
+    """
+    Return the process-wide httpx client used by every DatabaseManager.
+
+    The client is created lazily on first use and reused afterwards, so a
+    Sync (which builds a new DatabaseManager) keeps the warm connections.
+
+    Returns:
+        httpx.Client, or None if httpx is not installed
+    """
+    global _shared_http_client
+
+    if not HTTPX_AVAILABLE:
+        return None
+
+    with _shared_http_client_lock:
+        if _shared_http_client is None or _shared_http_client.is_closed:
+            # Advertise the best compression we can decode
+            encodings = ["gzip", "deflate"]
+            if BROTLI_AVAILABLE:
+                encodings.insert(0, "br")
+
+            _shared_http_client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(HTTP_TIMEOUT),
+                headers={"Accept-Encoding": ", ".join(encodings)},
+                follow_redirects=True,
+                event_hooks={
+                    "request": [QUERY_AUDIT.on_http_request],  # N+1 detection (off by default)
+                    "response": [_count_response_bytes],       # Payload sizes for PERF
+                }
+            )
+        return _shared_http_client
+
+
+if HTTPX_AVAILABLE:
+    class _CountingByteStream(httpx.SyncByteStream):
+        """Response body stream that reports the bytes read to PERF (no Content-Length)."""
+
+        def __init__(self, stream):
+            self._stream = stream
+
+        def __iter__(self):
+            for chunk in self._stream:
+                PERF.add_received(len(chunk))
+                yield chunk
+
+        def close(self):
+            self._stream.close()
+
+
+def _count_response_bytes(response):
+    """
+    httpx response hook: add the response's size on the wire to PERF.
+
+    The hook runs before the body is read, so the size comes from
+    Content-Length (compressed size for gzip/br bodies); chunked responses
+    are counted while they are read, on the calling thread.
+    """
+    if response.request.method == "HEAD":
+        return
+    length = response.headers.get("content-length", "")
+    if length.isdigit():
+        PERF.add_received(int(length))
+    else:
+        response.stream = _CountingByteStream(response.stream)
+
+
+# ============================================================
+# DATA ZONE: Compact Item Store
+# ============================================================
+# PERFORMANCE OPTIMIZATION: Columnar storage for the cached items table.
+#
+# A list of item dictionaries costs roughly 400 bytes per item (the dict, its
+# keys, boxed ints and a str per serial). At 100k items that is tens of MB,
+# and every filter pass walks all of those objects in Python.
+#
+# ItemStore keeps one typed array per column instead:
+# - id, inventory_id: array('q')   -> 8 bytes each
+# - status:           array('b')   -> 1 byte (index into the store's status names)
+# - serial_number:    one UTF-8 buffer + array('q') end offsets -> ~15 bytes
+#
+# Views still see dictionaries: iterating the store yields ItemRow proxies
+# (two slots, created on demand) that support item["status"], item.get(...),
+# "key in item" and item.copy(). Status, course and search filters run as
+# vectorized NumPy masks over the columns (see ItemStore.filter).
+ITEM_COLUMNS = ("id", "serial_number", "status", "inventory_id")
+ITEM_STATUSES = ("Available", "Issued", "Damaged")
+MISSING_ID = -1  # Stored in the int columns for NULL ids
+
+
+class ItemRow:
+    """Lightweight, read-only dictionary view of one row in an ItemStore."""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "ItemStore", index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._store._value(self._index, key)
+
+    def get(self, key, default=None):
+        try:
+            return self._store._value(self._index, key)
+        except KeyError:
+            return default
+
+    def keys(self):
+        extra = self._store._extras.get(self._index)
+        return ITEM_COLUMNS + tuple(extra) if extra else ITEM_COLUMNS
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def copy(self) -> Dict:
+        """Return a plain dictionary snapshot of the row."""
+        return dict(self.items())
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return f"ItemRow({self.copy()!r})"
+
+
+class ItemStore:
+    """
+    Columnar, memory-compact container for the cached items table.
+
+    Behaves like the list of item dictionaries it replaces: len(), truthiness,
+    indexing and iteration all work, but rows are ItemRow proxies.
+    """
+
+    __slots__ = ("_ids", "_inventory_ids", "_status", "_status_names", "_status_codes",
+                 "_serial_blob", "_serial_offsets", "_serial_blob_lower", "_extras",
+                 "_id_index", "_columns", "version")
+
+    def __init__(self, rows: Optional[List[Dict]] = None):
+        self._ids = array("q")
+        self._inventory_ids = array("q")
+        self._status = array("b")
+        self._status_names: List[Optional[str]] = list(ITEM_STATUSES)
+        self._status_codes = {name: code for code, name in enumerate(self._status_names)}
+        # Serial i lives in _serial_blob[_serial_offsets[i]:_serial_offsets[i + 1] - 1]
+        # (each serial is followed by a NUL byte so substring searches never span two rows)
+        self._serial_blob = bytearray()
+        self._serial_offsets = array("q", [0])
+        self._serial_blob_lower = None
+        self._extras: Dict[int, Dict] = {}  # Rare columns beyond ITEM_COLUMNS, by row index
+        self._id_index = None               # Built on first lookup by id
+        self._columns = {}                  # NumPy copies of the int columns, by name
+        self.version = 0                    # Bumped on every change (for derived caches)
+        if rows:
+            self.extend(rows)
+
+    # ---------------------------------------------------------------- building
+
+    def _status_code(self, status) -> int:
+        code = self._status_codes.get(status)
+        if code is None:
+            code = len(self._status_names)
+            self._status_names.append(status)
+            self._status_codes[status] = code
+        return code
+
+    def _append(self, row: Dict):
+        item_id = row.get("id")
+        inventory_id = row.get("inventory_id")
+        self._ids.append(MISSING_ID if item_id is None else int(item_id))
+        self._inventory_ids.append(MISSING_ID if inventory_id is None else int(inventory_id))
+        self._status.append(self._status_code(row.get("status")))
+        self._serial_blob += str(row.get("serial_number") or "").encode("utf-8") + b"\0"
+        self._serial_offsets.append(len(self._serial_blob))
+
+        extra = {key: value for key, value in row.items() if key not in ITEM_COLUMNS}
+        if extra:
+            self._extras[len(self._ids) - 1] = extra
+
+    def _changed(self, structure: bool = True):
+        self.version += 1
+        self._columns.clear()
+        if structure:
+            self._serial_blob_lower = None
+            self._id_index = None
+
+    def append(self, row: Dict):
+        """Add one item row (a dictionary with the items table columns)."""
+        self._append(row)
+        self._changed()
+
+    def extend(self, rows):
+        """Add many item rows."""
+        for row in rows:
+            self._append(row)
+        self._changed()
+
+    def set_status(self, index: int, status: str):
+        """Change the status of the row at index in place."""
+        self._status[index] = self._status_code(status)
+        self._changed(structure=False)
+
+    # ---------------------------------------------------------------- access
+
+    def _value(self, index: int, key: str):
+        if key == "status":
+            return self._status_names[self._status[index]]
+        if key == "inventory_id":
+            value = self._inventory_ids[index]
+            return None if value == MISSING_ID else value
+        if key == "id":
+            value = self._ids[index]
+            return None if value == MISSING_ID else value
+        if key == "serial_number":
+            start = self._serial_offsets[index]
+            return self._serial_blob[start:self._serial_offsets[index + 1] - 1].decode("utf-8")
+        extra = self._extras.get(index)
+        if extra and key in extra:
+            return extra[key]
+        raise KeyError(key)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index: int) -> ItemRow:
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError("item index out of range")
+        return ItemRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self._ids)):
+            yield ItemRow(self, index)
+
+    def index_of(self, item_id: int) -> Optional[int]:
+        """Return the row index for an item ID, or None."""
+        if self._id_index is None:
+            self._id_index = {item_id: index for index, item_id in enumerate(self._ids)}
+        return self._id_index.get(item_id)
+
+    def get_by_id(self, item_id: int) -> Optional[ItemRow]:
+        """Return the row for an item ID, or None."""
+        index = self.index_of(item_id)
+        return None if index is None else ItemRow(self, index)
+
+    @property
+    def status_names(self) -> Tuple:
+        """Status names in code order (status column values index into this)."""
+        return tuple(self._status_names)
+
+    def column(self, name: str):
+        """
+        Return an int column as a NumPy array ("id", "inventory_id" or "status").
+
+        The array is a cached copy, refreshed after the store changes. NULL ids
+        read as MISSING_ID.
+        """
+        if name not in self._columns:
+            source = {"id": self._ids, "inventory_id": self._inventory_ids, "status": self._status}[name]
+            self._columns[name] = np.array(source, dtype=np.int8 if name == "status" else np.int64)
+        return self._columns[name]
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the store's columns."""
+        return (sys.getsizeof(self._ids) + sys.getsizeof(self._inventory_ids)
+                + sys.getsizeof(self._status) + sys.getsizeof(self._serial_blob)
+                + sys.getsizeof(self._serial_offsets))
+
+    # ---------------------------------------------------------------- filtering
+
+    def _serial_matches(self, text: str) -> List[int]:
+        """Row indices whose serial number contains text (case-insensitive)."""
+        if self._serial_blob_lower is None:
+            self._serial_blob_lower = bytes(self._serial_blob).lower()
+        blob = self._serial_blob_lower
+        needle = text.lower().encode("utf-8")
+        offsets = self._serial_offsets
+
+        matches = []
+        position = blob.find(needle)
+        while position != -1:
+            index = bisect_right(offsets, position) - 1
+            matches.append(index)
+            # Continue from the next serial (one match per row is enough)
+            position = blob.find(needle, offsets[index + 1])
+        return matches
+
+    def serials(self, start: int = 0) -> List[str]:
+        """Serial numbers of rows start.., decoded from the packed column in one pass."""
+        return bytes(self._serial_blob[self._serial_offsets[start]:]).decode("utf-8").split("\0")[:-1]
+
+    def serial_set(self) -> set:
+        """All serial numbers, upper-cased."""
+        return {serial.upper() for serial in self.serials()}
+
+    def find_serial(self, serial_number: str) -> Optional[ItemRow]:
+        """Return the row with exactly this serial number (case-insensitive), or None."""
+        wanted = serial_number.strip().upper()
+        if not wanted:
+            return None
+        for index in self._serial_matches(wanted):
+            if self._value(index, "serial_number").upper() == wanted:
+                return ItemRow(self, index)
+        return None
+
+    def filter(self, status: Optional[str] = None, inventory_ids=None,
+               text: Optional[str] = None, text_inventory_ids=None) -> List[ItemRow]:
+        """
+        Return the rows matching every given condition.
+
+        Args:
+            status: Keep rows with this status
+            inventory_ids: Keep rows whose inventory_id is in this collection
+            text: Keep rows whose serial number contains this text, or whose
+                inventory_id is in text_inventory_ids (e.g. components whose
+                name matched the same search)
+            text_inventory_ids: See text
+
+        Returns:
+            List of ItemRow proxies in store order
+        """
+        status_codes = None
+        if status is not None:
+            status = str(status).strip()
+            status_codes = [code for code, name in enumerate(self._status_names)
+                            if str(name).strip() == status]
+        inventory_ids = None if inventory_ids is None else list(inventory_ids)
+        text_inventory_ids = list(text_inventory_ids or [])
+
+        if NUMPY_AVAILABLE:
+            mask = np.ones(len(self._ids), dtype=bool)
+            if status_codes is not None:
+                mask &= np.isin(self.column("status"), status_codes)
+            if inventory_ids is not None:
+                mask &= np.isin(self.column("inventory_id"), inventory_ids)
+            if text:
+                text_mask = np.isin(self.column("inventory_id"), text_inventory_ids)
+                text_mask[self._serial_matches(text)] = True
+                mask &= text_mask
+            return [ItemRow(self, index) for index in np.flatnonzero(mask).tolist()]
+
+        # Pure Python fallback over the same columns
+        status_codes = None if status_codes is None else set(status_codes)
+        inventory_ids = None if inventory_ids is None else set(inventory_ids)
+        text_inventory_ids = set(text_inventory_ids)
+        serial_matches = set(self._serial_matches(text)) if text else None
+        rows = []
+        for index in range(len(self._ids)):
+            if status_codes is not None and self._status[index] not in status_codes:
+                continue
+            if inventory_ids is not None and self._inventory_ids[index] not in inventory_ids:
+                continue
+            if serial_matches is not None and index not in serial_matches \
+                    and self._inventory_ids[index] not in text_inventory_ids:
+                continue
+            rows.append(ItemRow(self, index))
+        return rows
+
+
+class ItemMetrics:
+    """
+    Dashboard and inventory counts computed from an ItemStore's columns.
+
+    PERFORMANCE: One np.bincount over (inventory_id, status code) pairs builds
+    the whole per-component status histogram in a single vectorized pass;
+    totals, top-N components and course breakdowns are then derived from that
+    small table (one row per component) instead of re-scanning every item.
+    Results are cached until the store's version changes.
+    """
+
+    __slots__ = ("store", "_version", "_status_totals", "_by_inventory")
+
+    def __init__(self, store: ItemStore):
+        self.store = store
+        self._version = None
+        self._status_totals: List[int] = []
+        self._by_inventory: Dict[int, List[int]] = {}
+
+    def _refresh(self):
+        store = self.store
+        if self._version == store.version:
+            return
+
+        num_status = len(store.status_names)
+        if NUMPY_AVAILABLE:
+            status = store.column("status")
+            inventory_ids = store.column("inventory_id")
+            unlinked_totals = None
+            if inventory_ids.size and inventory_ids.min() < 0:
+                # Items without a component still count towards the status totals
+                linked = inventory_ids >= 0
+                unlinked_totals = np.bincount(status[~linked], minlength=num_status)
+                status, inventory_ids = status[linked], inventory_ids[linked]
+
+            max_id = int(inventory_ids.max()) if inventory_ids.size else -1
+            if max_id < 4 * inventory_ids.size + 65536:
+                # Dense ids (BIGSERIAL): bincount straight over id * num_status + code
+                row_ids = None
+                keys = inventory_ids * num_status + status
+                num_rows = max_id + 1
+            else:
+                # Sparse ids: compact them first
+                row_ids, inverse = np.unique(inventory_ids, return_inverse=True)
+                keys = inverse * num_status + status
+                num_rows = row_ids.size
+
+            matrix = np.bincount(keys, minlength=num_rows * num_status).reshape(num_rows, num_status)
+            totals = matrix.sum(axis=0)
+            if unlinked_totals is not None:
+                totals = totals + unlinked_totals
+            self._status_totals = totals.tolist()
+
+            present = np.flatnonzero(matrix.any(axis=1))
+            ids = present if row_ids is None else row_ids[present]
+            self._by_inventory = dict(zip(ids.tolist(), matrix[present].tolist()))
+        else:
+            totals = [0] * num_status
+            by_inventory: Dict[int, List[int]] = {}
+            for inventory_id, code in zip(store._inventory_ids, store._status):
+                totals[code] += 1
+                if inventory_id != MISSING_ID:
+                    by_inventory.setdefault(inventory_id, [0] * num_status)[code] += 1
+            self._status_totals = totals
+            self._by_inventory = by_inventory
+
+        self._version = store.version
+
+    @property
+    def total(self) -> int:
+        """Total number of items."""
+        return len(self.store)
+
+    def status_counts(self, statuses=ITEM_STATUSES) -> Dict[str, int]:
+        """Item count per status name (statuses missing from the store count 0)."""
+        self._refresh()
+        names = self.store.status_names
+        counts = {status: 0 for status in statuses}
+        for code, count in enumerate(self._status_totals):
+            if names[code] in counts:
+                counts[names[code]] += count
+        return counts
+
+    def count(self, status: str) -> int:
+        """Number of items with the given status."""
+        return self.status_counts((status,))[status]
+
+    def inventory_status_counts(self, inventory_id: int, statuses=ITEM_STATUSES) -> Dict[str, int]:
+        """Item count per status for one component."""
+        self._refresh()
+        names = self.store.status_names
+        row = self._by_inventory.get(inventory_id)
+        counts = {status: 0 for status in statuses}
+        if row:
+            for code, count in enumerate(row):
+                if names[code] in counts:
+                    counts[names[code]] += count
+        return counts
+
+    def top_components(self, inventory_list: List[Dict], n: int = 5,
+                       status: str = "Available") -> List[Tuple[Dict, int]]:
+        """
+        Rank components by how many of their items have a status.
+
+        Args:
+            inventory_list: Inventory records to rank (ties keep this order)
+            n: Number of components to return
+            status: Status to count
+
+        Returns:
+            List of (inventory record, count), highest count first
+        """
+        self._refresh()
+        code = self.store.status_names.index(status) if status in self.store.status_names else None
+        ranked = [
+            (inv, self._by_inventory[inv["id"]][code] if code is not None and inv["id"] in self._by_inventory else 0)
+            for inv in inventory_list
+        ]
+        ranked.sort(key=lambda pair: pair[1], reverse=True)
+        return ranked[:n]
+
+    def course_counts(self, inventory_list: List[Dict], status: Optional[str] = None) -> Dict[str, int]:
+        """
+        Item count per course (components without a course are grouped under "N/A").
+
+        Args:
+            inventory_list: Inventory records providing each component's course
+            status: Only count items with this status (all items if None)
+        """
+        self._refresh()
+        names = self.store.status_names
+        counts: Dict[str, int] = {}
+        for inv in inventory_list:
+            row = self._by_inventory.get(inv["id"])
+            if not row:
+                continue
+            course = str(inv.get("course") or "").strip() or "N/A"
+            if status is None:
+                count = sum(row)
+            else:
+                count = sum(c for code, c in enumerate(row) if names[code] == status)
+            counts[course] = counts.get(course, 0) + count
+        return counts
+
+
+# ============================================================
+# DATA ZONE: Change Events
+# ============================================================
+# PERFORMANCE OPTIMIZATION: Targeted cache patching instead of invalidation.
+#
+# Every DatabaseManager write publishes a typed event describing exactly what
+# changed. LabApp subscribes once and patches the affected cache records in
+# place (one item status, one student, a handful of new items), so a return
+# no longer empties the cache and forces a full get_all_items() refetch.
+#
+# Events are published on the thread that performed the write, after the
+# write succeeded (mock or Supabase).
+
+class ItemStatusChanged(NamedTuple):
+    """An item's status changed (issued, returned, reported damaged)."""
+    item_id: int
+    status: str
+
+
+class ItemsAdded(NamedTuple):
+    """New item rows were inserted (restock or bulk import)."""
+    inventory_id: int
+    items: List[Dict]
+
+
+class InventoryChanged(NamedTuple):
+    """An inventory record was created or updated (e.g. total_qty after a restock)."""
+    inventory: Dict
+
+
+class TransactionCreated(NamedTuple):
+    """Items were issued to a student."""
+    transaction_id: int
+    student_id: int
+    item_ids: List[int]
+
+
+class TransactionClosed(NamedTuple):
+    """A transaction was closed by a return or a damage report."""
+    transaction_id: int
+    item_id: int
+
+
+class StudentAdded(NamedTuple):
+    """A student record was created."""
+    student: Dict
+
+
+class StudentRemoved(NamedTuple):
+    """A student record was deleted."""
+    student_id: int
+
+
+class ChangeEventBus:
+    """Minimal publish/subscribe hub for change events."""
+
+    def __init__(self):
+        self._subscribers: List[Callable] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable) -> Callable:
+        """
+        Register a callback that receives every published event.
+
+        Returns:
+            Function that removes the subscription again
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, event):
+        """Deliver an event to every subscriber (a failing subscriber does not stop the rest)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                sync_log.error("Error handling %s: %s", type(event).__name__, e)
+
+
+# ============================================================
+# CONFIG ZONE: Optimistic Writes
+# ============================================================
+# PERFORMANCE OPTIMIZATION: Optimistic UI with a write-behind queue.
+#
+# With OPTIMISTIC_WRITES on, Issue/Return/Report Damaged update the cache and
+# the screen immediately and hand the Supabase writes to a background queue:
+# - Ordered: one worker thread executes writes in submission order
+# - Batched: consecutive returns/damage reports go out as one close_loans() call
+# - Coalesced: a second write for the same item replaces a queued one
+# If a write fails, LabApp rolls the affected items back and tells the operator.
+OPTIMISTIC_WRITES = True
+WRITE_BATCH_SIZE = 50             # Max queued writes taken per batch
+
+
+class PendingWrite(NamedTuple):
+    """One queued mutation for the WriteBehindQueue."""
+    kind: str                     # "issue" or "close"
+    payload: Dict                 # Arguments for the DatabaseManager call
+    callback: Callable            # callback(success, result), called on the worker thread
+    key: Optional[Tuple] = None   # Writes with the same key merge while queued
+
+
+class WriteBehindQueue:
+    """
+    Ordered background queue that executes DatabaseManager writes.
+
+    Callbacks run on the worker thread; LabApp re-dispatches them to the Tk
+    main thread with self.after().
+    """
+
+    def __init__(self, db_getter: Callable):
+        """
+        Args:
+            db_getter: Returns the current DatabaseManager (it is replaced on Sync)
+        """
+        self._db_getter = db_getter
+        self._pending: List[PendingWrite] = []
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._worker = None
+
+    def submit(self, write: PendingWrite):
+        """
+        Queue a write, merging it into a queued write with the same key.
+
+        The merged write keeps its place in the queue, takes the newer payload
+        values and reports to both callbacks. The newer callback runs first, so
+        when the write fails the older one's rollback (to the status from
+        before either change) is the one that sticks.
+        """
+        with self._condition:
+            if write.key is not None:
+                for index, queued in enumerate(self._pending):
+                    if queued.key == write.key:
+                        self._pending[index] = queued._replace(
+                            payload={**queued.payload, **write.payload},
+                            callback=self._chain(write.callback, queued.callback)
+                        )
+                        break
+                else:
+                    self._pending.append(write)
+            else:
+                self._pending.append(write)
+
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    @staticmethod
+    def _chain(*callbacks: Callable) -> Callable:
+        def callback(success, result):
+            for cb in callbacks:
+                try:
+                    cb(success, result)
+                except Exception as e:
+                    sync_log.error("Error in write callback: %s", e)
+        return callback
+
+    def pending_count(self) -> int:
+        """Number of writes queued or being executed."""
+        with self._condition:
+            return len(self._pending) + self._in_flight
+
+    def drain(self, timeout: float = 10.0) -> bool:
+        """
+        Wait until every queued write has been executed.
+
+        Returns:
+            True if the queue drained within the timeout
+        """
+        deadline = datetime.now() + timedelta(seconds=timeout)
+        with self._condition:
+            while self._pending or self._in_flight:
+                remaining = (deadline - datetime.now()).total_seconds()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                batch = self._pending[:WRITE_BATCH_SIZE]
+                del self._pending[:WRITE_BATCH_SIZE]
+                self._in_flight = len(batch)
+
+            for group in self._group(batch):
+                self._execute(group)
+
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    @staticmethod
+    def _group(batch: List[PendingWrite]) -> List[List[PendingWrite]]:
+        """Split a batch into execution units, merging consecutive closes (order is kept)."""
+        groups: List[List[PendingWrite]] = []
+        for write in batch:
+            if write.kind == "close" and groups and groups[-1][0].kind == "close":
+                groups[-1].append(write)
+            else:
+                groups.append([write])
+        return groups
+
+    def _execute(self, group: List[PendingWrite]):
+        db = self._db_getter()
+        try:
+            if group[0].kind == "issue":
+                result = db.create_transaction(**group[0].payload)
+                success = result is not None
+            else:
+                closures = [(w.payload["item_id"], w.payload["transaction_id"], w.payload["status"])
+                            for w in group]
+                result = db.close_loans(closures)
+                success = bool(result)
+        except ItemsUnavailableError as e:
+            # Lost a race with another station; the callback reports which items
+            result, success = e, False
+        except Exception as e:
+            sync_log.error("Error executing queued write: %s", e)
+            result, success = None, False
+
+        for write in group:
+            try:
+                write.callback(success, result)
+            except Exception as e:
+                sync_log.error("Error in write callback: %s", e)
 
-# Pandas for CSV import functionality
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    print("Warning: Pandas not installed. CSV import will not be available.")
 
-# Matplotlib imports for data visualization
-# We use TkAgg backend to embed matplotlib figures directly into CustomTkinter
-try:
-    import matplotlib
-    matplotlib.use('TkAgg')  # Set backend before importing pyplot
-    from matplotlib import pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    from matplotlib.figure import Figure
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
-    print("Warning: Matplotlib not installed. Charts will not be displayed.")
+# ============================================================
+# CONFIG ZONE: Offline Write Journal
+# ============================================================
+# RELIABILITY + PERFORMANCE: Durable journal for writes made while offline.
+#
+# When the lab Wi-Fi drops, DatabaseManager writes no longer fail. Instead they
+# are appended to a local SQLite journal (fsync'd on every commit) and the UI
+# carries on with a provisional (negative) id. Once Supabase answers again a
+# background thread replays the journal:
+# - In order: entries replay by sequence number, and new writes queue behind
+#   any pending entries instead of overtaking them
+# - Idempotent: every entry has an op_key; applied keys are recorded in the
+#   client_writes table and issues carry it as transactions.client_ref
+# - Batched: runs of issues, returns and student changes go out as a few bulk
+#   requests, so hundreds of queued operations drain in seconds
+# Entries the server rejects (not network errors) are retried a few times and
+# then moved to the failed_writes table for manual follow-up.
+JOURNAL_ENABLED = True
 
-# Try to import supabase, fall back to mock if not available
-try:
-    from supabase import create_client, Client
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
-    print("Warning: Supabase not installed. Using mock data.")
 
-# Try to load environment variables from .env file
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # python-dotenv not installed, use system env vars
+def _default_journal_path() -> str:
+    """Per-user data directory for the journal, so it survives launching from another folder."""
+    if sys.platform == "win32":
+        base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+        data_dir = os.path.join(base, "LabTrack")
+    elif sys.platform == "darwin":
+        data_dir = os.path.expanduser("~/Library/Application Support/LabTrack")
+    else:
+        base = os.getenv("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        data_dir = os.path.join(base, "labtrack")
+    try:
+        os.makedirs(data_dir, exist_ok=True)
+    except OSError:
+        # Read-only home: fall back to the folder the app lives in
+        data_dir = os.path.dirname(os.path.abspath(sys.executable if getattr(sys, "frozen", False) else __file__))
+    return os.path.join(data_dir, "labtrack_journal.db")
+
+
+JOURNAL_PATH = os.getenv("LABTRACK_JOURNAL") or None  # None: resolved by WriteJournal (per-user data dir)
+JOURNAL_REPLAY_BATCH = 200        # Entries taken per replay round (op_keys travel in one URL)
+JOURNAL_RETRY_SECONDS = 5.0       # Wait between reconnect attempts while offline
+JOURNAL_MAX_ATTEMPTS = 5          # Rejections before an entry moves to failed_writes
+
+
+class OfflineError(Exception):
+    """Raised inside a journaled write when Supabase cannot be reached."""
+
+
+def is_network_error(error: Exception) -> bool:
+    """True for connection failures and timeouts (as opposed to rejected requests)."""
+    if isinstance(error, OfflineError):
+        return True
+    if HTTPX_AVAILABLE and isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, OSError)
+
+
+class JournalEntry(NamedTuple):
+    """One pending write in the WriteJournal."""
+    seq: int                      # Replay order; -seq is the provisional id
+    op_key: str                   # Idempotency key
+    method: str                   # DatabaseManager method name
+    args: Dict                    # Keyword arguments for the method
+    created_at: str               # When the operator made the change (ISO format)
+    attempts: int
+
+
+class JournalChanged(NamedTuple):
+    """Published when the number of journaled (not yet synced) writes changes."""
+    pending: int
+    failed: int
+
+
+class WriteJournal:
+    """
+    Append-only SQLite journal of writes waiting for Supabase.
+
+    One journal is shared by every DatabaseManager in the process; attach()
+    hands it the newest connected manager, which the replay thread uses.
+    """
+
+    def __init__(self, path: Optional[str] = JOURNAL_PATH, event_bus: Optional[ChangeEventBus] = None):
+        """
+        Args:
+            path: SQLite file for the journal (None: labtrack_journal.db in the
+                per-user data directory, created on first use)
+            event_bus: Bus that JournalChanged events are published to
+        """
+        path = path or _default_journal_path()
+        self.path = path
+        self.events = event_bus
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")  # fsync on every commit
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pending_writes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                op_key TEXT NOT NULL UNIQUE,
+                method TEXT NOT NULL,
+                args TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS failed_writes (
+                seq INTEGER PRIMARY KEY,
+                op_key TEXT NOT NULL,
+                method TEXT NOT NULL,
+                args TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS id_map (
+                provisional INTEGER PRIMARY KEY,
+                real INTEGER NOT NULL
+            );
+        """)
+        self._db = None
+        self._wake = threading.Event()
+        self._replayer = None
+
+    def append(self, op_key: str, method: str, args: Dict) -> int:
+        """
+        Durably record a write.
+
+        Returns:
+            Sequence number of the entry (its provisional id is -seq)
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO pending_writes (op_key, method, args, created_at) VALUES (?, ?, ?, ?)",
+                (op_key, method, json.dumps(args, default=str), datetime.now().isoformat())
+            )
+            seq = cursor.lastrowid
+        self._notify()
+        self._start_replay()
+        return seq
+
+    def pending(self, limit: int = JOURNAL_REPLAY_BATCH) -> List[JournalEntry]:
+        """Oldest pending entries, in replay order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, op_key, method, args, created_at, attempts FROM pending_writes "
+                "ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [JournalEntry(seq, op_key, method, json.loads(args), created_at, attempts)
+                for seq, op_key, method, args, created_at, attempts in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pending_writes").fetchone()[0]
+
+    def failed_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM failed_writes").fetchone()[0]
+
+    def complete(self, op_keys: List[str], id_map: Optional[Dict[int, int]] = None):
+        """Remove applied entries and remember the real ids of their provisional ids."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("DELETE FROM pending_writes WHERE op_key = ?",
+                                   [(op_key,) for op_key in op_keys])
+            if id_map:
+                self._conn.executemany("INSERT OR REPLACE INTO id_map (provisional, real) VALUES (?, ?)",
+                                       list(id_map.items()))
+            self._conn.execute("COMMIT")
+
+    def reject(self, entry: JournalEntry, error: str, final: bool = False):
+        """Count a server rejection; give up on the entry after JOURNAL_MAX_ATTEMPTS (or at once if final)."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            if final or entry.attempts + 1 >= JOURNAL_MAX_ATTEMPTS:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO failed_writes (seq, op_key, method, args, created_at, error) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (entry.seq, entry.op_key, entry.method, json.dumps(entry.args, default=str),
+                     entry.created_at, error)
+                )
+                self._conn.execute("DELETE FROM pending_writes WHERE seq = ?", (entry.seq,))
+            else:
+                self._conn.execute(
+                    "UPDATE pending_writes SET attempts = attempts + 1, last_error = ? WHERE seq = ?",
+                    (error, entry.seq)
+                )
+            self._conn.execute("COMMIT")
+
+    def real_ids(self, provisional_ids: List[int]) -> Dict[int, int]:
+        """Look up the real ids assigned to provisional (negative) ids."""
+        if not provisional_ids:
+            return {}
+        with self._lock:
+            placeholders = ",".join("?" * len(provisional_ids))
+            rows = self._conn.execute(
+                f"SELECT provisional, real FROM id_map WHERE provisional IN ({placeholders})",
+                list(provisional_ids)
+            ).fetchall()
+        return dict(rows)
+
+    def attach(self, db: "DatabaseManager"):
+        """
+        Use this connected DatabaseManager for replay.
+
+        The owner calls this once it can take replayed change events (LabApp
+        does so from the Tk loop at startup and again after each Sync), since
+        replay starts straight away when entries are pending.
+        """
+        self._db = db
+        if self.count():
+            self._start_replay()
+        self._wake.set()
+
+    def _notify(self):
+        if self.events is not None:
+            self.events.publish(JournalChanged(self.count(), self.failed_count()))
+
+    def _start_replay(self):
+        if self._db is None:
+            return
+        with self._lock:
+            if self._replayer is None or not self._replayer.is_alive():
+                self._replayer = threading.Thread(target=self._run, daemon=True)
+                self._replayer.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            entries = self.pending()
+            if not entries:
+                self._wake.clear()
+                self._wake.wait()
+                continue
+
+            try:
+                applied, rejected, id_map = self._db.replay_journal(entries)
+            except Exception as e:
+                sync_log.error("Error replaying journal: %s", e)
+                applied, rejected, id_map = [], [], {}
+            if applied:
+                self.complete(applied, id_map)
+            for entry, error, final in rejected:
+                sync_log.warning("Journaled %s rejected by server: %s", entry.method, error)
+                self.reject(entry, error, final)
+            if applied or rejected:
+                self._notify()
+            if any(not final for _, _, final in rejected) or len(applied) + len(rejected) < len(entries):
+                # Still offline (or retrying a rejection): wait, or wake early on a new write
+                self._wake.clear()
+                self._wake.wait(JOURNAL_RETRY_SECONDS)
+
+
+def journaled(offline_result: Callable):
+    """
+    Decorator for DatabaseManager writes that survive a lost connection.
+
+    Online, the write runs normally with a fresh op_key. If Supabase cannot be
+    reached (or earlier writes are still queued) the call is appended to the
+    journal and offline_result(db, seq, args) supplies the return value.
+
+    Args:
+        offline_result: Builds the method's return value for a journaled call
+            (and publishes the provisional change events)
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # Nested calls (e.g. bulk_import_inventory -> restock_many) run inside the outer write
+            if (self.journal is None or self.use_mock or getattr(self._local, "replaying", False)
+                    or getattr(self._local, "raise_offline", False)):
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            call_args = {name: value for name, value in bound.arguments.items() if name != "self"}
+            op_key = uuid.uuid4().hex
+
+            if not self.journal.count():
+                self._local.op_key = op_key
+                self._local.raise_offline = True
+                try:
+                    return method(self, *args, **kwargs)
+                except OfflineError as e:
+                    sync_log.warning("Offline (%s). Saving %s to the local journal.", e, method.__name__)
+                finally:
+                    self._local.op_key = None
+                    self._local.raise_offline = False
+
+            seq = self.journal.append(op_key, method.__name__, call_args)
+            return offline_result(self, seq, call_args)
+
+        return wrapper
+    return decorator
+
+
+def _queued_transaction(db, seq: int, args: Dict) -> int:
+    db._publish_issued(-seq, args["student_id"], args["item_ids"])
+    return -seq
+
+
+def _queued_close(status: str) -> Callable:
+    def result(db, seq: int, args: Dict) -> bool:
+        db._publish_closed(args["transaction_id"], args["item_id"], status)
+        return True
+    return result
+
+
+def _queued_close_loans(db, seq: int, args: Dict) -> bool:
+    for item_id, transaction_id, status in args["closures"]:
+        db._publish_closed(transaction_id, item_id, status)
+    return True
+
+
+def _queued_student(db, seq: int, args: Dict) -> int:
+    db.events.publish(StudentAdded({"id": -seq, **args["student_data"]}))
+    return -seq
+
+
+def _queued_student_delete(db, seq: int, args: Dict) -> bool:
+    db.events.publish(StudentRemoved(args["student_id"]))
+    return True
+
+
+def _queued_restock(db, seq: int, args: Dict) -> bool:
+    # New items get their ids (and auto serials) from the server during replay
+    return True
+
+
+def _queued_import(db, seq: int, args: Dict) -> Tuple[int, int]:
+    return (0, 0)
+
+
+def _queued_restock_many(db, seq: int, args: Dict) -> List[Dict]:
+    return []
+
+
+# ============================================================
+# CONFIG ZONE: Serial Numbers
+# ============================================================
+# PERFORMANCE OPTIMIZATION: Serial numbers come from a per-prefix counter.
+#
+# The old approach downloaded every serial_number of a component and parsed
+# the largest number in Python: the cost grew with stock size, and two
+# stations restocking at once could pick the same numbers. Now Supabase keeps
+# one counter per prefix (allocate_serials(), section 11 of supabase_setup.sql)
+# and reserves a contiguous block of N serials in one atomic round trip.
+# Mock data uses SerialAllocator, the same algorithm in memory.
+#
+# Numbers are padded to SERIAL_MIN_WIDTH digits, or wider when a block goes
+# past 999 (e.g. ARD0998, ARD0999, ARD1000), so one block has one width.
+SERIAL_MIN_WIDTH = 3
+
+
+def serial_prefix(component_name: str) -> str:
+    """
+    Serial prefix for a component: its first 3 letters, uppercase, without spaces.
+
+    Examples: "Arduino" -> "ARD", "Raspberry Pi" -> "RAS", "Pi" -> "PIX"
+    """
+    prefix = component_name[:3].upper().replace(' ', '')
+    if len(prefix) < 3:
+        prefix = prefix.ljust(3, 'X')  # Pad if too short
+    return prefix
+
+
+def format_serials(prefix: str, first: int, count: int, min_width: int = SERIAL_MIN_WIDTH) -> List[str]:
+    """Serials prefix+first .. prefix+(first+count-1), all with the same zero-padded width."""
+    width = max(min_width, len(str(first + count - 1)))
+    return [f"{prefix}{number:0{width}d}" for number in range(first, first + count)]
+
+
+class SerialAllocator:
+    """
+    In-memory equivalent of the allocate_serials() database function.
+
+    Each prefix's counter is seeded from the existing serials the first time
+    the prefix is used, then only the counter is consulted.
+    """
+
+    def __init__(self, items_getter: Callable):
+        """
+        Args:
+            items_getter: Returns the current item dictionaries (used for seeding)
+        """
+        self._items_getter = items_getter
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _seed(self, prefix: str) -> int:
+        last = 0
+        for item in self._items_getter():
+            serial = item.get("serial_number", "")
+            suffix = serial[len(prefix):]
+            if serial.startswith(prefix) and suffix.isdigit():
+                last = max(last, int(suffix))
+        return last
+
+    def allocate(self, prefix: str, count: int, min_width: int = SERIAL_MIN_WIDTH) -> List[str]:
+        """Reserve the next count serials for prefix."""
+        if count <= 0:
+            return []
+        with self._lock:
+            if prefix not in self._counters:
+                self._counters[prefix] = self._seed(prefix)
+            first = self._counters[prefix] + 1
+            self._counters[prefix] += count
+        return format_serials(prefix, first, count, min_width)
+
 
+# Serial-existence filter for manual serials (restock popup, Restock CSV)
+SERIAL_FILTER_FP_RATE = 0.01      # Bloom false-positive rate before the exact check
+SERIAL_FILTER_MIN_CAPACITY = 1024
 
+
+def _serial_hashes(key: bytes) -> Tuple[int, int]:
+    """Two independent 64-bit hashes of a serial (for double hashing)."""
+    if MMH3_AVAILABLE:
+        return mmh3.hash64(key, signed=False)
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class SerialFilter:
+    """
+    "Is this serial already in use?" for the whole items table, without a query.
+
+    PERFORMANCE: A Bloom filter answers "definitely not in use" for almost
+    every new serial with a few bit tests (~1.2 bytes per serial, about 600 KB
+    for 500k serials). Only when the filter says "maybe" is the answer
+    confirmed against an exact set of serials, which is built from the
+    ItemStore on the first such hit. Checks are case-insensitive, like the
+    scanner lookup.
+
+    The filter follows the cached ItemStore: sync_from() adds the serials
+    appended since the last call (restocks, imports) and rebuilds when the
+    cache was replaced by a sync.
+    """
+
+    def __init__(self, capacity: int = SERIAL_FILTER_MIN_CAPACITY,
+                 fp_rate: float = SERIAL_FILTER_FP_RATE):
+        """
+        Args:
+            capacity: Number of serials the filter is sized for (it rebuilds when exceeded)
+            fp_rate: Target false-positive rate at capacity
+        """
+        capacity = max(capacity, SERIAL_FILTER_MIN_CAPACITY)
+        self.capacity = capacity
+        self.num_bits = max(64, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._exact: Optional[set] = None
+        self._store = None
+        self._store_size = 0
+        self.count = 0
+        self.exact_checks = 0
+
+    def _positions(self, key: bytes):
+        h1, h2 = _serial_hashes(key)
+        return [((h1 + i * h2) & 0xFFFFFFFFFFFFFFFF) % self.num_bits for i in range(self.num_hashes)]
+
+    def _add_many(self, serials: List[str]):
+        keys = [serial.upper().encode("utf-8") for serial in serials]
+        if NUMPY_AVAILABLE and len(keys) > 1000:
+            # Vectorized bit setting for the initial build (hashing stays per serial)
+            hashes = np.array([_serial_hashes(key) for key in keys], dtype=np.uint64).reshape(-1, 2)
+            steps = np.arange(self.num_hashes, dtype=np.uint64)
+            positions = ((hashes[:, :1] + steps * hashes[:, 1:]) % np.uint64(self.num_bits)).ravel()
+            bits = np.frombuffer(self._bits, dtype=np.uint8).copy()
+            np.bitwise_or.at(bits, (positions >> np.uint64(3)).astype(np.int64),
+                             np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+            self._bits = bytearray(bits.tobytes())
+        else:
+            for key in keys:
+                for position in self._positions(key):
+                    self._bits[position >> 3] |= 1 << (position & 7)
+        if self._exact is not None:
+            self._exact.update(serial.upper() for serial in serials)
+        self.count += len(keys)
+
+    def sync_from(self, store: "ItemStore"):
+        """Bring the filter up to date with the cached ItemStore."""
+        if store is self._store and len(store) >= self._store_size:
+            if len(store) == self._store_size:
+                return
+            if self.count + len(store) - self._store_size <= self.capacity:
+                self._add_many(store.serials(self._store_size))
+                self._store_size = len(store)
+                return
+
+        # First build, a replaced cache, or over capacity: rebuild with headroom
+        self.__init__(capacity=len(store) * 2)
+        self._add_many(store.serials())
+        self._store = store
+        self._store_size = len(store)
+
+    def __contains__(self, serial: str) -> bool:
+        key = str(serial).strip().upper()
+        encoded = key.encode("utf-8")
+        if not all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(encoded)):
+            return False  # Definitely not in use
+        self.exact_checks += 1
+        if self._exact is None:
+            self._exact = self._store.serial_set() if self._store is not None else set()
+        return key in self._exact
+
+    def find_existing(self, serials: List[str]) -> List[str]:
+        """Return the serials (as given) that are already in use."""
+        return [serial for serial in serials if serial in self]
+
+
+# Bulk restock from a delivery manifest (Inventory > Restock CSV)
+RESTOCK_BATCH_ITEMS = 2000        # Max new items per restock_many() request
+
+
+def parse_serial_list(value) -> List[str]:
+    """Split a CSV cell of manual serials ("A1; A2, A3", one per line, ...) into a list."""
+    if value is None or (isinstance(value, float) and value != value):  # Blank cell (NaN)
+        return []
+    return [serial for serial in re.split(r"[;,|\s]+", str(value)) if serial]
+
+
+def plan_bulk_restock(rows: List[Dict], inventory_list: List[Dict],
+                      existing_serials) -> Tuple[List[Tuple[Dict, Dict]], List[Dict]]:
+    """
+    Validate a restock manifest in one pass, before anything is written.
+
+    Each row names an existing component and gives a Quantity (auto-generated
+    serials) and/or a list of manual Serials. Manual serials are checked
+    case-insensitively against the serials already in use and against every
+    earlier row of the same file.
+
+    Args:
+        rows: CSV rows with 'Component Name' plus 'Quantity' and/or 'Serials'
+        inventory_list: Existing components
+        existing_serials: Serials already in use (a SerialFilter, or a set of upper-cased serials)
+
+    Returns:
+        Tuple of (planned, outcomes): planned is [(outcome, restock)] for the
+        valid rows, where restock is ready for DatabaseManager.restock_many();
+        outcomes has one {"row", "component", "ok", "count", "message"} per row
+    """
+    by_name = {str(inv.get("name", "")).strip().upper(): inv for inv in inventory_list}
+    claimed = set()  # Serials used by earlier rows of this file
+    planned: List[Tuple[Dict, Dict]] = []
+    outcomes: List[Dict] = []
+
+    for row_number, row in enumerate(rows, start=2):  # Row 1 is the header
+        name = str(row.get('Component Name') or '').strip()
+        outcome = {"row": row_number, "component": name, "ok": False, "count": 0, "message": ""}
+        outcomes.append(outcome)
+
+        inventory = by_name.get(name.upper())
+        if inventory is None:
+            outcome["message"] = "Unknown component" if name else "Missing component name"
+            continue
+
+        quantity = row.get('Quantity')
+        try:
+            quantity = None if quantity is None or quantity != quantity or str(quantity).strip() == "" \
+                else int(float(quantity))
+        except (TypeError, ValueError):
+            outcome["message"] = f"Invalid quantity: {quantity}"
+            continue
+
+        serials = parse_serial_list(row.get('Serials'))
+        if serials:
+            if quantity is not None and quantity != len(serials):
+                outcome["message"] = f"Quantity {quantity} but {len(serials)} serials listed"
+                continue
+            clashes = []
+            row_serials = set()
+            for serial in serials:
+                key = serial.upper()
+                if key in existing_serials or key in claimed or key in row_serials:
+                    clashes.append(serial)
+                row_serials.add(key)
+            if clashes:
+                shown = ", ".join(clashes[:5]) + (f" (+{len(clashes) - 5} more)" if len(clashes) > 5 else "")
+                outcome["message"] = f"Serial(s) already in use: {shown}"
+                continue
+            claimed.update(row_serials)
+            restock = {"inventory_id": inventory["id"], "serials": serials}
+        elif quantity is None or quantity <= 0:
+            outcome["message"] = "Quantity must be a positive number"
+            continue
+        else:
+            restock = {"inventory_id": inventory["id"], "quantity": quantity}
+
+        outcome["ok"] = True
+        outcome["count"] = len(serials) or quantity
+        planned.append((outcome, restock))
+
+    return planned, outcomes
+
+
+# ============================================================
+# CONFIG ZONE: Query Cache
+# ============================================================
+# PERFORMANCE OPTIMIZATION: Memoize slow-changing DatabaseManager reads.
+#
+# The Add Component form asked the server for the inventory schema every time
+# it opened, the staff list was fetched by three different code paths, and
+# the name lookup in Issue Items re-ran two queries per keystroke-and-Enter.
+# Reads decorated with @memoized are served from a TTLCache (cachetools):
+#   - Each method has its own TTL (QUERY_CACHE_TTLS, seconds) so changes made
+#     at other stations still show up within that time
+#   - Each method's cache holds at most QUERY_CACHE_MAXSIZE argument sets and
+#     evicts the least recently used one when full
+#   - Writes decorated with @invalidates drop the related caches, so this
+#     station never sees its own writes stale
+# Failed reads are not cached. db.query_cache.stats() reports hits/misses;
+# they are counted in PERF ("cache.hits.<method>"), so they survive Sync.
+QUERY_CACHE_TTLS = {
+    "get_inventory_schema": 3600,
+    "get_all_staff": 300,
+    "get_available_items_by_name": 30,
+}
+QUERY_CACHE_MAXSIZE = 128
+
+
+class QueryCache:
+    """Per-method TTL + LRU caches for DatabaseManager reads (hits/misses are counted in PERF)."""
+
+    def __init__(self, ttls: Dict[str, float] = QUERY_CACHE_TTLS, maxsize: int = QUERY_CACHE_MAXSIZE):
+        """
+        Args:
+            ttls: Method name -> seconds a result stays valid
+            maxsize: Maximum cached argument sets per method
+        """
+        self._caches = {name: TTLCache(maxsize, ttl) for name, ttl in ttls.items()} if CACHETOOLS_AVAILABLE else {}
+        self._generations: Dict[str, int] = {name: 0 for name in ttls}
+        self._lock = threading.Lock()
+
+    def lookup(self, name: str, key) -> Tuple[bool, object, int]:
+        """
+        Look up a cached result.
+
+        Returns:
+            Tuple of (found, value, generation); pass generation back to store()
+        """
+        with self._lock:
+            cache = self._caches.get(name)
+            if cache is not None and key in cache:
+                PERF.count(f"cache.hits.{name}")
+                return True, cache[key], self._generations[name]
+            if name in self._generations:
+                PERF.count(f"cache.misses.{name}")
+            return False, None, self._generations.get(name, 0)
+
+    def store(self, name: str, key, value, generation: int):
+        """Cache a result, unless the method was invalidated while it was being fetched."""
+        with self._lock:
+            cache = self._caches.get(name)
+            if cache is not None and self._generations[name] == generation:
+                cache[key] = value
+
+    def invalidate(self, *names: str):
+        """Drop every cached result of the named methods (all methods if none given)."""
+        with self._lock:
+            for name in names or tuple(self._caches):
+                if name in self._caches:
+                    self._caches[name].clear()
+                if name in self._generations:
+                    self._generations[name] += 1
+
+    def stats(self) -> Dict[str, Dict]:
+        """Method name -> {"hits", "misses", "hit_rate", "size"} (hits/misses since PERF.reset())."""
+        hits, misses = PERF.counters("cache.hits."), PERF.counters("cache.misses.")
+        with self._lock:
+            return {
+                name: {
+                    "hits": hits.get(name, 0),
+                    "misses": misses.get(name, 0),
+                    "hit_rate": hits.get(name, 0) / max(1, hits.get(name, 0) + misses.get(name, 0)),
+                    "size": len(self._caches[name]) if name in self._caches else 0,
+                }
+                for name in self._generations
+            }
+
+
+def memoized(method):
+    """Serve a DatabaseManager read from db.query_cache (see QUERY_CACHE_TTLS)."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        found, value, generation = self.query_cache.lookup(name, key)
+        if found:
+            self._local.cache_hit = True  # Not a backend request (see QueryAudit)
+            return value
+
+        self._local.read_failed = False
+        value = method(self, *args, **kwargs)
+        if not self._local.read_failed:
+            self.query_cache.store(name, key, value, generation)
+        return value
+
+    return wrapper
+
+
+def invalidates(*names: str):
+    """
+    Decorator for DatabaseManager writes: afterwards, drop the named memoized
+    reads (all if none given) and detach in-flight coalesced reads.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.query_cache.invalidate(*names)
+                self.inflight.forget()
+        return wrapper
+    return decorator
+
+
+# PERFORMANCE OPTIMIZATION: Coalesce identical reads that are already in flight.
+#
+# On startup _populate_cache_async fetches every table in the background
+# while the first view finds the cache empty and asks for the same tables
+# on the main thread. @coalesced reads (the full-table fetches) go through
+# SingleFlight: a call that arrives while the same call is running waits for
+# it and receives the same result instead of sending a second request. A
+# cold start now sends each heavy query once. Writes (@invalidates) detach
+# the in-flight reads, so a read started after a write never receives a
+# result fetched before it.
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict = {}
+
+    def do(self, key, fn: Callable):
+        """
+        Run fn(), or wait for the identical call already running and return its result.
+
+        Args:
+            key: Identifies the call (method name and arguments)
+            fn: The call to run if none is in flight
+
+        Returns:
+            fn's result (exceptions are raised in every waiting caller)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+        # Counted in PERF so the totals survive Sync (a new DatabaseManager)
+        PERF.count("coalesced.executed" if leader else "coalesced.shared")
+
+        if leader:
+            try:
+                flight.set_result(fn())
+            except BaseException as e:
+                flight.set_exception(e)
+            finally:
+                with self._lock:
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+        return flight.result()
+
+    def forget(self):
+        """Detach every in-flight call: later callers start a new one."""
+        with self._lock:
+            self._flights.clear()
+
+
+def coalesced(method):
+    """Share concurrent identical calls of a DatabaseManager read (see SingleFlight)."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+
+        def call():
+            # The read_failed flag is thread-local, so it travels with the shared
+            # result: every waiter (not just the leader) sees a failed read as
+            # failed, and @memoized never caches its fallback value.
+            failed_before = getattr(self._local, "read_failed", False)
+            self._local.read_failed = False
+            try:
+                return method(self, *args, **kwargs), self._local.read_failed
+            finally:
+                self._local.read_failed = failed_before or self._local.read_failed
+
+        value, failed = self.inflight.do(key, call)
+        if failed:
+            self._local.read_failed = True
+        return value
+
+    return wrapper
+
+
+class ItemsUnavailableError(Exception):
+    """
+    Raised by create_transaction() when cart items were issued elsewhere first.
+
+    Nothing is written in that case (the issue is all-or-nothing).
+
+    Attributes:
+        unavailable: Item ID to its current status ("Issued", or None if the item no longer exists)
+    """
+
+    def __init__(self, unavailable: Dict[int, Optional[str]]):
+        super().__init__(f"{len(unavailable)} item(s) no longer available: {sorted(unavailable)}")
+        self.unavailable = unavailable
+
+
+@instrumented("db")
+@query_audited
 class DatabaseManager:
     """Handles all database operations with Supabase."""
     
-    def __init__(self, url: Optional[str] = None, key: Optional[str] = None):
+    def __init__(self, url: Optional[str] = None, key: Optional[str] = None,
+                 event_bus: Optional[ChangeEventBus] = None,
+                 journal: Optional[WriteJournal] = None):
         """
         Initialize database manager.
         If credentials are not provided, uses mock data.
+
+        Args:
+            url: Supabase project URL
+            key: Supabase API key
+            event_bus: Bus that write methods publish change events to
+                (pass the same bus again when recreating the manager on Sync)
+            journal: Offline write journal (shared across Sync, like event_bus);
+                the caller attaches it once it is ready for replayed events
         """
         self.use_mock = False
+        self.events = event_bus if event_bus is not None else ChangeEventBus()
+        self.journal = journal
+        self._local = threading.local()  # Per-thread op_key / offline flags for journaled writes
+        self.query_cache = QueryCache()  # Memoized reads (fresh on every Sync)
+        self.inflight = SingleFlight()   # Coalesces concurrent identical reads
         
         if url and key and SUPABASE_AVAILABLE:
             try:
-                self.client: Client = create_client(url, key)
+                # PERFORMANCE: Route every request through the shared HTTP/2 pool
+                http_client = get_shared_http_client()
+                if http_client is not None:
+                    options = ClientOptions(httpx_client=http_client)
+                    self.client: Client = create_client(url, key, options=options)
+                else:
+                    self.client: Client = create_client(url, key)
                 # Test connection
                 self.client.table('inventory').select('*').limit(1).execute()
-                print("Connected to Supabase successfully.")
+                db_log.info("Connected to Supabase successfully.")
             except Exception as e:
-                print(f"Failed to connect to Supabase: {e}. Using mock data.")
+                db_log.warning("Failed to connect to Supabase: %s. Using mock data.", e)
                 self.use_mock = True
         else:
             self.use_mock = True
-            print("Using mock data. Set SUPABASE_URL and SUPABASE_KEY to connect.")
+            db_log.info("Using mock data. Set SUPABASE_URL and SUPABASE_KEY to connect.")
         
         if self.use_mock:
             self._init_mock_data()
@@ -146,6 +2534,9 @@ class DatabaseManager:
             }
         ]
         
+        # Per-prefix serial counters (in-memory allocate_serials())
+        self.serial_allocator = SerialAllocator(lambda: self.mock_items)
+        
         self.mock_transaction_items = [
             {
                 "id": 1,
@@ -159,6 +2550,11 @@ class DatabaseManager:
             }
         ]
     
+    def _raise_if_offline(self, error: Exception):
+        """Inside a journaled write, turn a network error into OfflineError so the call is journaled."""
+        if getattr(self._local, "raise_offline", False) and is_network_error(error):
+            raise OfflineError(str(error)) from error
+
     def get_item_by_serial(self, serial_number: str) -> Optional[Dict]:
         """Get item by serial number."""
         if self.use_mock:
@@ -173,9 +2569,10 @@ class DatabaseManager:
                     return result.data[0]
                 return None
             except Exception as e:
-                print(f"Error fetching item: {e}")
+                db_log.error("Error fetching item: %s", e)
                 return None
     
+    @memoized
     def get_available_items_by_name(self, component_name: str) -> List[Dict]:
         """Get all available items for a component name."""
         if self.use_mock:
@@ -208,9 +2605,11 @@ class DatabaseManager:
                 result = self.client.table('items').select('*, inventory(*)').in_('inventory_id', inventory_ids).eq('status', 'Available').execute()
                 return result.data
             except Exception as e:
-                print(f"Error fetching available items: {e}")
+                self._local.read_failed = True
+                db_log.error("Error fetching available items: %s", e)
                 return []
     
+    @coalesced
     def get_all_students(self) -> List[Dict]:
         """Get all students."""
         if self.use_mock:
@@ -220,9 +2619,11 @@ class DatabaseManager:
                 result = self.client.table('students').select('*').execute()
                 return result.data
             except Exception as e:
-                print(f"Error fetching students: {e}")
+                db_log.error("Error fetching students: %s", e)
                 return []
     
+    @invalidates("get_all_students")
+    @journaled(_queued_student)
     def create_student(self, student_data: Dict) -> Optional[int]:
         """
         Create a new student record.
@@ -241,15 +2642,22 @@ class DatabaseManager:
             new_id = max([s["id"] for s in self.mock_students], default=0) + 1
             new_student = {"id": new_id, **student_data}
             self.mock_students.append(new_student)
+            self.events.publish(StudentAdded(new_student))
             return new_id
         else:
             try:
                 result = self.client.table('students').insert(student_data).execute()
-                return result.data[0]["id"] if result.data else None
+                if not result.data:
+                    return None
+                self.events.publish(StudentAdded(result.data[0]))
+                return result.data[0]["id"]
             except Exception as e:
-                print(f"Error creating student: {e}")
+                self._raise_if_offline(e)
+                db_log.error("Error creating student: %s", e)
                 return None
     
+    @invalidates("get_all_students")
+    @journaled(_queued_student_delete)
     def delete_student(self, student_id: int) -> bool:
         """
         Delete a student record.
@@ -263,15 +2671,20 @@ class DatabaseManager:
         if self.use_mock:
             # Remove student from mock list
             self.mock_students = [s for s in self.mock_students if s["id"] != student_id]
+            self.events.publish(StudentRemoved(student_id))
             return True
         else:
             try:
                 self.client.table('students').delete().eq('id', student_id).execute()
+                self.events.publish(StudentRemoved(student_id))
                 return True
             except Exception as e:
-                print(f"Error deleting student: {e}")
+                self._raise_if_offline(e)
+                db_log.error("Error deleting student: %s", e)
                 return False
     
+    @memoized
+    @coalesced
     def get_all_staff(self) -> List[Dict]:
         """Get all staff/issuers."""
         if self.use_mock:
@@ -281,9 +2694,12 @@ class DatabaseManager:
                 result = self.client.table('staff').select('*').execute()
                 return result.data
             except Exception as e:
-                print(f"Error fetching staff: {e}")
+                self._local.read_failed = True
+                db_log.error("Error fetching staff: %s", e)
                 return []
     
+    @invalidates("get_available_items_by_name")
+    @journaled(_queued_transaction)
     def create_transaction(self, student_id: int, item_ids: List[int], issuer_id: Optional[int] = None, 
                           custom_issue_date: Optional[str] = None, expected_return_date: Optional[str] = None) -> Optional[int]:
         """
@@ -299,6 +2715,13 @@ class DatabaseManager:
             issuer_id: Optional ID of the staff member issuing the items
             custom_issue_date: Optional custom issue date (ISO format string, e.g., "2024-01-15")
             expected_return_date: Optional expected return date (ISO format string, e.g., "2024-01-22")
+
+        Returns:
+            ID of the new transaction, or None if it could not be saved
+
+        Raises:
+            ItemsUnavailableError: If another station issued any of the items first.
+                The claim is atomic: either every item is issued or none is.
         """
         current_time = datetime.now()
         
@@ -306,6 +2729,13 @@ class DatabaseManager:
         issue_date_str = custom_issue_date if custom_issue_date else current_time.isoformat()
         
         if self.use_mock:
+            # Same all-or-nothing claim as the issue_items() database function
+            statuses = {item["id"]: item["status"] for item in self.mock_items}
+            unavailable = {item_id: statuses.get(item_id) for item_id in item_ids
+                           if statuses.get(item_id) in (None, "Issued")}
+            if unavailable:
+                raise ItemsUnavailableError(unavailable)
+
             transaction_id = len(self.mock_transactions) + 1
             transaction_data = {
                 "id": transaction_id,
@@ -333,41 +2763,67 @@ class DatabaseManager:
                         item["status"] = "Issued"
                         break
             
+            self._publish_issued(transaction_id, student_id, item_ids)
             return transaction_id
         else:
             try:
-                # Create transaction with issue_date for overdue tracking
-                transaction_data = {
-                    "student_id": student_id,
-                    "status": "Active",
-                    "created_at": current_time.isoformat(),
-                    "issue_date": issue_date_str  # Use custom date if provided
-                }
-                if issuer_id:
-                    transaction_data["issuer_id"] = issuer_id
-                if expected_return_date:
-                    transaction_data["expected_return_date"] = expected_return_date
-                
-                trans_result = self.client.table('transactions').insert(transaction_data).execute()
-                
-                transaction_id = trans_result.data[0]["id"]
-                
-                # Create transaction items and update item status
-                for item_id in item_ids:
-                    self.client.table('transaction_items').insert({
-                        "transaction_id": transaction_id,
-                        "item_id": item_id
-                    }).execute()
-                    
-                    self.client.table('items').update({
-                        "status": "Issued"
-                    }).eq('id', item_id).execute()
-                
+                # CONCURRENCY: issue_items() locks the cart's item rows and only
+                # issues them if none is already Issued, all in one database
+                # transaction (and one round trip). Two stations scanning the same
+                # Arduino can no longer both issue it; the loser gets the list of
+                # items it lost and nothing is written for it.
+                result = self.client.rpc('issue_items', {
+                    "p_student_id": student_id,
+                    "p_item_ids": list(item_ids),
+                    "p_issuer_id": issuer_id,
+                    "p_issue_date": issue_date_str,
+                    "p_expected_return_date": expected_return_date,
+                    # Idempotency key: a call cut off mid-way and replayed from the
+                    # offline journal finds its transaction instead of issuing twice
+                    "p_client_ref": getattr(self._local, "op_key", None),
+                }).execute()
+                outcome = result.data
+
+                if outcome.get("transaction_id") is None:
+                    self._raise_unavailable(outcome.get("items") or [])
+
+                transaction_id = outcome["transaction_id"]
+                self._publish_issued(transaction_id, student_id, item_ids)
                 return transaction_id
+            except ItemsUnavailableError:
+                raise
             except Exception as e:
-                print(f"Error creating transaction: {e}")
+                self._raise_if_offline(e)
+                db_log.error("Error creating transaction: %s", e)
                 return None
     
+    def _raise_unavailable(self, items: List[Dict]):
+        """
+        Handle a refused issue: correct the cached statuses, then raise.
+
+        Args:
+            items: Current {"id", "status"} of every requested item (from issue_items())
+        """
+        for item in items:
+            if item.get("status"):
+                self.events.publish(ItemStatusChanged(item["id"], item["status"]))
+        raise ItemsUnavailableError({
+            item["id"]: item.get("status") for item in items
+            if item.get("status") in (None, "Issued")
+        })
+
+    def _publish_issued(self, transaction_id: int, student_id: int, item_ids: List[int]):
+        """Publish the change events for a successful issue."""
+        self.events.publish(TransactionCreated(transaction_id, student_id, list(item_ids)))
+        for item_id in item_ids:
+            self.events.publish(ItemStatusChanged(item_id, "Issued"))
+
+    def _publish_closed(self, transaction_id: int, item_id: int, status: str):
+        """Publish the change events for a return or damage report."""
+        self.events.publish(ItemStatusChanged(item_id, status))
+        self.events.publish(TransactionClosed(transaction_id, item_id))
+
+    @coalesced
     def get_all_inventory(self) -> List[Dict]:
         """Get all inventory items."""
         if self.use_mock:
@@ -377,9 +2833,10 @@ class DatabaseManager:
                 result = self.client.table('inventory').select('*').execute()
                 return result.data
             except Exception as e:
-                print(f"Error fetching inventory: {e}")
+                db_log.error("Error fetching inventory: %s", e)
                 return []
     
+    @memoized
     def get_inventory_schema(self) -> Dict:
         """
         Get the schema/structure of inventory items.
@@ -433,7 +2890,8 @@ class DatabaseManager:
                         "course": {"type": "str", "required": False, "editable": True}
                     }
             except Exception as e:
-                print(f"Error fetching inventory schema: {e}")
+                self._local.read_failed = True
+                db_log.error("Error fetching inventory schema: %s", e)
                 # Return default schema on error
                 return {
                     "name": {"type": "str", "required": True, "editable": True},
@@ -441,6 +2899,7 @@ class DatabaseManager:
                     "course": {"type": "str", "required": False, "editable": True}
                 }
     
+    @invalidates("get_inventory_schema", "get_available_items_by_name")
     def create_inventory(self, inventory_data: Dict) -> Optional[int]:
         """
         Create a new inventory record.
@@ -456,44 +2915,76 @@ class DatabaseManager:
             new_id = max([inv["id"] for inv in self.mock_inventory], default=0) + 1
             new_inventory = {"id": new_id, **inventory_data}
             self.mock_inventory.append(new_inventory)
+            self.events.publish(InventoryChanged(new_inventory))
             return new_id
         else:
             try:
                 result = self.client.table('inventory').insert(inventory_data).execute()
-                return result.data[0]["id"] if result.data else None
+                if not result.data:
+                    return None
+                self.events.publish(InventoryChanged(result.data[0]))
+                return result.data[0]["id"]
             except Exception as e:
-                print(f"Error creating inventory: {e}")
+                db_log.error("Error creating inventory: %s", e)
                 return None
     
+    @coalesced
     def get_all_items(self) -> List[Dict]:
         """
-        Get all items with inventory info.
-        
+        Get all items as flat rows (no embedded inventory).
+
         PERFORMANCE OPTIMIZATION: Only fetches required fields instead of all columns.
         This reduces payload size and improves response time, especially for large datasets.
-        Required fields: id, serial_number, status, inventory_id, inventory(name, course)
+        Required fields: id, serial_number, status, inventory_id
+
+        NORMALIZED FETCH: Component name and course are NOT embedded per item.
+        Embedding inventory(name, course) repeated the same strings once per unit
+        (1,000 copies for a 1,000-unit component), both on the wire and in the cache.
+        Views resolve name and course by joining inventory_id against the cached
+        inventory table instead (see LabApp._get_inventory_lookup).
         """
         if self.use_mock:
-            items_with_inv = []
-            for item in self.mock_items:
-                inv = next((inv for inv in self.mock_inventory if inv["id"] == item["inventory_id"]), None)
-                item_copy = item.copy()
-                item_copy["inventory"] = inv
-                items_with_inv.append(item_copy)
-            return items_with_inv
+            return [item.copy() for item in self.mock_items]
         else:
             try:
                 # PERFORMANCE: Only select fields we actually use in the UI
-                # This reduces network payload by ~60-70% for typical schemas
-                # Fields needed: id, serial_number, status, inventory_id, and nested inventory(name, course)
+                # Fields needed: id, serial_number, status, inventory_id (joined client-side)
                 result = self.client.table('items').select(
-                    'id, serial_number, status, inventory_id, inventory(name, course)'
+                    'id, serial_number, status, inventory_id'
                 ).execute()
                 return result.data
             except Exception as e:
-                print(f"Error fetching items: {e}")
+                db_log.error("Error fetching items: %s", e)
                 return []
-    
+
+    @coalesced
+    def fetch_all_tables(self) -> Dict[str, List[Dict]]:
+        """
+        Fetch everything the local cache needs for a full sync.
+
+        PERFORMANCE OPTIMIZATION: The four table reads are independent, so we
+        issue them concurrently. Over the shared HTTP/2 connection they are
+        multiplexed as parallel streams, so a full sync costs roughly one
+        round trip (the slowest query) instead of four back-to-back ones.
+
+        Returns:
+            Dictionary with "inventory", "items", "students" and "staff" lists
+        """
+        loaders = {
+            "inventory": self.get_all_inventory,
+            "items": self.get_all_items,
+            "students": self.get_all_students,
+            "staff": self.get_all_staff
+        }
+
+        if self.use_mock:
+            # Mock data is in memory - nothing to parallelize
+            return {name: loader() for name, loader in loaders.items()}
+
+        with ThreadPoolExecutor(max_workers=SYNC_PARALLEL_REQUESTS) as pool:
+            futures = {name: pool.submit(QUERY_AUDIT.bind(loader)) for name, loader in loaders.items()}
+            return {name: future.result() for name, future in futures.items()}
+
     def get_current_holder(self, item_id: int) -> Optional[str]:
         """
         Get the name of the student who currently has an item issued.
@@ -541,7 +3032,7 @@ class DatabaseManager:
                             return transaction_data['transactions']['students']['name']
                 return None
             except Exception as e:
-                print(f"Error fetching current holder: {e}")
+                db_log.error("Error fetching current holder: %s", e)
                 return None
     
     def search_students(self, query: str) -> List[Dict]:
@@ -573,7 +3064,7 @@ class DatabaseManager:
                 ).execute()
                 return result.data
             except Exception as e:
-                print(f"Error searching students: {e}")
+                db_log.error("Error searching students: %s", e)
                 return []
     
     def get_active_loans(self, student_id: int) -> List[Dict]:
@@ -630,9 +3121,11 @@ class DatabaseManager:
                                 loans.append(item)
                 return loans
             except Exception as e:
-                print(f"Error fetching active loans: {e}")
+                db_log.error("Error fetching active loans: %s", e)
                 return []
     
+    @invalidates("get_available_items_by_name")
+    @journaled(_queued_close("Available"))
     def return_item(self, item_id: int, transaction_id: int) -> bool:
         """
         Return an item: Set status to Available and close the transaction.
@@ -658,6 +3151,7 @@ class DatabaseManager:
                     trans["closed_at"] = datetime.now().isoformat()
                     break
             
+            self._publish_closed(transaction_id, item_id, "Available")
             return True
         else:
             try:
@@ -672,11 +3166,15 @@ class DatabaseManager:
                     "closed_at": datetime.now().isoformat()
                 }).eq('id', transaction_id).execute()
                 
+                self._publish_closed(transaction_id, item_id, "Available")
                 return True
             except Exception as e:
-                print(f"Error returning item: {e}")
+                self._raise_if_offline(e)
+                db_log.error("Error returning item: %s", e)
                 return False
     
+    @invalidates("get_available_items_by_name")
+    @journaled(_queued_close("Damaged"))
     def report_damaged(self, item_id: int, transaction_id: int) -> bool:
         """
         Report an item as damaged: Set status to Damaged and close the transaction.
@@ -702,6 +3200,7 @@ class DatabaseManager:
                     trans["closed_at"] = datetime.now().isoformat()
                     break
             
+            self._publish_closed(transaction_id, item_id, "Damaged")
             return True
         else:
             try:
@@ -716,11 +3215,64 @@ class DatabaseManager:
                     "closed_at": datetime.now().isoformat()
                 }).eq('id', transaction_id).execute()
                 
+                self._publish_closed(transaction_id, item_id, "Damaged")
                 return True
             except Exception as e:
-                print(f"Error reporting damaged item: {e}")
+                self._raise_if_offline(e)
+                db_log.error("Error reporting damaged item: %s", e)
                 return False
     
+    @invalidates("get_available_items_by_name")
+    @journaled(_queued_close_loans)
+    def close_loans(self, closures: List[Tuple[int, int, str]]) -> bool:
+        """
+        Close several loans at once (batched returns and damage reports).
+
+        Equivalent to calling return_item()/report_damaged() for each entry, but
+        sends one item update per status and one transaction update in total.
+
+        Args:
+            closures: List of (item_id, transaction_id, new item status) where the
+                status is "Available" (returned) or "Damaged"
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not closures:
+            return True
+
+        if self.use_mock:
+            for item_id, transaction_id, status in closures:
+                if status == "Damaged":
+                    self.report_damaged(item_id, transaction_id)
+                else:
+                    self.return_item(item_id, transaction_id)
+            return True
+
+        try:
+            by_status: Dict[str, List[int]] = {}
+            for item_id, _, status in closures:
+                by_status.setdefault(status, []).append(item_id)
+
+            for status, item_ids in by_status.items():
+                self.client.table('items').update({
+                    "status": status
+                }).in_('id', item_ids).execute()
+
+            transaction_ids = list(dict.fromkeys(transaction_id for _, transaction_id, _ in closures))
+            self.client.table('transactions').update({
+                "status": "Closed",
+                "closed_at": datetime.now().isoformat()
+            }).in_('id', transaction_ids).execute()
+
+            for item_id, transaction_id, status in closures:
+                self._publish_closed(transaction_id, item_id, status)
+            return True
+        except Exception as e:
+            self._raise_if_offline(e)
+            db_log.error("Error closing loans: %s", e)
+            return False
+    
     def get_recent_transactions(self, limit: int = 5) -> List[Dict]:
         """
         Get recent transactions for the Dashboard activity feed.
@@ -815,9 +3367,105 @@ class DatabaseManager:
                 
                 return recent[:limit]
             except Exception as e:
-                print(f"Error fetching recent transactions: {e}")
+                db_log.error("Error fetching recent transactions: %s", e)
                 return []
     
+    def get_dashboard_summary(self) -> Dict[str, int]:
+        """
+        Get the numbers on the Dashboard summary cards without downloading the tables.
+
+        PERFORMANCE OPTIMIZATION: Each count is a HEAD request with a
+        Prefer: count=<DASHBOARD_COUNT_METHOD> header. PostgreSQL does the
+        counting and only a Content-Range header comes back, a few hundred
+        bytes instead of every item and student row. The three requests run
+        concurrently over the shared connection.
+
+        Returns:
+            Dictionary with "total_items", "issued" and "total_students"
+        """
+        if self.use_mock:
+            return {
+                "total_items": len(self.mock_items),
+                "issued": sum(1 for item in self.mock_items if item["status"] == "Issued"),
+                "total_students": len(self.mock_students)
+            }
+
+        def count(table: str, status: Optional[str] = None) -> int:
+            query = self.client.table(table).select('id', count=DASHBOARD_COUNT_METHOD, head=True)
+            if status is not None:
+                query = query.eq('status', status)
+            return query.execute().count or 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                futures = {
+                    "total_items": pool.submit(QUERY_AUDIT.bind(count), 'items'),
+                    "issued": pool.submit(QUERY_AUDIT.bind(count), 'items', 'Issued'),
+                    "total_students": pool.submit(QUERY_AUDIT.bind(count), 'students')
+                }
+                return {name: future.result() for name, future in futures.items()}
+        except Exception as e:
+            db_log.error("Error fetching dashboard summary: %s", e)
+            return {"total_items": 0, "issued": 0, "total_students": 0}
+
+    def get_dashboard_snapshot(self, days_threshold: int = 7, top_n: int = 5,
+                               recent_limit: int = 5) -> Dict:
+        """
+        Get everything the Dashboard shows in one call.
+
+        PERFORMANCE OPTIMIZATION: The get_dashboard_snapshot() database function
+        (section 13 of supabase_setup.sql) aggregates in PostgreSQL and returns
+        one small JSON document, so the home screen costs a single round trip
+        instead of the items and students tables plus the overdue and recent
+        activity queries. If the function is not installed yet, the counts,
+        overdue list and activity feed are fetched separately and
+        status_counts/top_components are None (the caller counts locally).
+
+        Args:
+            days_threshold: Days before an issued item is overdue
+            top_n: Number of components in the availability chart
+            recent_limit: Number of recent activity rows
+
+        Returns:
+            Dictionary with "total_items", "issued", "total_students",
+            "status_counts" ({status: count}), "top_components"
+            ([{"id", "name", "count"}] by available count), "overdue" (as
+            get_overdue_items) and "recent" (as get_recent_transactions)
+        """
+        if self.use_mock:
+            available = {}
+            status_counts = {}
+            for item in self.mock_items:
+                status_counts[item["status"]] = status_counts.get(item["status"], 0) + 1
+                if item["status"] == "Available":
+                    available[item["inventory_id"]] = available.get(item["inventory_id"], 0) + 1
+            top = sorted(self.mock_inventory, key=lambda inv: (-available.get(inv["id"], 0), inv["id"]))[:top_n]
+
+            snapshot = self.get_dashboard_summary()
+            snapshot["status_counts"] = status_counts
+            snapshot["top_components"] = [
+                {"id": inv["id"], "name": inv["name"], "count": available.get(inv["id"], 0)} for inv in top
+            ]
+            snapshot["overdue"] = self.get_overdue_items(days_threshold)
+            snapshot["recent"] = self.get_recent_transactions(recent_limit)
+            return snapshot
+
+        try:
+            result = self.client.rpc('get_dashboard_snapshot', {
+                'p_overdue_days': days_threshold,
+                'p_top_n': top_n,
+                'p_recent_limit': recent_limit
+            }).execute()
+            return result.data
+        except Exception as e:
+            db_log.warning("Dashboard snapshot unavailable (%s). Run section 13 of supabase_setup.sql.", e)
+            snapshot = self.get_dashboard_summary()
+            snapshot["status_counts"] = None
+            snapshot["top_components"] = None
+            snapshot["overdue"] = self.get_overdue_items(days_threshold)
+            snapshot["recent"] = self.get_recent_transactions(recent_limit)
+            return snapshot
+
     def get_overdue_items(self, days_threshold: int = 7) -> List[Dict]:
         """
         Get all items that are overdue (issued for more than threshold days).
@@ -890,10 +3538,38 @@ class DatabaseManager:
                 
                 return overdue_items
             except Exception as e:
-                print(f"Error fetching overdue items: {e}")
+                db_log.error("Error fetching overdue items: %s", e)
                 return []
     
-    def bulk_import_inventory(self, csv_data: List[Dict]) -> Tuple[int, int]:
+    def allocate_serials(self, prefix: str, count: int) -> List[str]:
+        """
+        Reserve a contiguous block of serial numbers for a prefix.
+
+        One atomic round trip to the allocate_serials() database function (or
+        the in-memory SerialAllocator for mock data). Concurrent callers always
+        get disjoint blocks.
+
+        Args:
+            prefix: Serial prefix, see serial_prefix()
+            count: Number of serials to reserve
+
+        Returns:
+            List of serial numbers, e.g. ["ARD004", "ARD005"]
+        """
+        if count <= 0:
+            return []
+        if self.use_mock:
+            return self.serial_allocator.allocate(prefix, count)
+        result = self.client.rpc('allocate_serials', {
+            "p_prefix": prefix,
+            "p_count": count,
+            "p_min_width": SERIAL_MIN_WIDTH,
+        }).execute()
+        return list(result.data or [])
+
+    @invalidates("get_inventory_schema", "get_available_items_by_name")
+    @journaled(_queued_import)
+    def bulk_import_inventory(self, csv_data: List[Dict]) -> Optional[Tuple[int, int]]:
         """
         Bulk import inventory from CSV data.
         
@@ -909,187 +3585,83 @@ class DatabaseManager:
         
         Serial Number Generation Logic:
         - Takes first 3 letters of component name (uppercase)
-        - Appends sequential number (001, 002, etc.)
+        - Appends the next numbers from the prefix's counter (001, 002, etc.)
         - Example: "Arduino" -> "ARD001", "ARD002", etc.
         
         Args:
             csv_data: List of dictionaries with 'Component Name', 'Quantity', 'Description'
             
         Returns:
-            Tuple of (inventory_records_created, item_records_created)
+            Tuple of (inventory_records_created, item_records_created),
+            or None if the server rejected the import
         """
-        inventory_created = 0
-        items_created = 0
-        
-        if self.use_mock:
-            for row in csv_data:
-                component_name = row.get('Component Name', '').strip()
-                quantity = int(row.get('Quantity', 0))
-                description = row.get('Description', '').strip()
-                
-                if not component_name or quantity <= 0:
-                    continue
-                
-                # Check if inventory already exists
-                existing_inv = None
-                for inv in self.mock_inventory:
-                    if inv["name"].upper() == component_name.upper():
-                        existing_inv = inv
-                        break
-                
-                if existing_inv:
-                    inventory_id = existing_inv["id"]
-                    # Update total quantity
-                    existing_inv["total_qty"] += quantity
-                else:
-                    # Create new inventory record
-                    inventory_id = len(self.mock_inventory) + 1
-                    self.mock_inventory.append({
-                        "id": inventory_id,
-                        "name": component_name,
-                        "total_qty": quantity,
-                        "description": description
-                    })
-                    inventory_created += 1
-                
-                # ============================================================
-                # SERIAL NUMBER GENERATION LOGIC (For Project Presentation)
-                # ============================================================
-                # This algorithm generates unique serial numbers automatically:
-                # 
-                # Step 1: Extract prefix from component name
-                #   - Take first 3 letters of component name (uppercase)
-                #   - Remove spaces: "Raspberry Pi" -> "RAS"
-                #   - If name is too short, pad with 'X': "Pi" -> "PIX"
-                #
-                # Step 2: Find highest existing serial number
-                #   - Search all existing items for this inventory
-                #   - Extract numeric suffix from matching serials
-                #   - Track the maximum number found
-                #
-                # Step 3: Generate sequential serials
-                #   - Start from (max_num + 1)
-                #   - Format as 3-digit zero-padded: "001", "002", etc.
-                #   - Combine: prefix + number = "ARD001", "ARD002"
-                #
-                # Example: Importing 5 "Arduino" items when ARD001-ARD003 exist:
-                #   - Prefix: "ARD"
-                #   - Max found: 3
-                #   - Generated: ARD004, ARD005, ARD006, ARD007, ARD008
-                #
-                # This ensures no duplicate serials and maintains logical grouping.
-                
-                prefix = component_name[:3].upper().replace(' ', '')
-                if len(prefix) < 3:
-                    prefix = prefix.ljust(3, 'X')  # Pad if too short
-                
-                # Find highest existing serial for this component
-                max_num = 0
-                for item in self.mock_items:
-                    if item.get("inventory_id") == inventory_id:
-                        serial = item.get("serial_number", "")
-                        if serial.startswith(prefix):
-                            try:
-                                num = int(serial[len(prefix):])
-                                max_num = max(max_num, num)
-                            except:
-                                pass
-                
-                # Create items with sequential serial numbers
-                for i in range(quantity):
-                    serial_number = f"{prefix}{max_num + i + 1:03d}"
-                    self.mock_items.append({
-                        "id": len(self.mock_items) + 1,
-                        "serial_number": serial_number,
-                        "status": "Available",
-                        "inventory_id": inventory_id
-                    })
-                    items_created += 1
-        else:
-            try:
-                for row in csv_data:
-                    component_name = row.get('Component Name', '').strip()
-                    quantity = int(row.get('Quantity', 0))
-                    description = row.get('Description', '').strip()
-                    
-                    if not component_name or quantity <= 0:
-                        continue
-                    
-                    # Check if inventory exists
-                    existing = self.client.table('inventory').select('id, total_qty').ilike(
-                        'name', component_name
-                    ).execute()
-                    
-                    if existing.data:
-                        inventory_id = existing.data[0]['id']
-                        # Update total quantity
-                        self.client.table('inventory').update({
-                            'total_qty': existing.data[0]['total_qty'] + quantity
-                        }).eq('id', inventory_id).execute()
-                    else:
-                        # Create new inventory
-                        inv_result = self.client.table('inventory').insert({
-                            'name': component_name,
-                            'total_qty': quantity,
-                            'description': description
-                        }).execute()
-                        inventory_id = inv_result.data[0]['id']
-                        inventory_created += 1
-                    
-                    # ============================================================
-                    # SERIAL NUMBER GENERATION LOGIC (For Project Presentation)
-                    # ============================================================
-                    # Same algorithm as mock data (see detailed comments above)
-                    # This ensures consistency between mock and real database
-                    
-                    prefix = component_name[:3].upper().replace(' ', '')
-                    if len(prefix) < 3:
-                        prefix = prefix.ljust(3, 'X')
-                    
-                    # Find highest existing serial
-                    existing_items = self.client.table('items').select('serial_number').eq(
-                        'inventory_id', inventory_id
-                    ).execute()
-                    
-                    max_num = 0
-                    for item in existing_items.data:
-                        serial = item.get('serial_number', '')
-                        if serial.startswith(prefix):
-                            try:
-                                num = int(serial[len(prefix):])
-                                max_num = max(max_num, num)
-                            except:
-                                pass
-                    
-                    # Bulk insert items
-                    items_to_insert = []
-                    for i in range(quantity):
-                        serial_number = f"{prefix}{max_num + i + 1:03d}"
-                        items_to_insert.append({
-                            'serial_number': serial_number,
-                            'status': 'Available',
-                            'inventory_id': inventory_id
-                        })
-                    
-                    # Insert in batches (Supabase has limits)
-                    batch_size = 100
-                    for i in range(0, len(items_to_insert), batch_size):
-                        batch = items_to_insert[i:i + batch_size]
-                        self.client.table('items').insert(batch).execute()
-                        items_created += len(batch)
+        restocks = []
+        for row in csv_data:
+            component_name = row.get('Component Name', '').strip()
+            quantity = int(row.get('Quantity', 0))
+            description = row.get('Description', '').strip()
             
-            except Exception as e:
-                print(f"Error bulk importing inventory: {e}")
-                return (inventory_created, items_created)
+            if not component_name or quantity <= 0:
+                continue
+            
+            # Existing components (matched by name) are restocked, new ones created
+            restocks.append({
+                "name": component_name,
+                "description": description,
+                "quantity": quantity
+            })
         
+        # ============================================================
+        # SERIAL NUMBER GENERATION LOGIC (For Project Presentation)
+        # ============================================================
+        # This algorithm generates unique serial numbers automatically:
+        # 
+        # Step 1: Extract prefix from component name (serial_prefix())
+        #   - Take first 3 letters of component name (uppercase)
+        #   - Remove spaces: "Raspberry Pi" -> "RAS"
+        #   - If name is too short, pad with 'X': "Pi" -> "PIX"
+        #
+        # Step 2: Reserve a block of numbers (allocate_serials())
+        #   - Each prefix has a counter holding the last number handed out
+        #   - The first time a prefix is used, the counter starts at the
+        #     highest number already present among existing serials
+        #   - Reserving N numbers moves the counter forward by N in one step
+        #
+        # Step 3: Format the serials
+        #   - Zero-padded to 3 digits: "001", "002", etc. (wider past 999)
+        #   - Combine: prefix + number = "ARD001", "ARD002"
+        #
+        # Example: Importing 5 "Arduino" items when ARD001-ARD003 exist:
+        #   - Prefix: "ARD"
+        #   - Counter: 3
+        #   - Generated: ARD004, ARD005, ARD006, ARD007, ARD008
+        #
+        # This ensures no duplicate serials (even for two components that
+        # share a prefix, or two stations restocking at once).
+        #
+        # PERFORMANCE: The whole CSV goes out as ONE restock_many() request.
+        # Supabase creates the components, allocates the serials, inserts the
+        # items and updates total_qty in a single transaction.
+        results = self.restock_many(restocks)
+        if restocks and not results:
+            return None  # restock_many() logged the error
+        
+        inventory_created = sum(1 for result in results if result.get("created"))
+        items_created = sum(len(result.get("items") or []) for result in results)
         return (inventory_created, items_created)
     
+    @invalidates("get_available_items_by_name")
+    @journaled(_queued_restock)
     def restock_inventory(self, inventory_id: int, quantity: int, manual_serials: Optional[List[str]] = None) -> bool:
         """
         Restock an existing inventory component by adding new items.
         
         Power User Feature: Supports both auto-generated and manual serial numbers.
         
+        PERFORMANCE: One restock_items() round trip inserts the items and
+        increments total_qty atomically (previously 4 requests, and two
+        concurrent restocks could overwrite each other's total_qty).
+        
         Args:
             inventory_id: ID of the inventory component to restock
             quantity: Number of items to add
@@ -1099,116 +3671,378 @@ class DatabaseManager:
             True if successful, False otherwise
         """
         if self.use_mock:
-            # Get inventory to find component name for serial generation
-            inventory = next((inv for inv in self.mock_inventory if inv["id"] == inventory_id), None)
-            if not inventory:
+            if not any(inv["id"] == inventory_id for inv in self.mock_inventory):
                 return False
-            
-            component_name = inventory["name"]
-            
-            # Generate serial numbers
-            if manual_serials:
-                # Use provided serials
-                serials = manual_serials
-            else:
-                # Auto-generate serials using same algorithm as bulk_import
-                prefix = component_name[:3].upper().replace(' ', '')
-                if len(prefix) < 3:
-                    prefix = prefix.ljust(3, 'X')
-                
-                # Find highest existing serial
-                max_num = 0
-                for item in self.mock_items:
-                    if item.get("inventory_id") == inventory_id:
-                        serial = item.get("serial_number", "")
-                        if serial.startswith(prefix):
-                            try:
-                                num = int(serial[len(prefix):])
-                                max_num = max(max_num, num)
-                            except:
-                                pass
-                
-                # Generate sequential serials
-                serials = [f"{prefix}{max_num + i + 1:03d}" for i in range(quantity)]
-            
-            # Add items
-            for serial in serials:
-                self.mock_items.append({
-                    "id": len(self.mock_items) + 1,
-                    "serial_number": serial,
-                    "status": "Available",
-                    "inventory_id": inventory_id
-                })
-            
-            # Update total quantity
-            inventory["total_qty"] += quantity
-            
-            return True
+            result = self._mock_restock({
+                "inventory_id": inventory_id,
+                "quantity": quantity,
+                "serials": manual_serials or None
+            })
         else:
             try:
-                # Get inventory to find component name for serial generation
-                inventory_result = self.client.table('inventory').select('name').eq('id', inventory_id).execute()
-                if not inventory_result.data:
-                    return False
-                
-                component_name = inventory_result.data[0]["name"]
-                
-                # Generate serial numbers
-                if manual_serials:
-                    # Use provided serials
-                    serials = manual_serials
-                else:
-                    # Auto-generate serials using same algorithm as bulk_import
-                    prefix = component_name[:3].upper().replace(' ', '')
-                    if len(prefix) < 3:
-                        prefix = prefix.ljust(3, 'X')
-                    
-                    # Find highest existing serial
-                    existing_items = self.client.table('items').select('serial_number').eq(
-                        'inventory_id', inventory_id
-                    ).execute()
-                    
-                    max_num = 0
-                    for item in existing_items.data:
-                        serial = item.get('serial_number', '')
-                        if serial.startswith(prefix):
-                            try:
-                                num = int(serial[len(prefix):])
-                                max_num = max(max_num, num)
-                            except:
-                                pass
-                    
-                    # Generate sequential serials
-                    serials = [f"{prefix}{max_num + i + 1:03d}" for i in range(quantity)]
-                
-                # Prepare items for bulk insert
-                items_to_insert = []
-                for serial in serials:
-                    items_to_insert.append({
-                        'serial_number': serial,
-                        'status': 'Available',
-                        'inventory_id': inventory_id
-                    })
-                
-                # Insert in batches (Supabase has limits)
-                batch_size = 100
-                for i in range(0, len(items_to_insert), batch_size):
-                    batch = items_to_insert[i:i + batch_size]
-                    self.client.table('items').insert(batch).execute()
-                
-                # Update total quantity
-                # Get current total_qty
-                current_inv = self.client.table('inventory').select('total_qty').eq('id', inventory_id).execute()
-                current_qty = current_inv.data[0].get('total_qty', 0) if current_inv.data else 0
-                
-                self.client.table('inventory').update({
-                    'total_qty': current_qty + quantity
-                }).eq('id', inventory_id).execute()
-                
-                return True
+                result = self.client.rpc('restock_items', {
+                    "p_inventory_id": inventory_id,
+                    "p_quantity": quantity,
+                    "p_serials": manual_serials or None,
+                    # Idempotency key for offline journal replay
+                    "p_client_ref": getattr(self._local, "op_key", None),
+                }).execute().data
             except Exception as e:
-                print(f"Error restocking inventory: {e}")
+                self._raise_if_offline(e)
+                db_log.error("Error restocking inventory: %s", e)
                 return False
+        
+        self._publish_restocked(result)
+        return True
+    
+    @invalidates("get_available_items_by_name")
+    @journaled(_queued_restock_many)
+    def restock_many(self, restocks: List[Dict]) -> List[Dict]:
+        """
+        Restock several components in one atomic request (e.g. a supplier delivery).
+        
+        Args:
+            restocks: One dictionary per component with either "inventory_id" or
+                "name" (plus optional "description"; the component is created if
+                no component has that name), and "quantity" for auto-generated
+                serials or "serials" for manual ones
+        
+        Returns:
+            One result per restock: {"inventory": updated inventory record,
+            "items": new item rows, "created": True if the component was created}.
+            Empty list if the request failed or was saved to the offline journal.
+        """
+        if not restocks:
+            return []
+        
+        if self.use_mock:
+            results = [self._mock_restock(restock) for restock in restocks]
+        else:
+            try:
+                # PERFORMANCE: 40 components = 1 request (was 40 x 4)
+                results = self.client.rpc('restock_items_batch', {
+                    "p_restocks": restocks,
+                    "p_client_ref": getattr(self._local, "op_key", None),
+                }).execute().data or []
+            except Exception as e:
+                self._raise_if_offline(e)
+                db_log.error("Error restocking inventory: %s", e)
+                return []
+        
+        for result in results:
+            self._publish_restocked(result)
+        return results
+    
+    def _mock_restock(self, restock: Dict) -> Dict:
+        """In-memory equivalent of the restock_apply() database function (see restock_many())."""
+        inventory = None
+        created = False
+        if restock.get("inventory_id") is not None:
+            inventory = next((inv for inv in self.mock_inventory if inv["id"] == restock["inventory_id"]), None)
+        else:
+            name = restock["name"]
+            inventory = next((inv for inv in self.mock_inventory if inv["name"].upper() == name.upper()), None)
+            if inventory is None:
+                inventory = {
+                    "id": len(self.mock_inventory) + 1,
+                    "name": name,
+                    "total_qty": 0,
+                    "description": restock.get("description", "")
+                }
+                self.mock_inventory.append(inventory)
+                created = True
+        
+        serials = restock.get("serials") or self.allocate_serials(
+            serial_prefix(inventory["name"]), int(restock.get("quantity") or 0)
+        )
+        new_items = []
+        for serial in serials:
+            new_items.append({
+                "id": len(self.mock_items) + len(new_items) + 1,
+                "serial_number": serial,
+                "status": "Available",
+                "inventory_id": inventory["id"]
+            })
+        self.mock_items.extend(new_items)
+        inventory["total_qty"] = (inventory.get("total_qty") or 0) + len(new_items)
+        
+        return {"inventory": inventory, "items": [item.copy() for item in new_items], "created": created}
+    
+    def _publish_restocked(self, result: Dict):
+        """Publish the change events for one restock result (skips replayed duplicates)."""
+        if not result or result.get("duplicate"):
+            return
+        inventory = result["inventory"]
+        self.events.publish(InventoryChanged(inventory))
+        self.events.publish(ItemsAdded(inventory["id"], result.get("items") or []))
+
+    # ============================================================
+    # Offline journal replay (see CONFIG ZONE: Offline Write Journal)
+    # ============================================================
+
+    @invalidates()
+    def replay_journal(self, entries: List[JournalEntry]) -> Tuple[List[str], List[Tuple[JournalEntry, str, bool]], Dict[int, int]]:
+        """
+        Apply journaled writes in order, batching runs of the same kind.
+
+        Runs of issues become one issue_items_batch() call; runs of
+        returns/damage reports one guarded update per status (loans closed
+        elsewhere meanwhile are refused); runs of new students one upsert. Restocks and CSV
+        imports replay one by one. Replay stops at the first network error and
+        the remaining entries stay in the journal.
+
+        Args:
+            entries: Pending journal entries in sequence order
+
+        Returns:
+            Tuple of (applied op_keys, [(rejected entry, error, final)], {provisional id: real id});
+            final rejections (e.g. an item issued elsewhere meanwhile) are not retried
+        """
+        applied: List[str] = []
+        rejected: List[Tuple[JournalEntry, str, bool]] = []
+        id_map: Dict[int, int] = {}
+
+        try:
+            done = self._applied_op_keys([entry.op_key for entry in entries])
+        except Exception as e:
+            if not is_network_error(e):
+                db_log.error("Error reading client_writes (is the journal migration applied?): %s", e)
+            return applied, rejected, id_map
+
+        # Group consecutive entries of the same kind (order between kinds is kept)
+        groups: List[Tuple[str, List[JournalEntry]]] = []
+        for entry in entries:
+            if entry.op_key in done:
+                applied.append(entry.op_key)
+                continue
+            kind = self._REPLAY_KINDS.get(entry.method, entry.method)
+            if groups and groups[-1][0] == kind and kind in self._REPLAY_HANDLERS:
+                groups[-1][1].append(entry)
+            else:
+                groups.append((kind, [entry]))
+
+        self._local.replaying = True
+        self._local.raise_offline = True
+        try:
+            pending_groups = list(reversed(groups))
+            while pending_groups:
+                kind, group = pending_groups.pop()
+                refused: List[Tuple[JournalEntry, str, bool]] = []
+                try:
+                    if kind in self._REPLAY_HANDLERS:
+                        ok = getattr(self, self._REPLAY_HANDLERS[kind])(group, id_map)
+                    else:
+                        # The entry's op_key doubles as the server-side idempotency key
+                        self._local.op_key = group[0].op_key
+                        try:
+                            result = getattr(self, kind)(**group[0].args)
+                        finally:
+                            self._local.op_key = None
+                        ok = self._replay_succeeded(kind, group[0].args, result)
+                    if isinstance(ok, list):
+                        # Handler applied the batch but refused some entries
+                        refused, ok = ok, True
+                    error = f"{kind} failed"
+                    if ok:
+                        refused_keys = {entry.op_key for entry, _, _ in refused}
+                        done_entries = [entry for entry in group if entry.op_key not in refused_keys]
+                        if done_entries:
+                            self._mark_applied(done_entries)
+                except OfflineError:
+                    break
+                except Exception as e:
+                    if is_network_error(e):
+                        break
+                    ok, error = False, str(e)
+
+                if ok:
+                    applied.extend(entry.op_key for entry in done_entries)
+                    rejected.extend(refused)
+                elif len(group) > 1:
+                    # Isolate the bad entry: retry this batch one entry at a time
+                    pending_groups.extend((kind, [entry]) for entry in reversed(group))
+                else:
+                    rejected.append((group[0], error, False))
+        finally:
+            self._local.replaying = False
+            self._local.raise_offline = False
+
+        return applied, rejected, id_map
+
+    # Journal method -> replay kind, and kind -> batched handler
+    _REPLAY_KINDS = {
+        "create_transaction": "issue",
+        "return_item": "close",
+        "report_damaged": "close",
+        "close_loans": "close",
+        "create_student": "student",
+        "delete_student": "student_delete",
+    }
+    _REPLAY_HANDLERS = {
+        "issue": "_replay_issues",
+        "close": "_replay_closures",
+        "student": "_replay_students",
+        "student_delete": "_replay_student_deletes",
+    }
+
+    @staticmethod
+    def _replay_succeeded(method: str, args: Dict, result) -> bool:
+        """Judge a replayed restock/import by what the method returns when it fails."""
+        if method == "restock_many":
+            return bool(result) or not args["restocks"]  # [] means failed
+        return result is not None and result is not False  # bulk_import_inventory: None
+
+    def _applied_op_keys(self, op_keys: List[str]) -> set:
+        """op_keys the server has already recorded in client_writes."""
+        if not op_keys:
+            return set()
+        result = self.client.table('client_writes').select('op_key').in_('op_key', op_keys).execute()
+        return {row["op_key"] for row in result.data}
+
+    def _mark_applied(self, entries: List[JournalEntry]):
+        """Record op_keys in client_writes so a repeated replay skips them."""
+        self.client.table('client_writes').upsert(
+            [{"op_key": entry.op_key, "method": entry.method} for entry in entries],
+            on_conflict='op_key', ignore_duplicates=True
+        ).execute()
+
+    def _real_id(self, value: int, id_map: Dict[int, int]) -> int:
+        """Translate a provisional (negative) id from an earlier journaled create."""
+        if value is None or value >= 0:
+            return value
+        if value not in id_map:
+            id_map.update(self.journal.real_ids([value]))
+        return id_map.get(value, value)
+
+    def _replay_issues(self, entries: List[JournalEntry], id_map: Dict[int, int]) -> List[Tuple[JournalEntry, str, bool]]:
+        """
+        Replay a run of create_transaction calls in one issue_items_batch() request.
+
+        Each issue is still an atomic claim, so an item issued at another station
+        while this one was offline refuses that issue (reported as a final rejection).
+
+        Returns:
+            [(entry, error, final)] for issues that were refused
+        """
+        issues = [{
+            "client_ref": entry.op_key,
+            "student_id": self._real_id(entry.args["student_id"], id_map),
+            "item_ids": entry.args["item_ids"],
+            "issuer_id": entry.args.get("issuer_id"),
+            # Overdue tracking counts from when the item left the counter, not from the replay
+            "issue_date": entry.args.get("custom_issue_date") or entry.created_at,
+            "expected_return_date": entry.args.get("expected_return_date"),
+        } for entry in entries]
+        outcomes = self.client.rpc('issue_items_batch', {"p_issues": issues}).execute().data
+
+        refused = []
+        for entry, issue, outcome in zip(entries, issues, outcomes):
+            if outcome.get("transaction_id") is None:
+                try:
+                    self._raise_unavailable(outcome.get("items") or [])
+                except ItemsUnavailableError as e:
+                    refused.append((entry, str(e), True))
+                continue
+            transaction_id = outcome["transaction_id"]
+            id_map[-entry.seq] = transaction_id
+            self._publish_issued(transaction_id, issue["student_id"], issue["item_ids"])
+        return refused
+
+    def _replay_closures(self, entries: List[JournalEntry], id_map: Dict[int, int]) -> List[Tuple[JournalEntry, str, bool]]:
+        """
+        Replay a run of returns/damage reports with one update per status.
+
+        Unlike close_loans(), only loans that are still open are closed: the
+        item must still be Issued and its latest loan must be the journaled
+        transaction. An item another station returned (and perhaps issued
+        again) while this one was offline keeps its server status, and the
+        entry is reported as a final rejection.
+
+        Returns:
+            [(entry, error, final)] for entries with closures that were refused
+        """
+        entry_closures = []
+        for entry in entries:
+            if entry.method == "close_loans":
+                closures = [tuple(closure) for closure in entry.args["closures"]]
+            else:
+                status = "Damaged" if entry.method == "report_damaged" else "Available"
+                closures = [(entry.args["item_id"], entry.args["transaction_id"], status)]
+            entry_closures.append((entry, [(item_id, self._real_id(transaction_id, id_map), status)
+                                           for item_id, transaction_id, status in closures]))
+        closures = [closure for _, closures in entry_closures for closure in closures]
+        item_ids = list(dict.fromkeys(item_id for item_id, _, _ in closures))
+
+        current_status = {
+            row["id"]: row["status"]
+            for row in self.client.table('items').select('id, status').in_('id', item_ids).execute().data
+        }
+        # transaction_items ids grow with every issue, so the first row per item is its latest loan
+        latest_loan: Dict[int, int] = {}
+        for row in self.client.table('transaction_items').select('item_id, transaction_id').in_(
+                'item_id', item_ids).order('id', desc=True).execute().data:
+            latest_loan.setdefault(row["item_id"], row["transaction_id"])
+
+        open_closures = [(item_id, transaction_id, status) for item_id, transaction_id, status in closures
+                         if current_status.get(item_id) == "Issued" and latest_loan.get(item_id) == transaction_id]
+        by_status: Dict[str, List[int]] = {}
+        for item_id, _, status in open_closures:
+            by_status.setdefault(status, []).append(item_id)
+
+        closed_items = set()
+        for status, status_item_ids in by_status.items():
+            # Guarded: an item returned elsewhere since the check above is left alone
+            result = self.client.table('items').update({"status": status}).in_(
+                'id', status_item_ids).eq('status', 'Issued').execute()
+            closed_items.update(row["id"] for row in result.data)
+
+        transaction_ids = list(dict.fromkeys(transaction_id for item_id, transaction_id, _ in open_closures
+                                             if item_id in closed_items))
+        if transaction_ids:
+            self.client.table('transactions').update({
+                "status": "Closed",
+                "closed_at": datetime.now().isoformat()
+            }).in_('id', transaction_ids).eq('status', 'Active').execute()
+
+        refused = []
+        for entry, closures in entry_closures:
+            stale = []
+            for item_id, transaction_id, status in closures:
+                if item_id in closed_items:
+                    self._publish_closed(transaction_id, item_id, status)
+                    continue
+                stale.append(f"item #{item_id} is no longer on loan #{transaction_id} "
+                             f"(now {current_status.get(item_id) or 'deleted'})")
+                if current_status.get(item_id):
+                    # Undo the provisional change shown while offline
+                    self.events.publish(ItemStatusChanged(item_id, current_status[item_id]))
+            if stale:
+                refused.append((entry, "; ".join(stale), True))
+        return refused
+
+    def _replay_students(self, entries: List[JournalEntry], id_map: Dict[int, int]) -> bool:
+        """Replay a run of create_student calls as one upsert on student_id."""
+        result = self.client.table('students').upsert(
+            [entry.args["student_data"] for entry in entries], on_conflict='student_id'
+        ).execute()
+        by_student_id = {row["student_id"]: row for row in result.data}
+        for entry in entries:
+            student = by_student_id.get(entry.args["student_data"].get("student_id"))
+            if student is None:
+                continue
+            id_map[-entry.seq] = student["id"]
+            # Swap the provisional record for the real one
+            self.events.publish(StudentRemoved(-entry.seq))
+            self.events.publish(StudentAdded(student))
+        return True
+
+    def _replay_student_deletes(self, entries: List[JournalEntry], id_map: Dict[int, int]) -> bool:
+        """Replay a run of delete_student calls as one filtered delete."""
+        student_ids = [self._real_id(entry.args["student_id"], id_map) for entry in entries]
+        self.client.table('students').delete().in_('id', student_ids).execute()
+        for student_id in student_ids:
+            self.events.publish(StudentRemoved(student_id))
+        return True
 
 
 class ComponentSelectionPopup(ctk.CTkToplevel):
@@ -1315,6 +4149,314 @@ class ComponentSelectionPopup(ctk.CTkToplevel):
         self.destroy()
 
 
+# ============================================================
+# CONFIG ZONE: Charts
+# ============================================================
+# PERFORMANCE OPTIMIZATION: Dashboard charts are drawn natively on a Tk Canvas.
+#
+# Importing matplotlib and the TkAgg backend costs startup time and tens of
+# MB of memory, just to draw a 5-bar chart and a 3-slice pie. The built-in
+# renderer below draws bar, pie and sparkline charts with a handful of
+# canvas items in the zinc palette, and the dashboard opens without
+# importing matplotlib at all.
+#
+# Set LABTRACK_CHART_BACKEND=matplotlib to use matplotlib instead (imported
+# lazily the first time a chart is drawn; falls back to "canvas" if it is
+# not installed).
+CHART_BACKEND = os.getenv("LABTRACK_CHART_BACKEND", "canvas").strip().lower()
+CHART_STATUS_COLORS = {
+    "Available": "#4CAF50",  # Green
+    "Issued": "#2196F3",     # Blue
+    "Damaged": "#F44336"     # Red
+}
+
+_matplotlib_loaded = False
+
+
+def load_matplotlib() -> bool:
+    """
+    Import matplotlib with the TkAgg backend on first use.
+
+    Returns:
+        True if matplotlib is available
+    """
+    global Figure, FigureCanvasTkAgg, _matplotlib_loaded
+    if _matplotlib_loaded:
+        return True
+    if not MATPLOTLIB_AVAILABLE:
+        return False
+    import matplotlib
+    matplotlib.use('TkAgg')  # Set backend before creating any figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+    _matplotlib_loaded = True
+    return True
+
+
+class CanvasChart(tk.Canvas):
+    """
+    Base class for the built-in charts: a Tk Canvas that redraws on resize.
+
+    set_data() skips the redraw when the data did not change.
+    """
+
+    def __init__(self, master, colors: Dict[str, str], title: str = "",
+                 width: int = 550, height: int = 450):
+        """
+        Args:
+            master: Parent widget
+            colors: The app's color palette (bg_secondary, text_primary, ...)
+            title: Chart title drawn at the top
+            width: Requested width in pixels
+            height: Requested height in pixels
+        """
+        super().__init__(master, width=width, height=height, bg=colors["bg_secondary"],
+                         highlightthickness=0, bd=0)
+        self.colors = colors
+        self.title = title
+        self._data = None
+        self.bind("<Configure>", lambda event: self._redraw())
+
+    def set_data(self, data):
+        """Show new data (no-op if it equals what is already drawn)."""
+        if data == self._data:
+            return
+        self._data = data
+        self._redraw()
+
+    def _redraw(self):
+        self.delete("all")
+        width, height = self.winfo_width(), self.winfo_height()
+        if width < 50 or height < 50 or self._data is None:
+            return  # Not laid out yet; <Configure> will call again
+        top = 16
+        if self.title:
+            self.create_text(width / 2, top, text=self.title, anchor="n",
+                             fill=self.colors["text_primary"], font=("Helvetica", 15, "bold"))
+            top += 44
+        self._draw(width, height, top)
+
+    def _draw(self, width: int, height: int, top: int):
+        raise NotImplementedError
+
+
+class CanvasBarChart(CanvasChart):
+    """Vertical bars; data is a sequence of (label, value) pairs."""
+
+    def _draw(self, width: int, height: int, top: int):
+        left, right, bottom = 56, width - 24, height - 64
+        values = [value for _, value in self._data]
+        peak = max(values, default=0) or 1
+
+        # Axis lines (bottom and left only, like the matplotlib styling)
+        self.create_line(left, bottom, right, bottom, fill=self.colors["border"])
+        self.create_line(left, top, left, bottom, fill=self.colors["border"])
+        for fraction in (0, 0.5, 1):
+            y = bottom - (bottom - top) * fraction
+            self.create_text(left - 8, y, text=f"{peak * fraction:g}", anchor="e",
+                             fill=self.colors["text_secondary"], font=("Helvetica", 10))
+
+        if not self._data:
+            return
+        slot = (right - left) / len(self._data)
+        bar_width = slot * 0.6
+        for index, (label, value) in enumerate(self._data):
+            x0 = left + slot * index + (slot - bar_width) / 2
+            y0 = bottom - (bottom - top) * (value / peak)
+            self.create_rectangle(x0, y0, x0 + bar_width, bottom, fill=self.colors["accent"], width=0)
+            self.create_text(x0 + bar_width / 2, y0 - 4, text=str(value), anchor="s",
+                             fill=self.colors["text_primary"], font=("Helvetica", 10, "bold"))
+            label = label if len(label) <= 14 else label[:13] + "…"
+            self.create_text(x0 + bar_width / 2, bottom + 8, text=label, anchor="n",
+                             fill=self.colors["text_secondary"], font=("Helvetica", 10),
+                             width=slot)
+
+
+class CanvasPieChart(CanvasChart):
+    """Pie with a legend; data is a sequence of (label, value) pairs."""
+
+    def _draw(self, width: int, height: int, top: int):
+        slices = [(label, value) for label, value in self._data if value > 0]
+        total = sum(value for _, value in slices)
+        if not total:
+            self.create_text(width / 2, (top + height) / 2, text="No items",
+                             fill=self.colors["text_secondary"], font=("Helvetica", 12))
+            return
+
+        diameter = min(width * 0.6, height - top - 24)
+        x0 = 24
+        y0 = top + (height - top - diameter) / 2
+        start = 90.0  # Start at the top, like the matplotlib version
+        for label, value in slices:
+            color = CHART_STATUS_COLORS.get(label, "#808080")
+            extent = 360.0 * value / total
+            if len(slices) == 1:
+                self.create_oval(x0, y0, x0 + diameter, y0 + diameter, fill=color, width=0)
+            else:
+                self.create_arc(x0, y0, x0 + diameter, y0 + diameter, start=start, extent=extent,
+                                fill=color, outline=self.colors["bg_secondary"], width=2, style=tk.PIESLICE)
+            start += extent
+
+        # Legend with percentages
+        legend_x = x0 + diameter + 24
+        legend_y = y0 + diameter / 2 - len(slices) * 14
+        for label, value in slices:
+            color = CHART_STATUS_COLORS.get(label, "#808080")
+            self.create_rectangle(legend_x, legend_y + 4, legend_x + 12, legend_y + 16, fill=color, width=0)
+            self.create_text(legend_x + 20, legend_y + 10, anchor="w",
+                             text=f"{label}  {value / total * 100:.1f}%",
+                             fill=self.colors["text_secondary"], font=("Helvetica", 12))
+            legend_y += 28
+
+
+class CanvasSparkline(CanvasChart):
+    """Small line chart without axes; data is a sequence of numbers."""
+
+    def __init__(self, master, colors: Dict[str, str], width: int = 160, height: int = 36,
+                 line_color: Optional[str] = None):
+        super().__init__(master, colors, title="", width=width, height=height)
+        self.line_color = line_color or colors["accent"]
+
+    def _redraw(self):
+        self.delete("all")
+        width, height = self.winfo_width(), self.winfo_height()
+        if width < 4 or height < 4 or not self._data:
+            return
+        self._draw(width, height, 0)
+
+    def _draw(self, width: int, height: int, top: int):
+        values = list(self._data)
+        low, high = min(values), max(values)
+        span = (high - low) or 1
+        step = (width - 6) / max(1, len(values) - 1)
+        points = []
+        for index, value in enumerate(values):
+            points += [3 + index * step, height - 3 - (height - 6) * (value - low) / span]
+        if len(points) >= 4:
+            self.create_line(*points, fill=self.line_color, width=1.5)
+        self.create_oval(points[-2] - 2, points[-1] - 2, points[-2] + 2, points[-1] + 2,
+                         fill=self.line_color, width=0)
+
+
+# ============================================================
+# CONFIG ZONE: Row Rendering
+# ============================================================
+# PERFORMANCE OPTIMIZATION: Large tables are built in small batches.
+#
+# Creating a CustomTkinter row costs ~1-3 ms (frame + 5-6 labels/buttons),
+# so a 5,000-row catalog used to freeze the window for 10+ seconds. Rows
+# are now built by RowRenderer from the Tk event loop: the first screenful
+# synchronously (so the table never appears empty), then batches that stop
+# after RENDER_FRAME_BUDGET_MS and yield so clicks, typing and repaints are
+# handled between batches. Starting a new render of the same table (e.g.
+# the filter changed mid-render) cancels the old one.
+RENDER_FIRST_BATCH = 40          # Rows built before the table is first shown
+RENDER_FRAME_BUDGET_MS = 12      # Max time spent building rows per batch
+RENDER_YIELD_MS = 1              # Delay between batches (lets Tk process events)
+
+
+class RowRenderer:
+    """
+    Builds table rows in time-budgeted batches on the Tk event loop.
+
+    One render job runs per table key; starting a new job for the same key
+    cancels the previous one. Must be used from the main thread.
+    """
+
+    def __init__(self, widget, first_batch: int = RENDER_FIRST_BATCH,
+                 budget_ms: float = RENDER_FRAME_BUDGET_MS, yield_ms: int = RENDER_YIELD_MS):
+        """
+        Args:
+            widget: Any Tk widget (used for after/after_cancel)
+            first_batch: Rows to build synchronously in start()
+            budget_ms: Time budget per batch
+            yield_ms: Delay between batches
+        """
+        self.widget = widget
+        self.first_batch = first_batch
+        self.budget = budget_ms / 1000.0
+        self.yield_ms = yield_ms
+        self._jobs: Dict[str, Dict] = {}  # key -> {"rows", "index", "build", "parent", "on_done", "after_id"}
+
+    def start(self, key: str, rows, build_row: Callable, parent=None,
+              on_done: Optional[Callable[[int], None]] = None):
+        """
+        Render rows for a table, cancelling any unfinished render with the same key.
+
+        Args:
+            key: Table name ("catalog", "inventory", "students")
+            rows: Sequence of rows to render (indexed, so the caller's list is not copied)
+            build_row: Called with each row; exceptions are logged (ui_log) and the row skipped
+            parent: Container widget; the job stops if it is destroyed
+            on_done: Called with the number of rows built when the job finishes
+        """
+        self.cancel(key)
+        job = {"rows": rows, "index": 0, "built": 0, "build": build_row,
+               "parent": parent, "on_done": on_done, "after_id": None}
+        self._jobs[key] = job
+        self._run(key, job, limit=self.first_batch)
+
+    def cancel(self, key: str):
+        """Stop an unfinished render (rows already built are left in place)."""
+        job = self._jobs.pop(key, None)
+        if job and job["after_id"] is not None:
+            try:
+                self.widget.after_cancel(job["after_id"])
+            except Exception:
+                pass
+
+    def cancel_all(self):
+        """Stop every unfinished render."""
+        for key in list(self._jobs):
+            self.cancel(key)
+
+    def is_running(self, key: str) -> bool:
+        """True while rows for this table are still being built."""
+        return key in self._jobs
+
+    def _run(self, key: str, job: Dict, limit: Optional[int] = None):
+        if self._jobs.get(key) is not job:
+            return  # Superseded or cancelled
+        job["after_id"] = None
+        parent = job["parent"]
+        if parent is not None and not parent.winfo_exists():
+            del self._jobs[key]  # View was destroyed mid-render
+            return
+
+        rows = job["rows"]
+        deadline = time.perf_counter() + self.budget
+        stop = len(rows) if limit is None else min(len(rows), job["index"] + limit)
+        while job["index"] < stop:
+            row = rows[job["index"]]
+            job["index"] += 1
+            try:
+                job["build"](row)
+                job["built"] += 1
+            except Exception as e:
+                ui_log.error("Error rendering %s row: %s", key, e)
+            if limit is None and time.perf_counter() >= deadline:
+                break
+
+        if job["index"] < len(rows):
+            job["after_id"] = self.widget.after(self.yield_ms, lambda: self._run(key, job))
+            return
+
+        del self._jobs[key]
+        if job["on_done"]:
+            job["on_done"](job["built"])
+
+
+# Views are kept alive between visits (see LabApp._switch_view) and rebuilt only
+# when their data changed. Views that show server-side data not covered by
+# change events (other stations' overdue loans and activity) are also rebuilt
+# once they are older than this many seconds.
+VIEW_MAX_AGE_SECONDS = {
+    "dashboard": 60.0,
+    "performance": 0.0,  # Live numbers: rebuilt on every visit
+}
+
+
+@instrumented("ui", prefixes=("_show_", "_load_", "_refresh_dashboard", "_update_bar_chart", "_update_pie_chart"))
 class LabApp(ctk.CTk):
     """
     Main application window with modern sidebar navigation.
@@ -1385,7 +4527,16 @@ class LabApp(ctk.CTk):
         self.supabase_url = supabase_url
         self.supabase_key = supabase_key
         
-        self.db = DatabaseManager(supabase_url, supabase_key)
+        # Change events from DatabaseManager writes (kept across Sync, which recreates self.db)
+        self.event_bus = ChangeEventBus()
+        # Offline write journal (see CONFIG ZONE: Offline Write Journal), only needed with Supabase
+        self.journal = None
+        if JOURNAL_ENABLED and supabase_url and supabase_key:
+            try:
+                self.journal = WriteJournal(JOURNAL_PATH, event_bus=self.event_bus)
+            except sqlite3.Error as e:
+                sync_log.warning("Offline journal unavailable (%s). Writes will fail while offline.", e)
+        self.db = DatabaseManager(supabase_url, supabase_key, event_bus=self.event_bus, journal=self.journal)
         
         # ============================================================
         # PERFORMANCE OPTIMIZATION: Local Data Caching
@@ -1402,13 +4553,62 @@ class LabApp(ctk.CTk):
         # - View switches: Uses cache if available, fetches if empty
         self.cache = {
             "inventory": [],  # Cached inventory list
-            "items": [],       # Cached items list (with inventory info)
+            "items": [],       # Cached items (ItemStore once loaded; join inventory_id for names)
             "students": [],    # Cached students list
             "staff": [],       # Cached staff list
             "cache_timestamp": None  # Track when cache was last updated
         }
         self.cache_lock = threading.Lock()  # Thread-safe cache access
-        
+
+        # Id-keyed inventory dictionary for client-side joins (items are fetched flat)
+        # Rebuilt lazily whenever the cached inventory list changes
+        self._inventory_lookup: Dict[int, Dict] = {}
+        self._inventory_lookup_source = None
+        self._inventory_lookup_size = 0
+
+        # Vectorized counts over the cached ItemStore (rebuilt when the store is replaced)
+        self._item_metrics: Optional[ItemMetrics] = None
+
+        # Bloom filter of every serial in use, for manual serial checks (follows the ItemStore)
+        self._serial_filter = SerialFilter()
+
+        # PERFORMANCE: Patch the cache from change events instead of invalidating it.
+        # Visible catalog/inventory rows are registered so only changed rows redraw.
+        self._catalog_rows: Dict[int, ctk.CTkFrame] = {}
+        self._catalog_student_lookup: Dict[int, str] = {}
+        self._inventory_row_labels: Dict[int, Tuple] = {}
+        self._row_renderer = RowRenderer(self)
+
+        # N+1 query detection (LABTRACK_QUERY_AUDIT=1, see CONFIG ZONE: Query Audit)
+        QUERY_AUDIT.view_classes = (LabApp,)
+        if QUERY_AUDIT.enabled:
+            QUERY_AUDIT.install_tk_hook()
+        self.event_bus.subscribe(self._on_data_changed)
+
+        # PERFORMANCE: Persistent views (see _switch_view). Every cache change bumps
+        # _data_version; a view built at an older version is rebuilt when shown.
+        self._view_frames: Dict[str, ctk.CTkFrame] = {}
+        self._view_built: Dict[str, Tuple[int, float]] = {}  # view -> (data version, monotonic time)
+        self._data_version = 0
+
+        # Dashboard widgets updated in place by _refresh_dashboard
+        self._dashboard_labels: Dict[str, ctk.CTkLabel] = {}
+        self._dashboard_activity_list = None
+        self._bar_chart = None  # CanvasChart, or a dict of matplotlib handles
+        self._pie_chart = None
+
+        # PERFORMANCE: Optimistic writes (see CONFIG ZONE: Optimistic Writes).
+        # _optimistic_items holds statuses shown on screen but not yet confirmed.
+        self.write_queue = WriteBehindQueue(lambda: self.db)
+        self._optimistic_items: Dict[int, str] = {}
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Main-loop stall detection (see CONFIG ZONE: Stall Watchdog)
+        self.stall_watchdog = StallWatchdog(self, owner_class=LabApp) if STALL_WATCHDOG_ENABLED else None
+        if self.stall_watchdog:
+            # Start once the loop is idle, so building the window is not reported as a stall
+            self.after_idle(self.stall_watchdog.start)
+
         # Cart for issue items (stores items before finalizing transaction)
         self.cart_items: List[Dict] = []
         
@@ -1430,9 +4630,19 @@ class LabApp(ctk.CTk):
         
         # Create UI
         self._create_ui()
+        self._show_journal_status()
         
         # Initial cache population (non-blocking)
         self._populate_cache_async()
+
+        # Replay starts as soon as the journal is attached, so wait until the
+        # cache, subscriptions and views above exist and mainloop is running
+        self.after(0, self._attach_journal)
+
+    def _attach_journal(self):
+        """Hand the connected DatabaseManager to the offline journal for replay."""
+        if self.journal is not None and not self.db.use_mock:
+            self.journal.attach(self.db)
     
     def _create_ui(self):
         """
@@ -1637,68 +4847,170 @@ class LabApp(ctk.CTk):
         )
         self.students_btn.pack(pady=4, padx=12, fill="x")
         
+        # Hidden Performance view (Ctrl+Shift+P, or LABTRACK_PERF_PANEL=1)
+        self.performance_btn = ctk.CTkButton(
+            sidebar,
+            text="Performance",
+            command=lambda: self._switch_view("performance"),
+            height=44,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            anchor="w",
+            fg_color="transparent",
+            text_color=self.colors["text_primary"],
+            hover_color="#27272a",
+            corner_radius=8
+        )
+        if PERF_PANEL:
+            self.performance_btn.pack(pady=4, padx=12, fill="x")
+        self.bind("<Control-Shift-P>", lambda event: self._toggle_performance_view())
+        
         # ============================================================
         # MAIN CONTENT AREA - Premium Spacing
         # ============================================================
         # Content area uses primary background with generous padding
         # 32px padding creates "breathing room" - a key SaaS design principle
         # This prevents the UI from feeling cramped
-        self.content_frame = ctk.CTkFrame(
+        self.content_area = ctk.CTkFrame(
             self, 
             corner_radius=0,
             fg_color=self.colors["bg_primary"],
             bg_color=self.colors["bg_primary"]
         )
-        self.content_frame.grid(row=1, column=1, sticky="nsew", padx=32, pady=32)
-        self.content_frame.grid_columnconfigure(0, weight=1)
-        self.content_frame.grid_rowconfigure(0, weight=1)
+        self.content_area.grid(row=1, column=1, sticky="nsew", padx=32, pady=32)
+        self.content_area.grid_columnconfigure(0, weight=1)
+        self.content_area.grid_rowconfigure(0, weight=1)
         
         # Show dashboard by default
-        self._show_dashboard()
+        self._switch_view("dashboard")
     
-    def _switch_view(self, view_name: str):
+    def _switch_view(self, view_name: str, refresh: bool = False):
         """
         Switch between different views in the content area.
         
         This method:
-        1. Clears the current content
-        2. Updates sidebar button highlights
-        3. Shows the selected view
+        1. Updates sidebar button highlights (only the two that change)
+        2. Hides the current view and shows the selected one
+        3. Builds the selected view only if it is new or dirty
+        
+        PERFORMANCE OPTIMIZATION: Each view lives in its own host frame inside
+        content_area and is kept alive (hidden) when another view is shown.
+        Switching back to a view whose data has not changed just re-grids its
+        frame, with no widget (or CTkFont) rebuilt, so Catalog -> Issue ->
+        Catalog is instant at any data size. A view is rebuilt from the cache
+        when it is dirty: a change event or sync happened after it was built
+        (_data_version moved on), it is older than VIEW_MAX_AGE_SECONDS, or
+        refresh is True. Views listed in refreshers update their existing
+        widgets instead. While a view is shown, self.content_frame is its host
+        frame, so view builders are unchanged.
         
         Args:
-            view_name: One of "dashboard", "issue", "returns", "inventory"
+            view_name: One of "dashboard", "issue", "returns", "inventory", "catalog", "students",
+                "performance"
+            refresh: Rebuild the view even if it is not dirty
         """
+        builders = {
+            "dashboard": self._show_dashboard,
+            "issue": self._show_issue_view,
+            "returns": self._show_returns_view,
+            "inventory": self._show_inventory_view,
+            "catalog": self._show_catalog_view,
+            "students": self._show_students_view,
+            "performance": self._show_performance_view
+        }
+        buttons = {
+            "dashboard": self.dashboard_btn,
+            "issue": self.issue_btn,
+            "returns": self.returns_btn,
+            "inventory": self.inventory_btn,
+            "catalog": self.catalog_btn,
+            "students": self.students_btn,
+            "performance": self.performance_btn
+        }
+        previous_view = self.current_view
         self.current_view = view_name
         
-        # Clear content frame
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        
         # Update button highlights - Premium active state
-        # Reset all buttons to transparent (inactive state)
-        for btn in [self.dashboard_btn, self.issue_btn, self.returns_btn, self.inventory_btn, self.catalog_btn, self.students_btn]:
-            btn.configure(fg_color="transparent", text_color=self.colors["text_primary"])
-        
-        # Highlight active button with white accent
         # White (#ffffff) on dark background creates strong visual hierarchy
-        if view_name == "dashboard":
-            self.dashboard_btn.configure(fg_color=self.colors["accent"], text_color=self.colors["bg_primary"])
-            self._show_dashboard()
-        elif view_name == "issue":
-            self.issue_btn.configure(fg_color=self.colors["accent"], text_color=self.colors["bg_primary"])
-            self._show_issue_view()
-        elif view_name == "returns":
-            self.returns_btn.configure(fg_color=self.colors["accent"], text_color=self.colors["bg_primary"])
-            self._show_returns_view()
-        elif view_name == "inventory":
-            self.inventory_btn.configure(fg_color=self.colors["accent"], text_color=self.colors["bg_primary"])
-            self._show_inventory_view()
-        elif view_name == "catalog":
-            self.catalog_btn.configure(fg_color=self.colors["accent"], text_color=self.colors["bg_primary"])
-            self._show_catalog_view()
-        elif view_name == "students":
-            self.students_btn.configure(fg_color=self.colors["accent"], text_color=self.colors["bg_primary"])
-            self._show_students_view()
+        if previous_view != view_name and previous_view in buttons:
+            buttons[previous_view].configure(fg_color="transparent", text_color=self.colors["text_primary"])
+        buttons[view_name].configure(fg_color=self.colors["accent"], text_color=self.colors["bg_primary"])
+        
+        # Hide the other views (kept alive for the next visit)
+        for name, frame in self._view_frames.items():
+            if name != view_name:
+                frame.grid_remove()
+        
+        host = self._view_frames.get(view_name)
+        if host is None or not host.winfo_exists():
+            host = ctk.CTkFrame(self.content_area, corner_radius=0, fg_color=self.colors["bg_primary"])
+            self._view_frames[view_name] = host
+            refresh = True
+        
+        # Views that can update their widgets in place (instead of a rebuild)
+        refreshers = {
+            "dashboard": self._refresh_dashboard
+        }
+        
+        built_version, built_at = self._view_built.get(view_name, (None, 0.0))
+        max_age = VIEW_MAX_AGE_SECONDS.get(view_name)
+        if (refresh or built_version != self._data_version
+                or (max_age is not None and time.monotonic() - built_at > max_age)):
+            self._view_built[view_name] = (self._data_version, time.monotonic())
+            self.content_frame = host
+            if view_name in refreshers and host.winfo_children():
+                refreshers[view_name]()
+            else:
+                for widget in host.winfo_children():
+                    widget.destroy()
+                builders[view_name]()
+        
+        self.content_frame = host
+        host.grid(row=0, column=0, sticky="nsew")
+    
+    def _get_dashboard_data(self) -> Dict:
+        """
+        Gather the numbers the Dashboard shows.
+
+        PERFORMANCE: One round trip for everything on this screen. The snapshot
+        carries the overdue list and activity feed (refreshed on each visit)
+        plus server-side counts for the cards and charts. When the local cache
+        is loaded, the counts come from it instead: it is instant and kept
+        current by change events.
+
+        Returns:
+            Dictionary with "total_items", "issued", "total_students",
+            "status_counts", "top_components" ((name, count) pairs),
+            "overdue" and "recent"
+        """
+        snapshot = self.db.get_dashboard_snapshot(days_threshold=7, top_n=5, recent_limit=5)
+        with self.cache_lock:
+            cache_loaded = bool(self.cache["items"]) and bool(self.cache["students"])
+            cached_students = self.cache["students"]
+        
+        data = {"overdue": snapshot["overdue"], "recent": snapshot["recent"]}
+        if cache_loaded or snapshot["status_counts"] is None:
+            metrics = self._get_item_metrics()
+            data["total_items"] = metrics.total
+            data["issued"] = metrics.count("Issued")
+            data["total_students"] = len(cached_students) if cache_loaded else snapshot["total_students"]
+            data["status_counts"] = metrics.status_counts(("Available", "Issued", "Damaged"))
+            data["top_components"] = [
+                (inv["name"], count)
+                for inv, count in metrics.top_components(
+                    list(self._get_inventory_lookup().values()), n=5, status="Available"
+                )
+            ]
+        else:
+            data["total_items"] = snapshot["total_items"]
+            data["issued"] = snapshot["issued"]
+            data["total_students"] = snapshot["total_students"]
+            data["status_counts"] = {status: snapshot["status_counts"].get(status, 0)
+                                     for status in ("Available", "Issued", "Damaged")}
+            data["top_components"] = [(row["name"], row["count"]) for row in snapshot["top_components"]]
+        
+        # Store overdue item IDs for highlighting in Catalog
+        self.overdue_item_ids = {item["id"] for item in data["overdue"]}
+        return data
     
     def _show_dashboard(self):
         """
@@ -1737,38 +5049,13 @@ class LabApp(ctk.CTk):
         cards_container = ctk.CTkFrame(scroll_frame, fg_color="transparent")
         cards_container.pack(fill="x", pady=(0, 40))
         
-        # PERFORMANCE: Use cache if available, otherwise fetch
-        # This provides instant UI rendering when cache is populated
-        with self.cache_lock:
-            cached_items = self.cache["items"]
-            cached_students = self.cache["students"]
-        
-        if cached_items:
-            all_items = cached_items
-        else:
-            all_items = self.db.get_all_items()
-            # Update cache for next time
-            with self.cache_lock:
-                self.cache["items"] = all_items
-        
-        if cached_students:
-            all_students = cached_students
-        else:
-            all_students = self.db.get_all_students()
-            # Update cache for next time
-            with self.cache_lock:
-                self.cache["students"] = all_students
-        
-        total_items = len(all_items)
-        issued_count = sum(1 for item in all_items if item.get("status") == "Issued")
-        total_students = len(all_students)
-        
-        # Get overdue items for warning (refresh on each dashboard view)
-        # This ensures the overdue count is always current
-        overdue_items = self.db.get_overdue_items(days_threshold=7)
-        overdue_count = len(overdue_items)
-        # Store overdue item IDs for highlighting in Catalog
-        self.overdue_item_ids = {item["id"] for item in overdue_items}
+        data = self._get_dashboard_data()
+        total_items = data["total_items"]
+        issued_count = data["issued"]
+        total_students = data["total_students"]
+        status_counts = data["status_counts"]
+        top_components = data["top_components"]
+        overdue_count = len(data["overdue"])
         
         # Card dimensions: Premium sizing for visual impact
         card_width = 320
@@ -1847,12 +5134,18 @@ class LabApp(ctk.CTk):
         )
         card2_value.pack(anchor="w", padx=30)
         
+        # Trend fonts are created once; _refresh_dashboard switches between them
+        self._dashboard_fonts = {
+            "trend": ctk.CTkFont(size=12),
+            "trend_warning": ctk.CTkFont(size=12, weight="bold"),
+        }
+        
         # Show overdue warning if items are overdue
         if overdue_count > 0:
             card2_trend = ctk.CTkLabel(
                 card2,
                 text=f"⚠️ {overdue_count} Item{'s' if overdue_count != 1 else ''} Overdue",
-                font=ctk.CTkFont(size=12, weight="bold"),
+                font=self._dashboard_fonts["trend_warning"],
                 text_color="#f59e0b"  # Orange warning color
             )
             card2_trend.pack(anchor="w", padx=30, pady=(8, 0))
@@ -1860,7 +5153,7 @@ class LabApp(ctk.CTk):
             card2_trend = ctk.CTkLabel(
                 card2,
                 text="+1 today",
-                font=ctk.CTkFont(size=12),
+                font=self._dashboard_fonts["trend"],
                 text_color=self.colors["text_secondary"]
             )
             card2_trend.pack(anchor="w", padx=30, pady=(8, 0))
@@ -1925,6 +5218,14 @@ class LabApp(ctk.CTk):
         )
         card3_trend.pack(anchor="w", padx=30, pady=(8, 0))
         
+        # Keep the value labels for in-place refreshes (_refresh_dashboard)
+        self._dashboard_labels = {
+            "total_items": card1_value,
+            "issued": card2_value,
+            "issued_trend": card2_trend,
+            "total_students": card3_value
+        }
+        
         # ============================================================
         # CHARTS SECTION
         # ============================================================
@@ -1932,21 +5233,11 @@ class LabApp(ctk.CTk):
         charts_container = ctk.CTkFrame(scroll_frame, fg_color="transparent")
         charts_container.pack(fill="both", expand=True, pady=20)
         
-        if MATPLOTLIB_AVAILABLE:
-            # Chart 1: Bar Chart - Top 5 Components by Inventory Level
-            self._create_bar_chart(charts_container, all_items)
-            
-            # Chart 2: Pie Chart - Item Status Distribution
-            self._create_pie_chart(charts_container, all_items)
-        else:
-            # Fallback if matplotlib is not available
-            no_charts_label = ctk.CTkLabel(
-                charts_container,
-                text="Install matplotlib to view charts: pip install matplotlib",
-                font=ctk.CTkFont(size=14),
-                text_color=self.colors["text_secondary"]
-            )
-            no_charts_label.pack(pady=50)
+        # Chart 1: Bar Chart - Top 5 Components by Inventory Level
+        self._create_bar_chart(charts_container, top_components)
+        
+        # Chart 2: Pie Chart - Item Status Distribution
+        self._create_pie_chart(charts_container, status_counts)
         
         # ============================================================
         # RECENT ACTIVITY SECTION
@@ -1974,8 +5265,13 @@ class LabApp(ctk.CTk):
         activity_list = ctk.CTkFrame(activity_card, fg_color="transparent")
         activity_list.pack(fill="x", padx=30, pady=(0, 30))
         
-        # Get recent transactions
-        recent_transactions = self.db.get_recent_transactions(limit=5)
+        self._dashboard_activity_list = activity_list
+        self._render_activity_list(activity_list, data["recent"])
+    
+    def _render_activity_list(self, activity_list, recent_transactions: List[Dict]):
+        """Fill the Recent Transactions card (clears the previous rows)."""
+        for widget in activity_list.winfo_children():
+            widget.destroy()
         
         if not recent_transactions:
             no_activity = ctk.CTkLabel(
@@ -2101,42 +5397,26 @@ class LabApp(ctk.CTk):
             # Fallback for any parsing errors
             return "Recently"
     
-    def _create_bar_chart(self, parent, all_items: List[Dict]):
+    def _create_bar_chart(self, parent, top_components: List[Tuple[str, int]]):
         """
         Create a bar chart showing inventory levels for top 5 components.
         
         This method:
-        1. Calculates available items per component
-        2. Creates a matplotlib figure with dark theme
-        3. Embeds it into a CustomTkinter frame
+        1. Creates the chart widget once per dashboard: a CanvasBarChart, or a
+           matplotlib figure with dark theme embedded in a CustomTkinter frame
+           (LABTRACK_CHART_BACKEND=matplotlib)
+        2. Draws the bars through _update_bar_chart
         
         Args:
             parent: The parent frame to embed the chart into
-            all_items: List of all items from the database
+            top_components: (component name, available count) pairs, highest first
         """
-        # PERFORMANCE: Use cache for chart data
-        with self.cache_lock:
-            cached_inventory = self.cache["inventory"]
-        
-        if cached_inventory:
-            inventory_list = cached_inventory
-        else:
-            inventory_list = self.db.get_all_inventory()
-            with self.cache_lock:
-                self.cache["inventory"] = inventory_list
-        
-        # Calculate available count for each inventory item
-        component_data = {}
-        for inv in inventory_list:
-            available = sum(1 for item in all_items 
-                          if item.get("inventory_id") == inv["id"] 
-                          and item.get("status") == "Available")
-            component_data[inv["name"]] = available
-        
-        # Sort by value and get top 5
-        sorted_components = sorted(component_data.items(), key=lambda x: x[1], reverse=True)[:5]
-        component_names = [item[0] for item in sorted_components]
-        component_counts = [item[1] for item in sorted_components]
+        if not self._use_matplotlib():
+            chart = CanvasBarChart(parent, self.colors, title="Top 5 Components - Available Stock")
+            chart.pack(side="left", padx=20, pady=10, fill="both", expand=True)
+            self._bar_chart = chart
+            self._update_bar_chart(top_components)
+            return
         
         # ============================================================
         # MATPLOTLIB INTEGRATION - Premium Zinc Palette
@@ -2154,12 +5434,7 @@ class LabApp(ctk.CTk):
         ax.set_facecolor(self.colors["bg_secondary"])  # Chart background
         fig.patch.set_facecolor(self.colors["bg_secondary"])  # Figure background
         
-        # Step 4: Create the bar chart with subtle styling
-        # Using white bars for contrast against dark background
-        # This creates a clean, premium look
-        bars = ax.bar(component_names, component_counts, color=self.colors["accent"], alpha=0.9)
-        
-        # Step 5: Style the chart - Premium Typography
+        # Step 4: Style the chart - Premium Typography
         # All text uses text_secondary (#a1a1aa) for subtle, professional look
         ax.set_title("Top 5 Components - Available Stock", 
                     color=self.colors["text_primary"], fontsize=15, fontweight="bold", pad=24)
@@ -2176,22 +5451,64 @@ class LabApp(ctk.CTk):
         ax.spines['bottom'].set_color(self.colors["border"])
         ax.spines['left'].set_color(self.colors["border"])
         
-        # Rotate x-axis labels if they're long
-        plt.setp(ax.get_xticklabels(), rotation=45, ha="right", color=self.colors["text_secondary"])
-        
-        # Step 6: Embed the matplotlib figure into CustomTkinter
+        # Step 5: Embed the matplotlib figure into CustomTkinter
         # FigureCanvasTkAgg is the bridge between matplotlib and Tkinter
         # master: The parent widget (our CustomTkinter frame)
         # figure: The matplotlib figure we created
         canvas = FigureCanvasTkAgg(fig, master=parent)
         
-        # Step 7: Draw the canvas and pack it
         # get_tk_widget(): Gets the Tkinter widget from the canvas
         # This allows us to use it with CustomTkinter's pack/grid system
-        canvas.draw()
         canvas.get_tk_widget().pack(side="left", padx=20, pady=10, fill="both", expand=True)
+        
+        self._bar_chart = {"figure": fig, "ax": ax, "canvas": canvas, "bars": None, "data": None}
+        self._update_bar_chart(top_components)
+    
+    def _update_bar_chart(self, top_components: List[Tuple[str, int]]):
+        """
+        Update the bar chart in place.
+        
+        PERFORMANCE OPTIMIZATION: The figure, axes and Tk canvas are created once.
+        A refresh with the same numbers returns immediately; otherwise the bar
+        heights and tick labels are changed on the existing artists (new bars
+        only when the number of components changes) and draw_idle() lets Tk
+        repaint once when it is idle.
+        
+        Args:
+            top_components: (component name, available count) pairs, highest first
+        """
+        chart = self._bar_chart
+        data = tuple(top_components)
+        if isinstance(chart, CanvasChart):
+            chart.set_data(data)
+            return
+        if chart is None or chart["data"] == data:
+            return
+        
+        ax = chart["ax"]
+        names = [name for name, _ in data]
+        counts = [count for _, count in data]
+        positions = list(range(len(data)))
+        
+        if chart["bars"] is not None and len(chart["bars"]) == len(data):
+            for bar, count in zip(chart["bars"], counts):
+                bar.set_height(count)
+        else:
+            if chart["bars"] is not None:
+                chart["bars"].remove()
+            # Using white bars for contrast against dark background
+            chart["bars"] = ax.bar(positions, counts, color=self.colors["accent"], alpha=0.9)
+        
+        # Rotate x-axis labels if they're long
+        ax.set_xticks(positions)
+        ax.set_xticklabels(names, rotation=45, ha="right", color=self.colors["text_secondary"])
+        ax.relim()
+        ax.autoscale_view()
+        
+        chart["data"] = data
+        chart["canvas"].draw_idle()
     
-    def _create_pie_chart(self, parent, all_items: List[Dict]):
+    def _create_pie_chart(self, parent, status_counts: Dict[str, int]):
         """
         Create a pie chart showing the distribution of item statuses.
         
@@ -2199,71 +5516,160 @@ class LabApp(ctk.CTk):
         
         Args:
             parent: The parent frame to embed the chart into
-            all_items: List of all items from the database
+            status_counts: Item count per status (Available, Issued, Damaged)
         """
-        # Count items by status
-        status_counts = {
-            "Available": sum(1 for item in all_items if item.get("status") == "Available"),
-            "Issued": sum(1 for item in all_items if item.get("status") == "Issued"),
-            "Damaged": sum(1 for item in all_items if item.get("status") == "Damaged")
-        }
+        if not self._use_matplotlib():
+            chart = CanvasPieChart(parent, self.colors, title="Item Status Distribution")
+            chart.pack(side="left", padx=20, pady=10, fill="both", expand=True)
+            self._pie_chart = chart
+            self._update_pie_chart(status_counts)
+            return
+        
+        # Create figure with zinc palette
+        fig = Figure(figsize=(5.5, 4.5), facecolor=self.colors["bg_secondary"], edgecolor=self.colors["bg_secondary"])
+        ax = fig.add_subplot(111)
+        fig.patch.set_facecolor(self.colors["bg_secondary"])
+        
+        # Embed into CustomTkinter
+        canvas = FigureCanvasTkAgg(fig, master=parent)
+        canvas.get_tk_widget().pack(side="left", padx=20, pady=10, fill="both", expand=True)
+        
+        self._pie_chart = {"figure": fig, "ax": ax, "canvas": canvas, "data": None,
+                           "labels": None, "wedges": None, "texts": None, "autotexts": None}
+        self._update_pie_chart(status_counts)
+    
+    def _update_pie_chart(self, status_counts: Dict[str, int]):
+        """
+        Update the pie chart in place (skipped when the counts have not changed).
+        
+        PERFORMANCE: When the same statuses are non-zero as last time, the
+        existing wedges get new angles (set_theta1/set_theta2) and their
+        labels move; the axes are cleared and the pie rebuilt only when a
+        slice appears or disappears. draw_idle() repaints once.
+        
+        Args:
+            status_counts: Item count per status (Available, Issued, Damaged)
+        """
+        chart = self._pie_chart
+        data = tuple(status_counts.items())
+        if isinstance(chart, CanvasChart):
+            chart.set_data(data)
+            return
+        if chart is None or chart["data"] == data:
+            return
         
         # Filter out zero values for cleaner chart
+        # (slice colors: CHART_STATUS_COLORS in CONFIG ZONE: Charts)
         labels = []
         sizes = []
         colors_list = []
         
-        # Color mapping: Change these hex codes to customize pie slice colors
-        color_map = {
-            "Available": "#4CAF50",  # Green
-            "Issued": "#2196F3",     # Blue
-            "Damaged": "#F44336"     # Red
-        }
-        
-        for status, count in status_counts.items():
+        for status, count in data:
             if count > 0:
                 labels.append(status)
                 sizes.append(count)
-                colors_list.append(color_map.get(status, "#808080"))
-        
-        if not sizes:  # No data to display
+                colors_list.append(CHART_STATUS_COLORS.get(status, "#808080"))
+        
+        ax = chart["ax"]
+        if sizes and chart["labels"] == labels:
+            # Same slices: move the wedges and labels the way ax.pie() places them
+            # (start at 90 degrees, counter-clockwise, labels at 1.1 and
+            # percentages at 0.6 of the radius)
+            total = sum(sizes)
+            theta = 90.0
+            for wedge, text, autotext, size in zip(chart["wedges"], chart["texts"], chart["autotexts"], sizes):
+                sweep = 360.0 * size / total
+                wedge.set_theta1(theta)
+                wedge.set_theta2(theta + sweep)
+                middle = math.radians(theta + sweep / 2)
+                x, y = math.cos(middle), math.sin(middle)
+                text.set_position((1.1 * x, 1.1 * y))
+                text.set_horizontalalignment("left" if x > 0 else "right")
+                autotext.set_position((0.6 * x, 0.6 * y))
+                autotext.set_text(f"{100.0 * size / total:.1f}%")
+                theta += sweep
+            chart["data"] = data
+            chart["canvas"].draw_idle()
             return
         
-        # Create figure with zinc palette
-        fig = Figure(figsize=(5.5, 4.5), facecolor=self.colors["bg_secondary"], edgecolor=self.colors["bg_secondary"])
-        ax = fig.add_subplot(111)
+        ax.clear()
         ax.set_facecolor(self.colors["bg_secondary"])
-        fig.patch.set_facecolor(self.colors["bg_secondary"])
-        
-        # Create pie chart with status colors
-        # autopct: Shows percentage on each slice
-        # startangle: Rotates the pie (90 degrees = starts at top)
-        wedges, texts, autotexts = ax.pie(
-            sizes, 
-            labels=labels, 
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors_list
-        )
+        chart["labels"] = labels if sizes else None
         
         # Style the text - Premium Typography
         ax.set_title("Item Status Distribution", 
                     color=self.colors["text_primary"], fontsize=15, fontweight="bold", pad=24)
         
-        # Set label colors to secondary text color
-        for text in texts:
-            text.set_color(self.colors["text_secondary"])
-            text.set_fontsize(12)
+        if sizes:
+            # Create pie chart with status colors
+            # autopct: Shows percentage on each slice
+            # startangle: Rotates the pie (90 degrees = starts at top)
+            wedges, texts, autotexts = ax.pie(
+                sizes, 
+                labels=labels, 
+                autopct='%1.1f%%',
+                startangle=90,
+                colors=colors_list
+            )
+            
+            # Set label colors to secondary text color
+            for text in texts:
+                text.set_color(self.colors["text_secondary"])
+                text.set_fontsize(12)
+            
+            # Set percentage text color to primary for readability
+            for autotext in autotexts:
+                autotext.set_color(self.colors["text_primary"])
+                autotext.set_fontweight("bold")
+            chart["wedges"], chart["texts"], chart["autotexts"] = wedges, texts, autotexts
+        else:
+            ax.axis("off")  # No data to display
+        
+        chart["data"] = data
+        chart["canvas"].draw_idle()
+    
+    def _use_matplotlib(self) -> bool:
+        """True if charts should be drawn with matplotlib (LABTRACK_CHART_BACKEND=matplotlib)."""
+        if CHART_BACKEND != "matplotlib":
+            return False
+        if not load_matplotlib():
+            ui_log.warning("Matplotlib not installed. Using the built-in canvas charts.")
+            return False
+        return True
+    
+    def _refresh_dashboard(self):
+        """
+        Refresh the Dashboard in place when it is shown again with new data.
         
-        # Set percentage text color to primary for readability
-        for autotext in autotexts:
-            autotext.set_color(self.colors["text_primary"])
-            autotext.set_fontweight("bold")
+        PERFORMANCE: The cards, charts and activity card stay; only their
+        values change (see _update_bar_chart / _update_pie_chart).
+        """
+        data = self._get_dashboard_data()
+        overdue_count = len(data["overdue"])
+        labels = self._dashboard_labels
         
-        # Embed into CustomTkinter
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side="left", padx=20, pady=10, fill="both", expand=True)
+        labels["total_items"].configure(text=str(data["total_items"]))
+        labels["issued"].configure(
+            text=str(data["issued"]),
+            text_color="#f59e0b" if overdue_count > 0 else self.colors["status_issued"]
+        )
+        if overdue_count > 0:
+            labels["issued_trend"].configure(
+                text=f"⚠️ {overdue_count} Item{'s' if overdue_count != 1 else ''} Overdue",
+                font=self._dashboard_fonts["trend_warning"],
+                text_color="#f59e0b"
+            )
+        else:
+            labels["issued_trend"].configure(
+                text="+1 today",
+                font=self._dashboard_fonts["trend"],
+                text_color=self.colors["text_secondary"]
+            )
+        labels["total_students"].configure(text=str(data["total_students"]))
+        
+        self._update_bar_chart(data["top_components"])
+        self._update_pie_chart(data["status_counts"])
+        self._render_activity_list(self._dashboard_activity_list, data["recent"])
     
     def _show_issue_view(self):
         """
@@ -2719,8 +6125,11 @@ class LabApp(ctk.CTk):
         for widget in self.returns_loans_list.winfo_children():
             widget.destroy()
         
-        # Get active loans
-        loans = self.db.get_active_loans(student_id)
+        # Get active loans (hiding ones already closed optimistically but not yet saved)
+        loans = [
+            loan for loan in self.db.get_active_loans(student_id)
+            if self._optimistic_items.get(loan.get("id"), "Issued") == "Issued"
+        ]
         
         if not loans:
             no_loans = ctk.CTkLabel(
@@ -2756,27 +6165,9 @@ class LabApp(ctk.CTk):
         info_container = ctk.CTkFrame(loan_frame, fg_color="transparent")
         info_container.pack(side="left", fill="x", expand=True, padx=20, pady=12)
         
-        # Get inventory name
-        inventory_name = "Unknown"
-        if "inventory" in loan and loan["inventory"]:
-            inventory_name = loan["inventory"].get("name", "Unknown")
-        elif "inventory_id" in loan:
-            # PERFORMANCE: Use cache for inventory lookup
-            with self.cache_lock:
-                cached_inventory = self.cache["inventory"]
-            
-            if cached_inventory:
-                inv_list = cached_inventory
-            else:
-                inv_list = self.db.get_all_inventory()
-                with self.cache_lock:
-                    self.cache["inventory"] = inv_list
-            
-            for inv in inv_list:
-                if inv["id"] == loan["inventory_id"]:
-                    inventory_name = inv["name"]
-                    break
-        
+        # Get inventory name (embedded record or client-side join on inventory_id)
+        inventory_name, _ = self._resolve_inventory(loan)
+
         # Item name and serial
         item_text = f"{inventory_name} - {loan.get('serial_number', 'N/A')}"
         item_label = ctk.CTkLabel(
@@ -2801,7 +6192,7 @@ class LabApp(ctk.CTk):
             fg_color=self.colors["status_available"],
             hover_color="#16a34a",
             corner_radius=8,
-            command=lambda: self._handle_return_item(loan)
+            command=lambda: self._handle_return_item(loan, loan_frame)
         )
         return_btn.pack(side="left", padx=(0, 8))
         
@@ -2815,16 +6206,17 @@ class LabApp(ctk.CTk):
             fg_color=self.colors["status_damaged"],
             hover_color="#dc2626",
             corner_radius=8,
-            command=lambda: self._handle_report_damaged(loan)
+            command=lambda: self._handle_report_damaged(loan, loan_frame)
         )
         damaged_btn.pack(side="left")
     
-    def _handle_return_item(self, loan: Dict):
+    def _handle_return_item(self, loan: Dict, loan_frame=None):
         """
         Handle returning an item: Set to Available and close transaction.
         
         Args:
             loan: Item dictionary with transaction_id
+            loan_frame: The loan's row in the list (removed at once in optimistic mode)
         """
         item_id = loan["id"]
         transaction_id = loan.get("transaction_id")
@@ -2833,11 +6225,14 @@ class LabApp(ctk.CTk):
             self._show_error("Transaction ID not found.", "Error")
             return
         
+        if OPTIMISTIC_WRITES:
+            self._close_loan_optimistic(loan, "Available", loan_frame)
+            return
+        
         success = self.db.return_item(item_id, transaction_id)
         
         if success:
-            # PERFORMANCE: Invalidate cache after data mutation
-            self._invalidate_cache(["items"])
+            # PERFORMANCE: The ItemStatusChanged event already patched the cached item
             
             # Refresh the loans list
             if self.selected_return_student:
@@ -2848,7 +6243,7 @@ class LabApp(ctk.CTk):
         else:
             self._show_error("Failed to return item. Please try again.", "Error")
     
-    def _handle_report_damaged(self, loan: Dict):
+    def _handle_report_damaged(self, loan: Dict, loan_frame=None):
         """
         Handle reporting an item as damaged: Set to Damaged and close transaction.
         
@@ -2894,7 +6289,7 @@ class LabApp(ctk.CTk):
         confirm_btn = ctk.CTkButton(
             btn_frame,
             text="Confirm",
-            command=lambda: self._confirm_damage_report(loan, popup),
+            command=lambda: self._confirm_damage_report(loan, popup, loan_frame),
             fg_color=self.colors["status_damaged"],
             hover_color="#dc2626",
             height=40,
@@ -2916,18 +6311,21 @@ class LabApp(ctk.CTk):
         )
         cancel_btn.pack(side="left", padx=10)
     
-    def _confirm_damage_report(self, loan: Dict, popup):
+    def _confirm_damage_report(self, loan: Dict, popup, loan_frame=None):
         """Confirm and execute damage report."""
         popup.destroy()
         
         item_id = loan["id"]
         transaction_id = loan.get("transaction_id")
         
+        if OPTIMISTIC_WRITES:
+            self._close_loan_optimistic(loan, "Damaged", loan_frame)
+            return
+        
         success = self.db.report_damaged(item_id, transaction_id)
         
         if success:
-            # PERFORMANCE: Invalidate cache after data mutation
-            self._invalidate_cache(["items"])
+            # PERFORMANCE: The ItemStatusChanged event already patched the cached item
             
             # Refresh the loans list
             if self.selected_return_student:
@@ -3007,7 +6405,7 @@ class LabApp(ctk.CTk):
         )
         title.pack(side="left", anchor="w")
         
-        # Button container for Import CSV and Add Component
+        # Button container for Add Component, Import CSV and Restock CSV
         button_container = ctk.CTkFrame(title_container, fg_color="transparent")
         button_container.pack(side="right")
         
@@ -3039,7 +6437,24 @@ class LabApp(ctk.CTk):
             corner_radius=8,
             width=140
         )
-        import_btn.pack(side="left")
+        import_btn.pack(side="left", padx=(0, 10))
+        
+        # Restock CSV button - add items to existing components in bulk
+        restock_btn = ctk.CTkButton(
+            button_container,
+            text="Restock CSV",
+            command=self._handle_bulk_restock,
+            height=44,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            fg_color=self.colors["bg_secondary"],
+            text_color=self.colors["text_primary"],
+            hover_color=self.colors["border"],
+            border_width=1,
+            border_color=self.colors["border"],
+            corner_radius=8,
+            width=140
+        )
+        restock_btn.pack(side="left")
         
         # Load and display inventory
         self._load_inventory_display(scroll_frame)
@@ -3089,10 +6504,17 @@ class LabApp(ctk.CTk):
             csv_data = df.to_dict('records')
             
             # Perform bulk import
-            inventory_created, items_created = self.db.bulk_import_inventory(csv_data)
+            result = self.db.bulk_import_inventory(csv_data)
+            if result is None:
+                self._show_error(
+                    "Supabase rejected the import. No components or items were added.\n\n"
+                    "Check the log for details and try again.",
+                    "Import Failed"
+                )
+                return
+            inventory_created, items_created = result
             
-            # PERFORMANCE: Invalidate cache after bulk import
-            self._invalidate_cache(["inventory", "items"])
+            # PERFORMANCE: InventoryChanged/ItemsAdded events already patched the cache
             
             # Show success message
             success_msg = (
@@ -3100,6 +6522,8 @@ class LabApp(ctk.CTk):
                 f"Inventory records created: {inventory_created}\n"
                 f"Item records created: {items_created}"
             )
+            if not items_created and self.journal is not None and self.journal.count():
+                success_msg = "Import saved offline.\n\nIt will run when the connection to Supabase returns."
             
             success_popup = ctk.CTkToplevel(self)
             success_popup.title("Import Success")
@@ -3146,11 +6570,169 @@ class LabApp(ctk.CTk):
         except Exception as e:
             self._show_error(f"Error importing CSV: {str(e)}", "Import Error")
     
+    def _handle_bulk_restock(self):
+        """
+        Restock existing components from a delivery manifest CSV.
+
+        Expected columns: Component Name, plus Quantity (auto-generated serials)
+        and/or Serials (manual serials separated by ';', ',' or spaces).
+
+        PERFORMANCE: Every row is validated up front in one pass (manual serials
+        against the serial Bloom filter), then the valid rows are written
+        through batched restock_many() calls on a background thread. The result
+        is one report with throughput and a per-row outcome, not a popup and a
+        round trip per component.
+        """
+        if not PANDAS_AVAILABLE:
+            self._show_error(
+                "Pandas is not installed. Install it with: pip install pandas",
+                "Missing Dependency"
+            )
+            return
+
+        file_path = filedialog.askopenfilename(
+            title="Select Restock CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+
+        if not file_path:
+            return  # User cancelled
+
+        try:
+            df = pd.read_csv(file_path, dtype={'Serials': str})
+        except pd.errors.EmptyDataError:
+            self._show_error("The CSV file is empty.", "Restock Error")
+            return
+        except Exception as e:
+            self._show_error(f"Error reading CSV file: {str(e)}", "Restock Error")
+            return
+
+        if 'Component Name' not in df.columns or not ({'Quantity', 'Serials'} & set(df.columns)):
+            self._show_error(
+                "CSV must have a 'Component Name' column and a 'Quantity' and/or 'Serials' column.\n\n"
+                "Serials: manual serial numbers separated by ';', ',' or spaces",
+                "Invalid CSV Format"
+            )
+            return
+
+        planned, outcomes = plan_bulk_restock(
+            df.to_dict('records'),
+            list(self._get_inventory_lookup().values()),
+            self._get_serial_filter()
+        )
+
+        def restock_thread():
+            start = time.perf_counter()
+            created = 0
+            offline = False
+
+            # Chunk by item count so one request stays a reasonable size
+            chunks, chunk, chunk_items = [], [], 0
+            for outcome, restock in planned:
+                if chunk and chunk_items + outcome["count"] > RESTOCK_BATCH_ITEMS:
+                    chunks.append(chunk)
+                    chunk, chunk_items = [], 0
+                chunk.append((outcome, restock))
+                chunk_items += outcome["count"]
+            if chunk:
+                chunks.append(chunk)
+
+            for chunk in chunks:
+                results = self.db.restock_many([restock for _, restock in chunk])
+                if len(results) == len(chunk):
+                    for (outcome, _), result in zip(chunk, results):
+                        outcome["count"] = len(result["items"])
+                        outcome["message"] = f"Added {outcome['count']} item(s)"
+                        created += outcome["count"]
+                elif self.journal is not None and self.journal.count():
+                    offline = True
+                    for outcome, _ in chunk:
+                        outcome["message"] = f"Saved offline ({outcome['count']} item(s))"
+                else:
+                    for outcome, _ in chunk:
+                        outcome["ok"] = False
+                        outcome["message"] = "Database error, nothing added"
+
+            elapsed = time.perf_counter() - start
+            self.after(0, lambda: self._show_bulk_restock_report(outcomes, created, elapsed, offline))
+
+        threading.Thread(target=QUERY_AUDIT.bind(restock_thread), daemon=True).start()
+
+    def _show_bulk_restock_report(self, outcomes: List[Dict], created: int, elapsed: float, offline: bool):
+        """
+        Show the result of a bulk restock: a throughput summary and one line per CSV row.
+
+        Args:
+            outcomes: Per-row outcomes from plan_bulk_restock(), updated by the commit
+            created: Number of items created
+            elapsed: Seconds spent writing to the database
+            offline: True if some rows were saved to the offline journal
+        """
+        failed = [o for o in outcomes if not o["ok"]]
+        restocked = len(outcomes) - len(failed)
+        summary = f"Rows restocked: {restocked} of {len(outcomes)}\nItems created: {created}"
+        if created and elapsed > 0:
+            summary += f" in {elapsed:.2f}s ({created / elapsed:,.0f} items/s)"
+        if offline:
+            summary += "\nSome rows were saved offline and will run when the connection returns."
+
+        popup = ctk.CTkToplevel(self)
+        popup.title("Restock Report")
+        popup.geometry("620x520")
+        popup.configure(bg=self.colors["bg_primary"])
+        popup.transient(self)
+        popup.grab_set()
+
+        main_frame = ctk.CTkFrame(
+            popup,
+            fg_color=self.colors["bg_secondary"],
+            corner_radius=12,
+            border_width=1,
+            border_color=self.colors["border"]
+        )
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        label = ctk.CTkLabel(
+            main_frame,
+            text=summary,
+            font=ctk.CTkFont(size=14),
+            text_color=self.colors["status_damaged"] if failed and not restocked else self.colors["status_available"],
+            wraplength=540,
+            justify="left"
+        )
+        label.pack(pady=(24, 12), padx=24, anchor="w")
+
+        report = ctk.CTkTextbox(
+            main_frame,
+            font=ctk.CTkFont(family="Courier", size=12),
+            fg_color=self.colors["bg_primary"],
+            border_color=self.colors["border"],
+            text_color=self.colors["text_primary"]
+        )
+        report.pack(fill="both", expand=True, padx=24, pady=(0, 12))
+        report.insert("1.0", "\n".join(
+            f"Row {o['row']:>5}  {'OK  ' if o['ok'] else 'FAIL'}  {o['component'][:28]:<28}  {o['message']}"
+            for o in outcomes
+        ))
+        report.configure(state="disabled")
+
+        btn = ctk.CTkButton(
+            main_frame,
+            text="OK",
+            command=lambda: self._close_import_success(popup),
+            fg_color=self.colors["status_available"],
+            hover_color="#16a34a",
+            height=40,
+            corner_radius=8,
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        btn.pack(pady=(0, 24))
+
     def _close_import_success(self, popup):
         """Close import success popup and refresh inventory view."""
         popup.destroy()
         # Refresh the inventory view to show new items
-        self._switch_view("inventory")
+        self._switch_view("inventory", refresh=True)
     
     def _show_add_component_form(self):
         """
@@ -3327,8 +6909,7 @@ class LabApp(ctk.CTk):
         inventory_id = self.db.create_inventory(inventory_data)
         
         if inventory_id:
-            # PERFORMANCE: Invalidate cache after data mutation
-            self._invalidate_cache(["inventory"])
+            # PERFORMANCE: The InventoryChanged event already added it to the cache
             
             # Success
             success_popup = ctk.CTkToplevel(self)
@@ -3375,7 +6956,7 @@ class LabApp(ctk.CTk):
         success_popup.destroy()
         form_popup.destroy()
         # Refresh the inventory view to show new component
-        self._switch_view("inventory")
+        self._switch_view("inventory", refresh=True)
     
     def _show_restock_popup(self, inventory_id: int, component_name: str):
         """
@@ -3534,16 +7115,24 @@ class LabApp(ctk.CTk):
                         return
                     
                     # Check for duplicates
-                    if len(manual_serials) != len(set(manual_serials)):
+                    if len({serial.upper() for serial in manual_serials}) != len(manual_serials):
                         self._show_error("Duplicate serial numbers found. Each serial must be unique.", "Validation Error")
                         return
+                    
+                    # PERFORMANCE: Reject serials already in use before any network write
+                    # (Bloom filter over the cached items, no query)
+                    in_use = self._get_serial_filter().find_existing(manual_serials)
+                    if in_use:
+                        shown = ", ".join(in_use[:10]) + (f" (+{len(in_use) - 10} more)" if len(in_use) > 10 else "")
+                        self._show_error(f"These serial numbers are already in use:\n{shown}", "Validation Error")
+                        return
                 
                 # Call restock method
                 result = self.db.restock_inventory(inventory_id, quantity, manual_serials)
                 
                 if result:
-                    # PERFORMANCE: Invalidate cache after data mutation
-                    self._invalidate_cache(["inventory", "items"])
+                    # PERFORMANCE: ItemsAdded/InventoryChanged events already patched the
+                    # cache and the component's row in the inventory table
                     
                     # Success popup
                     success_popup = ctk.CTkToplevel(self)
@@ -3605,8 +7194,7 @@ class LabApp(ctk.CTk):
         """Close success popup and form, then refresh inventory view."""
         success_popup.destroy()
         form_popup.destroy()
-        # Refresh the inventory view to show updated quantities
-        self._switch_view("inventory")
+        # The restocked row was already updated in place by the change events
     
     def _load_students(self):
         """Load students into dropdown - uses cache for performance."""
@@ -3702,7 +7290,7 @@ class LabApp(ctk.CTk):
         except Exception as e:
             # Widget might have been destroyed during update
             # This is safe to ignore - widget will be recreated on next view switch
-            print(f"Warning: Could not update global staff dropdown: {e}")
+            ui_log.warning("Could not update global staff dropdown: %s", e)
     
     def _on_issuer_changed(self, value: str):
         """Handle global issuer selection change."""
@@ -3755,24 +7343,23 @@ class LabApp(ctk.CTk):
             try:
                 # Reinitialize database manager with current credentials
                 # This will reconnect if Supabase is available
-                db = DatabaseManager(supabase_url, supabase_key)
+                db = DatabaseManager(supabase_url, supabase_key, event_bus=self.event_bus,
+                                     journal=self.journal)
                 
                 # Fetch all data (this is the slow network operation)
-                inventory_data = db.get_all_inventory()
-                items_data = db.get_all_items()
-                students_data = db.get_all_students()
-                staff_data = db.get_all_staff()
-                
+                # PERFORMANCE: Tables are fetched in parallel over one HTTP/2 connection
+                tables = db.fetch_all_tables()
+
                 # Update cache on main thread (thread-safe)
                 self.after(0, lambda: self._update_cache_and_ui(
-                    db, inventory_data, items_data, students_data, staff_data
+                    db, tables["inventory"], tables["items"], tables["students"], tables["staff"]
                 ))
             except Exception as e:
                 # Handle errors on main thread
                 self.after(0, lambda: self._handle_sync_error(str(e)))
         
         # Start background thread
-        thread = threading.Thread(target=sync_thread, daemon=True)
+        thread = threading.Thread(target=QUERY_AUDIT.bind(sync_thread), daemon=True)
         thread.start()
     
     def _set_sync_loading(self, loading: bool):
@@ -3787,7 +7374,18 @@ class LabApp(ctk.CTk):
             self.sync_status_label.configure(text="Syncing from Supabase...")
         else:
             self.sync_btn.configure(text="🔄 Sync", state="normal")
-            self.sync_status_label.configure(text="")
+            self._show_journal_status()
+
+    def _show_journal_status(self):
+        """Show how many offline writes are still waiting to reach Supabase."""
+        if not hasattr(self, "sync_status_label"):
+            return
+        pending = self.journal.count() if self.journal is not None else 0
+        failed = self.journal.failed_count() if self.journal is not None else 0
+        text = f"{pending} change(s) saved offline" if pending else ""
+        if failed:
+            text = f"{text}  ⚠ {failed} rejected" if text else f"⚠ {failed} offline change(s) rejected"
+        self.sync_status_label.configure(text=text)
     
     def _update_cache_and_ui(self, db, inventory_data, items_data, students_data, staff_data):
         """
@@ -3809,10 +7407,12 @@ class LabApp(ctk.CTk):
             # Update cache (thread-safe with lock)
             with self.cache_lock:
                 self.cache["inventory"] = inventory_data
-                self.cache["items"] = items_data
+                self.cache["items"] = ItemStore(items_data)
                 self.cache["students"] = students_data
                 self.cache["staff"] = staff_data
                 self.cache["cache_timestamp"] = datetime.now()
+            self._data_version += 1
+            self._attach_journal()  # Replay into the fresh cache
             
             # Reload global staff dropdown (with safety check and delay)
             # Use a small delay to ensure widget operations complete
@@ -3831,14 +7431,12 @@ class LabApp(ctk.CTk):
                     else:
                         self._show_error("Not connected to Supabase. Using mock data.", "Sync Warning")
                 except Exception as e:
-                    print(f"Warning: Could not show success message: {e}")
+                    ui_log.warning("Could not show success message: %s", e)
             
             self.after(150, show_success)
             
         except Exception as e:
-            import traceback
-            print(f"Error in _update_cache_and_ui: {e}")
-            traceback.print_exc()
+            ui_log.exception("Error in _update_cache_and_ui: %s", e)
             self._show_error(f"Error updating UI after sync: {str(e)}", "Sync Error")
         finally:
             # Reset loading state
@@ -3854,7 +7452,7 @@ class LabApp(ctk.CTk):
         try:
             self._load_global_staff()
         except Exception as e:
-            print(f"Warning: Could not update global staff dropdown: {e}")
+            ui_log.warning("Could not update global staff dropdown: %s", e)
     
     def _safe_refresh_view(self, view_name: str):
         """
@@ -3867,16 +7465,14 @@ class LabApp(ctk.CTk):
             view_name: The view to refresh
         """
         try:
-            # Check if content frame exists
-            if not hasattr(self, 'content_frame') or not self.content_frame.winfo_exists():
+            # Check if content area exists
+            if not hasattr(self, 'content_area') or not self.content_area.winfo_exists():
                 return
             
             # Refresh the view
-            self._switch_view(view_name)
+            self._switch_view(view_name, refresh=True)
         except Exception as e:
-            import traceback
-            print(f"Error refreshing view {view_name}: {e}")
-            traceback.print_exc()
+            ui_log.exception("Error refreshing view %s: %s", view_name, e)
             # Try to show error without crashing
             try:
                 self._show_error(f"Error refreshing view: {str(e)}", "View Error")
@@ -3898,29 +7494,37 @@ class LabApp(ctk.CTk):
         def populate_thread():
             """Background thread to populate initial cache."""
             try:
-                inventory_data = self.db.get_all_inventory()
-                items_data = self.db.get_all_items()
-                students_data = self.db.get_all_students()
-                staff_data = self.db.get_all_staff()
-                
+                tables = self.db.fetch_all_tables()
+
                 # Update cache on main thread
                 self.after(0, lambda: self._update_cache_silent(
-                    inventory_data, items_data, students_data, staff_data
+                    tables["inventory"], tables["items"], tables["students"], tables["staff"]
                 ))
             except Exception as e:
-                print(f"Error populating cache: {e}")
+                ui_log.error("Error populating cache: %s", e)
         
-        thread = threading.Thread(target=populate_thread, daemon=True)
+        thread = threading.Thread(target=QUERY_AUDIT.bind(populate_thread), daemon=True)
         thread.start()
     
     def _update_cache_silent(self, inventory_data, items_data, students_data, staff_data):
-        """Update cache without refreshing UI (for initial population)."""
+        """
+        Update cache without refreshing UI (for initial population).
+
+        Entries a view already loaded in the meantime (from the same coalesced
+        request) are kept, so they are not rebuilt and any events applied to
+        them are not lost.
+        """
         with self.cache_lock:
-            self.cache["inventory"] = inventory_data
-            self.cache["items"] = items_data
-            self.cache["students"] = students_data
-            self.cache["staff"] = staff_data
+            if not self.cache["inventory"]:
+                self.cache["inventory"] = inventory_data
+            if not self.cache["items"]:
+                self.cache["items"] = ItemStore(items_data)
+            if not self.cache["students"]:
+                self.cache["students"] = students_data
+            if not self.cache["staff"]:
+                self.cache["staff"] = staff_data
             self.cache["cache_timestamp"] = datetime.now()
+        self._data_version += 1
     
     def _invalidate_cache(self, cache_keys: Optional[List[str]] = None):
         """
@@ -3929,6 +7533,7 @@ class LabApp(ctk.CTk):
         Args:
             cache_keys: List of cache keys to invalidate. If None, clears all cache.
         """
+        self._data_version += 1
         with self.cache_lock:
             if cache_keys is None:
                 # Clear all cache
@@ -3942,6 +7547,392 @@ class LabApp(ctk.CTk):
                     if key in self.cache:
                         self.cache[key] = []
     
+    def _on_data_changed(self, event):
+        """
+        Handle a change event published by DatabaseManager.
+
+        The cache patch and the row-level UI refresh both run on the Tk
+        thread. Events are also published by the write-behind worker, journal
+        replay and sync threads, and patching the shared ItemStore from there
+        would race with the main thread reading it (filters, column copies,
+        RowRenderer batches, ItemMetrics). Those events are handed over with
+        after(0). Events published on the Tk thread itself are applied
+        immediately, so a write is visible to the code that follows it.
+
+        Args:
+            event: One of the change event types (ItemStatusChanged, ItemsAdded, ...)
+        """
+        if threading.current_thread() is threading.main_thread():
+            self._apply_data_change(event)
+        else:
+            self.after(0, lambda: self._apply_data_change(event))
+
+    def _apply_data_change(self, event):
+        """Patch the cache and refresh the affected rows for one change event (Tk thread)."""
+        self._patch_cache(event)
+        self._refresh_changed_rows(event)
+
+    def _patch_cache(self, event):
+        """
+        Apply a change event to the cached records it affects.
+
+        Records that cannot be patched (e.g. the cache still holds a plain list,
+        or only part of a new record is known) fall back to invalidating that
+        one cache key, which is refetched on next access.
+
+        Args:
+            event: Change event
+        """
+        if not isinstance(event, JournalChanged):
+            self._data_version += 1  # Marks the hidden views dirty
+
+        with self.cache_lock:
+            items = self.cache["items"]
+            if isinstance(event, ItemStatusChanged):
+                index = items.index_of(event.item_id) if isinstance(items, ItemStore) else None
+                if index is not None:
+                    items.set_status(index, event.status)
+                elif items:
+                    self.cache["items"] = []
+
+            elif isinstance(event, ItemsAdded):
+                if isinstance(items, ItemStore):
+                    new_items = [item for item in event.items if items.index_of(item["id"]) is None]
+                    items.extend(new_items)
+                elif items:
+                    self.cache["items"] = []
+
+            elif isinstance(event, InventoryChanged):
+                inventory_list = self.cache["inventory"]
+                if inventory_list:
+                    record = next((inv for inv in inventory_list if inv["id"] == event.inventory["id"]), None)
+                    if record is None and "name" in event.inventory:
+                        self.cache["inventory"] = inventory_list + [dict(event.inventory)]
+                    elif record is None:
+                        self.cache["inventory"] = []
+                    elif record is not event.inventory:
+                        record.update(event.inventory)
+
+            elif isinstance(event, StudentAdded):
+                students = self.cache["students"]
+                if students and not any(s["id"] == event.student["id"] for s in students):
+                    self.cache["students"] = students + [event.student]
+
+            elif isinstance(event, StudentRemoved):
+                students = self.cache["students"]
+                if students:
+                    self.cache["students"] = [s for s in students if s["id"] != event.student_id]
+
+    def _refresh_changed_rows(self, event):
+        """
+        Redraw only the visible rows affected by a change event (main thread).
+
+        Args:
+            event: Change event
+        """
+        if isinstance(event, ItemStatusChanged):
+            self._refresh_catalog_row(event.item_id)
+            with self.cache_lock:
+                items = self.cache["items"]
+            item = items.get_by_id(event.item_id) if isinstance(items, ItemStore) else None
+            if item is not None:
+                self._refresh_inventory_row(item["inventory_id"])
+        elif isinstance(event, ItemsAdded):
+            self._refresh_inventory_row(event.inventory_id)
+        elif isinstance(event, InventoryChanged):
+            self._refresh_inventory_row(event.inventory["id"])
+        elif isinstance(event, JournalChanged) and not self._syncing:
+            self._show_journal_status()
+
+    def _refresh_catalog_row(self, item_id: int):
+        """Rebuild one catalog row in place (or drop it if it no longer matches the status filter)."""
+        old_row = self._catalog_rows.get(item_id)
+        if old_row is None or not old_row.winfo_exists():
+            return
+
+        with self.cache_lock:
+            items = self.cache["items"]
+        item = items.get_by_id(item_id) if isinstance(items, ItemStore) else None
+        status_filter = getattr(self, "catalog_filter_status", "All")
+
+        if item is None or (status_filter != "All" and item.get("status") != status_filter):
+            old_row.destroy()
+            del self._catalog_rows[item_id]
+            return
+
+        new_row = self._create_catalog_table_row(item, self._catalog_student_lookup)
+        new_row.pack_configure(before=old_row)
+        old_row.destroy()
+        self._catalog_rows[item_id] = new_row
+
+    def _refresh_inventory_row(self, inventory_id: Optional[int]):
+        """Update the quantity labels of one visible inventory row."""
+        labels = self._inventory_row_labels.get(inventory_id)
+        if not labels or not labels[0].winfo_exists():
+            return
+
+        total_label, avail_label, issued_label, damaged_label = labels
+        inventory = self._get_inventory_lookup().get(inventory_id, {})
+        stats = self._get_item_metrics().inventory_status_counts(inventory_id)
+
+        total_label.configure(text=str(inventory.get("total_qty", 0)))
+        avail_label.configure(text=str(stats["Available"]))
+        issued_label.configure(text=str(stats["Issued"]))
+        damaged_label.configure(text=str(stats["Damaged"]))
+
+    def _apply_optimistic_status(self, item_ids: List[int], status: str) -> Dict[int, Optional[str]]:
+        """
+        Show new item statuses immediately, before the server confirms them.
+
+        Args:
+            item_ids: Items to update
+            status: Status to show
+
+        Returns:
+            Dictionary of item ID to previous cached status (for rollback)
+        """
+        with self.cache_lock:
+            items = self.cache["items"]
+
+        previous = {}
+        for item_id in item_ids:
+            row = items.get_by_id(item_id) if isinstance(items, ItemStore) else None
+            previous[item_id] = row["status"] if row is not None else None
+            self._optimistic_items[item_id] = status
+
+            event = ItemStatusChanged(item_id, status)
+            self._patch_cache(event)
+            self._refresh_changed_rows(event)
+        return previous
+
+    def _settle_optimistic_write(self, success: bool, previous: Dict[int, Optional[str]],
+                                 status: str, description: str, result=None):
+        """
+        Reconcile an optimistic change once its queued write finished (main thread).
+
+        On success the server state now matches the screen. On failure the items
+        are rolled back to their previous statuses and the operator is told.
+
+        Args:
+            success: Whether the write succeeded
+            previous: Item ID to status before the optimistic change
+            status: The optimistic status that was shown
+            description: What the write was, for the error message
+            result: The write's result (an ItemsUnavailableError if an issue lost a race)
+        """
+        for item_id in previous:
+            # A newer optimistic change for the same item stays in place
+            if self._optimistic_items.get(item_id) == status:
+                del self._optimistic_items[item_id]
+
+        if success:
+            return
+
+        lost = result.unavailable if isinstance(result, ItemsUnavailableError) else {}
+        for item_id, old_status in previous.items():
+            # Items another station took already have their server status in the cache
+            if old_status is None or item_id in lost:
+                continue
+            event = ItemStatusChanged(item_id, old_status)
+            self._patch_cache(event)
+            self._refresh_changed_rows(event)
+
+        # Bring back loans that were removed from the Returns list
+        selected_student = getattr(self, "selected_return_student", None)
+        if self.current_view == "returns" and selected_student:
+            self._load_active_loans(selected_student["id"])
+
+        if lost:
+            self._show_error(
+                f"Could not save {description}:\n{self._describe_unavailable(lost)}\n\n"
+                f"No items were issued. Please scan the remaining items again.",
+                "Already Issued"
+            )
+            return
+
+        self._show_error(
+            f"Could not save {description} to the database.\n\n"
+            f"The change has been rolled back. Please check the connection and try again.",
+            "Save Failed"
+        )
+
+    def _issue_optimistic(self, student: Dict, item_ids: List[int], **transaction_kwargs):
+        """
+        Issue items optimistically: mark them Issued now, create the transaction in the background.
+
+        Args:
+            student: Selected student record
+            item_ids: Items in the cart
+            **transaction_kwargs: issuer_id, custom_issue_date, expected_return_date
+        """
+        previous = self._apply_optimistic_status(item_ids, "Issued")
+        description = f"the issue of {len(item_ids)} item(s) to {student.get('name', 'the student')}"
+
+        self.write_queue.submit(PendingWrite(
+            kind="issue",
+            payload={"student_id": student["id"], "item_ids": list(item_ids), **transaction_kwargs},
+            callback=lambda success, result: self.after(
+                0, lambda: self._settle_optimistic_write(success, previous, "Issued", description, result)
+            )
+        ))
+
+    def _close_loan_optimistic(self, loan: Dict, status: str, loan_frame=None):
+        """
+        Return or report damaged optimistically: update the item and the loans list now.
+
+        Args:
+            loan: Loan dictionary (item fields plus transaction_id)
+            status: "Available" for a return, "Damaged" for a damage report
+            loan_frame: The loan's row in the Returns list
+        """
+        item_id = loan["id"]
+        previous = self._apply_optimistic_status([item_id], status)
+        action = "return" if status == "Available" else "damage report"
+        description = f"the {action} of {loan.get('serial_number', 'N/A')}"
+
+        self.write_queue.submit(PendingWrite(
+            kind="close",
+            payload={"item_id": item_id, "transaction_id": loan["transaction_id"], "status": status},
+            callback=lambda success, result: self.after(
+                0, lambda: self._settle_optimistic_write(success, previous, status, description)
+            ),
+            key=("close", item_id)
+        ))
+
+        # Remove the row instead of re-querying the student's loans
+        if loan_frame is not None and loan_frame.winfo_exists():
+            loan_frame.destroy()
+            if not self.returns_loans_list.winfo_children():
+                no_loans = ctk.CTkLabel(
+                    self.returns_loans_list,
+                    text="No active loans for this student.",
+                    font=ctk.CTkFont(size=14),
+                    text_color=self.colors["text_secondary"]
+                )
+                no_loans.pack(pady=30)
+
+    def _describe_unavailable(self, unavailable: Dict[int, Optional[str]]) -> str:
+        """Serial numbers of items that lost an issue race, for error messages."""
+        items = self._get_cached_items()
+        serials = []
+        for item_id in sorted(unavailable):
+            row = items.get_by_id(item_id)
+            serial = row["serial_number"] if row is not None else f"item #{item_id}"
+            serials.append(f"{serial} was just issued at another station" if unavailable[item_id]
+                           else f"{serial} no longer exists")
+        return "\n".join(serials)
+
+    def _on_close(self):
+        """Let queued writes finish before the window closes."""
+        # Stop the watchdog first: waiting for the queue blocks the loop on purpose
+        if self.stall_watchdog:
+            self.stall_watchdog.stop()
+            for stall in self.stall_watchdog.stall_summary():
+                ui_log.info("Worst stall this session: %.0f ms in %s", stall["duration_ms"], stall["method"])
+        if self.write_queue.pending_count():
+            self.write_queue.drain(timeout=10.0)
+        self.destroy()
+
+    def _get_inventory_lookup(self) -> Dict[int, Dict]:
+        """
+        Get the cached inventory table as an id-keyed dictionary.
+
+        PERFORMANCE: Items are fetched without embedded inventory, so every view
+        joins item["inventory_id"] against this dictionary to find the component
+        name and course. One O(1) dict lookup replaces a scan of the inventory
+        list per item, and each name/course string is stored only once.
+
+        Returns:
+            Dictionary mapping inventory ID to inventory record
+        """
+        with self.cache_lock:
+            inventory_list = self.cache["inventory"]
+
+        if not inventory_list:
+            inventory_list = self.db.get_all_inventory()
+            with self.cache_lock:
+                self.cache["inventory"] = inventory_list
+
+        # Rebuild only when the cached list was replaced or grew (mock data appends in place)
+        if (self._inventory_lookup_source is not inventory_list
+                or self._inventory_lookup_size != len(inventory_list)):
+            self._inventory_lookup = {inv["id"]: inv for inv in inventory_list}
+            self._inventory_lookup_source = inventory_list
+            self._inventory_lookup_size = len(inventory_list)
+
+        return self._inventory_lookup
+
+    def _get_cached_items(self) -> ItemStore:
+        """
+        Get the cached items table as a compact ItemStore, fetching it if empty.
+
+        Returns:
+            ItemStore (iterates as dictionary-like ItemRow proxies)
+        """
+        with self.cache_lock:
+            items = self.cache["items"]
+
+        if not items:
+            items = self.db.get_all_items()
+
+        if not isinstance(items, ItemStore):
+            items = ItemStore(items)
+            with self.cache_lock:
+                self.cache["items"] = items
+
+        return items
+
+    def _get_serial_filter(self) -> SerialFilter:
+        """
+        Get the serial-existence filter, updated with any items added since the last check.
+
+        Returns:
+            SerialFilter supporting `serial in filter` (case-insensitive)
+        """
+        self._serial_filter.sync_from(self._get_cached_items())
+        return self._serial_filter
+
+    def _get_item_metrics(self) -> ItemMetrics:
+        """
+        Get the metrics engine for the cached items.
+
+        Counts are recomputed only after the ItemStore changes, so switching
+        back to the dashboard or inventory view reuses them.
+
+        Returns:
+            ItemMetrics bound to the current cached ItemStore
+        """
+        items = self._get_cached_items()
+        if self._item_metrics is None or self._item_metrics.store is not items:
+            self._item_metrics = ItemMetrics(items)
+        return self._item_metrics
+
+    def _resolve_inventory(self, item: Dict, inventory_lookup: Optional[Dict[int, Dict]] = None) -> Tuple[str, str]:
+        """
+        Resolve the component name and course for an item.
+
+        Uses the embedded inventory record when a query returned one (e.g. serial
+        lookups), otherwise joins inventory_id against the cached inventory table.
+
+        Args:
+            item: Item dictionary
+            inventory_lookup: Optional pre-fetched lookup (pass it when resolving many items)
+
+        Returns:
+            Tuple of (component name, course), with "Unknown"/"N/A" fallbacks
+        """
+        inventory = item.get("inventory")
+        if not inventory:
+            if inventory_lookup is None:
+                inventory_lookup = self._get_inventory_lookup()
+            inventory = inventory_lookup.get(item.get("inventory_id"))
+
+        if not inventory:
+            return "Unknown", "N/A"
+
+        course_val = inventory.get("course")
+        return inventory.get("name", "Unknown"), str(course_val) if course_val else "N/A"
+
     def _add_to_cart(self):
         """
         Add item to cart based on user input.
@@ -3963,7 +7954,19 @@ class LabApp(ctk.CTk):
         
         # Strategy: Try serial number lookup first (more specific)
         # This is faster and more accurate than component name search
-        item = self.db.get_item_by_serial(input_text)
+        # PERFORMANCE: Resolved from the cached ItemStore, not one query per scan.
+        # A stale status is safe: create_transaction() claims the items atomically
+        # and reports any that another station issued first.
+        items = self._get_cached_items()
+        if len(items):
+            row = items.find_serial(input_text)
+            item = row.copy() if row is not None else None
+        else:
+            item = self.db.get_item_by_serial(input_text)
+        
+        # Show statuses that are saved optimistically but not yet on the server
+        if item and item.get("id") in self._optimistic_items:
+            item = {**item, "status": self._optimistic_items[item["id"]]}
         
         if item:
             # Found by serial number → Handle based on item status
@@ -4007,7 +8010,10 @@ class LabApp(ctk.CTk):
     
     def _handle_component_name(self, component_name: str):
         """Handle when user enters a component name."""
-        available_items = self.db.get_available_items_by_name(component_name)
+        available_items = [
+            item for item in self.db.get_available_items_by_name(component_name)
+            if self._optimistic_items.get(item.get("id"), "Available") == "Available"
+        ]
         
         if not available_items:
             self._show_error(f"No available items found for '{component_name}'.", "Not Found")
@@ -4156,27 +8162,9 @@ class LabApp(ctk.CTk):
             )
             item_frame.pack(fill="x", pady=6, padx=0)
             
-            # Get inventory name
-            inventory_name = "Unknown"
-            if "inventory" in item and item["inventory"]:
-                inventory_name = item["inventory"].get("name", "Unknown")
-            elif "inventory_id" in item:
-                # PERFORMANCE: Use cache for inventory lookup
-                with self.cache_lock:
-                    cached_inventory = self.cache["inventory"]
-                
-                if cached_inventory:
-                    inv_list = cached_inventory
-                else:
-                    inv_list = self.db.get_all_inventory()
-                    with self.cache_lock:
-                        self.cache["inventory"] = inv_list
-                
-                for inv in inv_list:
-                    if inv["id"] == item["inventory_id"]:
-                        inventory_name = inv["name"]
-                        break
-            
+            # Get inventory name (embedded record or client-side join on inventory_id)
+            inventory_name, _ = self._resolve_inventory(item)
+
             info_text = f"{inventory_name} - {item['serial_number']}"
             info_label = ctk.CTkLabel(
                 item_frame,
@@ -4291,58 +8279,85 @@ class LabApp(ctk.CTk):
         
         # Create transaction with issuer_id and custom dates (already validated above)
         item_ids = [item["id"] for item in self.cart_items]
-        transaction_id = self.db.create_transaction(
-            selected_student["id"], 
-            item_ids, 
-            issuer_id=issuer_id,
-            custom_issue_date=custom_issue_date,
-            expected_return_date=expected_return_date
-        )
-        
-        if transaction_id:
-            # PERFORMANCE: Invalidate cache after data mutation
-            # This ensures next view refresh shows updated data
-            self._invalidate_cache(["items"])  # Items status changed
-            
-            # Success popup with zinc styling
-            success_popup = ctk.CTkToplevel(self)
-            success_popup.title("Success")
-            success_popup.geometry("500x240")
-            success_popup.configure(bg=self.colors["bg_primary"])
-            success_popup.transient(self)
-            success_popup.grab_set()
-            
-            main_frame = ctk.CTkFrame(
-                success_popup,
-                fg_color=self.colors["bg_secondary"],
-                corner_radius=12,
-                border_width=1,
-                border_color=self.colors["border"]
+        
+        if OPTIMISTIC_WRITES:
+            # PERFORMANCE: Mark the items Issued locally and save in the background
+            self._issue_optimistic(
+                selected_student,
+                item_ids,
+                issuer_id=issuer_id,
+                custom_issue_date=custom_issue_date,
+                expected_return_date=expected_return_date
             )
-            main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+            message = f"{len(self.cart_items)} item(s) issued to {selected_student['name']}.\n\nSaving to the database in the background."
+        else:
+            try:
+                transaction_id = self.db.create_transaction(
+                    selected_student["id"], 
+                    item_ids, 
+                    issuer_id=issuer_id,
+                    custom_issue_date=custom_issue_date,
+                    expected_return_date=expected_return_date
+                )
+            except ItemsUnavailableError as e:
+                # Another station won the race: drop those items, keep the rest in the cart
+                self.cart_items = [item for item in self.cart_items if item["id"] not in e.unavailable]
+                self._update_cart_display()
+                self._show_error(
+                    f"{self._describe_unavailable(e.unavailable)}\n\n"
+                    f"Nothing was issued. The item(s) were removed from the cart.",
+                    "Already Issued"
+                )
+                return
             
-            label = ctk.CTkLabel(
-                main_frame,
-                text=f"Transaction #{transaction_id} created successfully!\n\n{len(self.cart_items)} item(s) issued to {selected_student['name']}.",
-                font=ctk.CTkFont(size=14),
-                text_color=self.colors["status_available"],
-                wraplength=430
-            )
-            label.pack(pady=40, padx=30)
+            if not transaction_id:
+                self._show_error("Failed to create transaction. Please try again.", "Error")
+                return
             
-            btn = ctk.CTkButton(
-                main_frame,
-                text="OK",
-                command=lambda: self._close_success_popup(success_popup),
-                fg_color=self.colors["status_available"],
-                hover_color="#16a34a",
-                height=40,
-                corner_radius=8,
-                font=ctk.CTkFont(size=14, weight="bold")
-            )
-            btn.pack(pady=(0, 30))
-        else:
-            self._show_error("Failed to create transaction. Please try again.", "Error")
+            # PERFORMANCE: ItemStatusChanged events already patched the cached items,
+            # so the next view renders the new statuses without a refetch
+            message = f"Transaction #{transaction_id} created successfully!\n\n{len(self.cart_items)} item(s) issued to {selected_student['name']}."
+            if transaction_id < 0:
+                # Journaled while offline (provisional id)
+                message = f"{len(self.cart_items)} item(s) issued to {selected_student['name']}.\n\nSaved offline. It will sync when the connection returns."
+        
+        # Success popup with zinc styling
+        success_popup = ctk.CTkToplevel(self)
+        success_popup.title("Success")
+        success_popup.geometry("500x240")
+        success_popup.configure(bg=self.colors["bg_primary"])
+        success_popup.transient(self)
+        success_popup.grab_set()
+        
+        main_frame = ctk.CTkFrame(
+            success_popup,
+            fg_color=self.colors["bg_secondary"],
+            corner_radius=12,
+            border_width=1,
+            border_color=self.colors["border"]
+        )
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        label = ctk.CTkLabel(
+            main_frame,
+            text=message,
+            font=ctk.CTkFont(size=14),
+            text_color=self.colors["status_available"],
+            wraplength=430
+        )
+        label.pack(pady=40, padx=30)
+        
+        btn = ctk.CTkButton(
+            main_frame,
+            text="OK",
+            command=lambda: self._close_success_popup(success_popup),
+            fg_color=self.colors["status_available"],
+            hover_color="#16a34a",
+            height=40,
+            corner_radius=8,
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        btn.pack(pady=(0, 30))
     
     def _close_success_popup(self, popup):
         """Close success popup and clear cart."""
@@ -4366,7 +8381,6 @@ class LabApp(ctk.CTk):
         # PERFORMANCE: Use cache if available
         with self.cache_lock:
             cached_inventory = self.cache["inventory"]
-            cached_items = self.cache["items"]
         
         if cached_inventory:
             inventory_list = cached_inventory
@@ -4375,12 +8389,7 @@ class LabApp(ctk.CTk):
             with self.cache_lock:
                 self.cache["inventory"] = inventory_list
         
-        if cached_items:
-            items_list = cached_items
-        else:
-            items_list = self.db.get_all_items()
-            with self.cache_lock:
-                self.cache["items"] = items_list
+        metrics = self._get_item_metrics()
         
         if not inventory_list:
             label = ctk.CTkLabel(
@@ -4420,88 +8429,101 @@ class LabApp(ctk.CTk):
         # INVENTORY DATA ROWS (CARD-BASED)
         # ============================================================
         # Each inventory item gets its own card for better visual separation
-        for inv in inventory_list:
-            # Calculate statistics for this inventory item
-            # This loops through all items and counts by status
-            available = sum(1 for item in items_list 
-                          if item.get("inventory_id") == inv["id"] 
-                          and item.get("status") == "Available")
-            issued = sum(1 for item in items_list 
-                        if item.get("inventory_id") == inv["id"] 
-                        and item.get("status") == "Issued")
-            damaged = sum(1 for item in items_list 
-                         if item.get("inventory_id") == inv["id"] 
-                         and item.get("status") == "Damaged")
-            
-            # Data row card: Premium card design
-            row_card = ctk.CTkFrame(
-                parent, 
-                corner_radius=12,
-                fg_color=self.colors["bg_secondary"],
-                border_width=1,
-                border_color=self.colors["border"]
-            )
-            row_card.pack(fill="x", pady=8, padx=0)
-            
-            # Component name
-            name_label = ctk.CTkLabel(
-                row_card, 
-                text=inv["name"], 
-                font=ctk.CTkFont(size=15),
-                text_color=self.colors["text_primary"]
-            )
-            name_label.grid(row=0, column=0, padx=30, pady=20, sticky="w")
-            
-            # Total quantity
-            total_label = ctk.CTkLabel(
-                row_card, 
-                text=str(inv.get("total_qty", 0)), 
-                font=ctk.CTkFont(size=15),
-                text_color=self.colors["text_primary"]
-            )
-            total_label.grid(row=0, column=1, padx=30, pady=20, sticky="w")
-            
-            # Available count - Status color
-            avail_label = ctk.CTkLabel(
-                row_card, 
-                text=str(available), 
-                font=ctk.CTkFont(size=15), 
-                text_color=self.colors["status_available"]
-            )
-            avail_label.grid(row=0, column=2, padx=30, pady=20, sticky="w")
-            
-            # Issued count
-            issued_label = ctk.CTkLabel(
-                row_card, 
-                text=str(issued), 
-                font=ctk.CTkFont(size=15), 
-                text_color=self.colors["status_issued"]
-            )
-            issued_label.grid(row=0, column=3, padx=30, pady=20, sticky="w")
-            
-            # Damaged count
-            damaged_label = ctk.CTkLabel(
-                row_card, 
-                text=str(damaged), 
-                font=ctk.CTkFont(size=15), 
-                text_color=self.colors["status_damaged"]
-            )
-            damaged_label.grid(row=0, column=4, padx=30, pady=20, sticky="w")
-            
-            # Rapid Restock button (➕) - Power User Feature
-            restock_btn = ctk.CTkButton(
-                row_card,
-                text="➕",
-                width=40,
-                height=35,
-                font=ctk.CTkFont(size=18),
-                fg_color=self.colors["accent"],
-                text_color=self.colors["bg_primary"],
-                hover_color="#e5e5e5",
-                corner_radius=8,
-                command=lambda inv_id=inv["id"], inv_name=inv["name"]: self._show_restock_popup(inv_id, inv_name)
-            )
-            restock_btn.grid(row=0, column=5, padx=30, pady=20, sticky="w")
+        self._inventory_row_labels = {}
+        # PERFORMANCE: Rows are built in time-budgeted batches (see CONFIG ZONE: Row Rendering)
+        self._row_renderer.start(
+            "inventory", inventory_list,
+            lambda inv: self._create_inventory_row(parent, inv, metrics),
+            parent=parent
+        )
+    
+    def _create_inventory_row(self, parent, inv: Dict, metrics: "ItemMetrics"):
+        """
+        Create one inventory row card (name, quantities and the restock button).
+        
+        Args:
+            parent: The frame the rows are packed into
+            inv: Inventory record
+            metrics: Item metrics for the Available/Issued/Damaged counts
+        """
+        # Statistics for this inventory item
+        # PERFORMANCE: Read from the per-component histogram instead of
+        # looping through all items three times per component
+        stats = metrics.inventory_status_counts(inv["id"])
+        available = stats["Available"]
+        issued = stats["Issued"]
+        damaged = stats["Damaged"]
+
+        # Data row card: Premium card design
+        row_card = ctk.CTkFrame(
+            parent, 
+            corner_radius=12,
+            fg_color=self.colors["bg_secondary"],
+            border_width=1,
+            border_color=self.colors["border"]
+        )
+        row_card.pack(fill="x", pady=8, padx=0)
+
+        # Component name
+        name_label = ctk.CTkLabel(
+            row_card, 
+            text=inv["name"], 
+            font=ctk.CTkFont(size=15),
+            text_color=self.colors["text_primary"]
+        )
+        name_label.grid(row=0, column=0, padx=30, pady=20, sticky="w")
+
+        # Total quantity
+        total_label = ctk.CTkLabel(
+            row_card, 
+            text=str(inv.get("total_qty", 0)), 
+            font=ctk.CTkFont(size=15),
+            text_color=self.colors["text_primary"]
+        )
+        total_label.grid(row=0, column=1, padx=30, pady=20, sticky="w")
+
+        # Available count - Status color
+        avail_label = ctk.CTkLabel(
+            row_card, 
+            text=str(available), 
+            font=ctk.CTkFont(size=15), 
+            text_color=self.colors["status_available"]
+        )
+        avail_label.grid(row=0, column=2, padx=30, pady=20, sticky="w")
+
+        # Issued count
+        issued_label = ctk.CTkLabel(
+            row_card, 
+            text=str(issued), 
+            font=ctk.CTkFont(size=15), 
+            text_color=self.colors["status_issued"]
+        )
+        issued_label.grid(row=0, column=3, padx=30, pady=20, sticky="w")
+
+        # Damaged count
+        damaged_label = ctk.CTkLabel(
+            row_card, 
+            text=str(damaged), 
+            font=ctk.CTkFont(size=15), 
+            text_color=self.colors["status_damaged"]
+        )
+        damaged_label.grid(row=0, column=4, padx=30, pady=20, sticky="w")
+        self._inventory_row_labels[inv["id"]] = (total_label, avail_label, issued_label, damaged_label)
+
+        # Rapid Restock button (➕) - Power User Feature
+        restock_btn = ctk.CTkButton(
+            row_card,
+            text="➕",
+            width=40,
+            height=35,
+            font=ctk.CTkFont(size=18),
+            fg_color=self.colors["accent"],
+            text_color=self.colors["bg_primary"],
+            hover_color="#e5e5e5",
+            corner_radius=8,
+            command=lambda inv_id=inv["id"], inv_name=inv["name"]: self._show_restock_popup(inv_id, inv_name)
+        )
+        restock_btn.grid(row=0, column=5, padx=30, pady=20, sticky="w")
     
     def _show_catalog_view(self):
         """
@@ -4637,8 +8659,8 @@ class LabApp(ctk.CTk):
         course_pills_frame = ctk.CTkFrame(filter_container, fg_color="transparent")
         course_pills_frame.pack(anchor="w")
         
-        # Get unique courses from inventory
-        all_inventory = self.db.get_all_inventory()
+        # Get unique courses from the cached inventory table
+        all_inventory = list(self._get_inventory_lookup().values())
         # Filter out None, empty strings, and only include actual course codes
         unique_courses = sorted(set([
             inv.get("course") for inv in all_inventory 
@@ -4834,20 +8856,11 @@ class LabApp(ctk.CTk):
             self.catalog_filter_course = "All"
         
         # PERFORMANCE: Use cache if available for instant rendering
-        with self.cache_lock:
-            cached_items = self.cache["items"]
-        
-        if cached_items:
-            all_items = cached_items
-        else:
-            # Cache miss - fetch from database
-            all_items = self.db.get_all_items()
-            # Update cache for future use
-            with self.cache_lock:
-                self.cache["items"] = all_items
+        all_items = self._get_cached_items()
         
         if not all_items:
             # Clear table body and show message
+            self._row_renderer.cancel("catalog")
             for widget in self.catalog_table_body.winfo_children():
                 widget.destroy()
             empty_label = ctk.CTkLabel(
@@ -4859,102 +8872,56 @@ class LabApp(ctk.CTk):
             empty_label.pack(pady=50)
             return
         
-        # Debug: Print item details
-        print(f"Catalog: Retrieved {len(all_items)} items, status_filter='{self.catalog_filter_status}', course_filter='{self.catalog_filter_course}', search='{search_query}'")
-        
         all_students = self.db.get_all_students()
         
         # Create student lookup dictionary for "Issued To" column
         student_lookup = {s["id"]: s["name"] for s in all_students}
         
+        # Id-keyed inventory for the client-side join (fetched once, not per item)
+        inventory_lookup = self._get_inventory_lookup()
+
         # Filter items
-        filtered_items = []
-        for item in all_items:
-            # Status filter - only apply if not "All"
-            # Use case-insensitive comparison to handle any case variations
-            if self.catalog_filter_status != "All":
-                item_status = str(item.get("status", "")).strip()
-                filter_status = str(self.catalog_filter_status).strip()
-                if item_status != filter_status:
-                    continue
-            
-            # Course filter - only apply if not "All"
-            if self.catalog_filter_course != "All":
-                # Get course from inventory
-                item_course = None
-                inventory = item.get("inventory", {})
-                if isinstance(inventory, dict) and inventory:
-                    item_course = inventory.get("course")
-                else:
-                    # If inventory is not a dict, try to get from inventory_id
-                    inventory_id = item.get("inventory_id")
-                    if inventory_id:
-                        all_inventory = self.db.get_all_inventory()
-                        inv = next((inv for inv in all_inventory if inv["id"] == inventory_id), None)
-                        item_course = inv.get("course") if inv else None
-                
-                # Normalize course values for comparison (handle None, empty strings, "N/A")
-                if item_course:
-                    item_course = str(item_course).strip()
-                    if item_course == "N/A" or not item_course:
-                        item_course = None
-                else:
-                    item_course = None
-                
-                filter_course = str(self.catalog_filter_course).strip()
-                
-                # Skip items that don't match the course filter
-                # If item has no course and filter is for a specific course, skip it
-                if not item_course or item_course != filter_course:
-                    continue
-            
-            # Search filter - only apply if there's a search query
-            if search_query:
-                # Search in serial number
-                serial_number = str(item.get("serial_number", "")).lower()
-                serial_match = search_query in serial_number
-                
-                # Search in component name
-                inventory_name = "Unknown"
-                if "inventory" in item and item["inventory"]:
-                    inventory_name = item["inventory"].get("name", "Unknown")
-                elif "inventory_id" in item:
-                    # PERFORMANCE: Use cache for inventory lookup
-                    with self.cache_lock:
-                        cached_inventory = self.cache["inventory"]
-                    
-                    if cached_inventory:
-                        inv_list = cached_inventory
-                    else:
-                        inv_list = self.db.get_all_inventory()
-                        with self.cache_lock:
-                            self.cache["inventory"] = inv_list
-                    
-                    for inv in inv_list:
-                        if inv["id"] == item["inventory_id"]:
-                            inventory_name = inv["name"]
-                            break
-                
-                name_match = search_query in inventory_name.lower()
-                
-                if not (serial_match or name_match):
-                    continue
-            
-            # Item passed all filters, add to filtered list
-            filtered_items.append(item)
-        
-        print(f"Catalog: Filtered {len(filtered_items)} items from {len(all_items)} total items")
+        # PERFORMANCE: Each filter is translated to a set of inventory IDs or
+        # status codes once, then applied as a vectorized mask over the
+        # ItemStore columns instead of resolving every item in Python.
+        status_filter = None
+        if self.catalog_filter_status != "All":
+            status_filter = str(self.catalog_filter_status).strip()
+
+        # Course filter: components whose course matches (items without a course never match)
+        course_inventory_ids = None
+        if self.catalog_filter_course != "All":
+            filter_course = str(self.catalog_filter_course).strip()
+            course_inventory_ids = [
+                inv_id for inv_id, inv in inventory_lookup.items()
+                if str(inv.get("course") or "").strip() not in ("", "N/A")
+                and str(inv["course"]).strip() == filter_course
+            ]
+
+        # Search filter: serial number substring, or component name substring
+        name_inventory_ids = None
+        if search_query:
+            name_inventory_ids = [
+                inv_id for inv_id, inv in inventory_lookup.items()
+                if search_query in str(inv.get("name", "Unknown")).lower()
+            ]
+
+        filtered_items = all_items.filter(
+            status=status_filter,
+            inventory_ids=course_inventory_ids,
+            text=search_query or None,
+            text_inventory_ids=name_inventory_ids
+        )
         
-        # Clear table body completely
+        # Clear table body completely (and stop a render of the previous filter)
+        self._row_renderer.cancel("catalog")
         for widget in self.catalog_table_body.winfo_children():
             widget.destroy()
-        
-        # Force update to ensure widgets are destroyed
-        self.update_idletasks()
+        self._catalog_rows = {}
+        self._catalog_student_lookup = student_lookup
         
         # Display filtered items or empty state
         if not filtered_items:
-            print(f"Catalog: No items match filters - showing empty state")
             empty_label = ctk.CTkLabel(
                 self.catalog_table_body,
                 text="No items found matching your search criteria.",
@@ -4962,41 +8929,29 @@ class LabApp(ctk.CTk):
                 text_color=self.colors["text_secondary"]
             )
             empty_label.pack(pady=50)
-            self.catalog_table_body.update_idletasks()
             return
         
-        # Display items as table rows - create all rows
-        rows_created = 0
-        print(f"Catalog: Starting to create rows for {len(filtered_items)} filtered items")
-        
-        # Debug: Check table body before creating rows
-        child_count_before = len(self.catalog_table_body.winfo_children())
-        print(f"Catalog: Table body has {child_count_before} widgets before creating rows")
-        
-        for idx, item in enumerate(filtered_items):
-            try:
-                print(f"Catalog: Creating row {idx+1}/{len(filtered_items)} for item ID={item.get('id')}, Serial={item.get('serial_number')}")
-                self._create_catalog_table_row(item, student_lookup)
-                rows_created += 1
-            except Exception as e:
-                print(f"Error creating catalog row for item {item.get('id', 'unknown')}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-        
-        print(f"Catalog: Created {rows_created} rows from {len(filtered_items)} filtered items")
+        # Display items as table rows
+        # PERFORMANCE: The first screenful is built now and the rest in
+        # time-budgeted batches, so typing in the search box stays responsive
+        # while a large catalog renders (see CONFIG ZONE: Row Rendering)
+        # Hot path: logged only with LABTRACK_LOG_HOT_PATH=1 (see CONFIG ZONE: Logging)
+        render_start = time.perf_counter()
         
-        # Force update to ensure all rows are displayed
-        self.catalog_table_body.update_idletasks()
-        self.update_idletasks()
-        
-        # Debug: Check if widgets are actually in the table body
-        child_count_after = len(self.catalog_table_body.winfo_children())
-        print(f"Catalog: Table body now has {child_count_after} child widgets after creating rows (was {child_count_before})")
+        def build_row(item):
+            self._catalog_rows[item["id"]] = self._create_catalog_table_row(item, student_lookup)
         
-        # If no children but we created rows, something is wrong with packing
-        if child_count_after == 0 and rows_created > 0:
-            print(f"Catalog: WARNING - Created {rows_created} rows but table body has no children!")
+        def on_done(rows_created: int):
+            if not hot_log.isEnabledFor(logging.DEBUG):
+                return
+            hot_log.debug("catalog rendered", extra={"fields": {
+                "rows": rows_created, "matched": len(filtered_items), "total": len(all_items),
+                "status": self.catalog_filter_status, "course": self.catalog_filter_course,
+                "search": search_query, "ms": round((time.perf_counter() - render_start) * 1000, 1)
+            }})
+        
+        self._row_renderer.start("catalog", filtered_items, build_row,
+                                 parent=self.catalog_table_body, on_done=on_done)
     
     def _load_catalog_table(self):
         """
@@ -5025,13 +8980,16 @@ class LabApp(ctk.CTk):
         # Load and filter table (will show all items since filter is "All" and search is empty)
         self._filter_catalog_table()
     
-    def _create_catalog_table_row(self, item: Dict, student_lookup: Dict):
+    def _create_catalog_table_row(self, item: Dict, student_lookup: Dict) -> ctk.CTkFrame:
         """
         Create a table row for an item in the catalog.
         
         Args:
             item: Item dictionary from database
             student_lookup: Dictionary mapping student IDs to names
+
+        Returns:
+            The row frame (packed at the end of the table body)
         """
         # Check if item is overdue for highlighting
         is_overdue = item.get("id") in self.overdue_item_ids if item.get("id") else False
@@ -5058,7 +9016,6 @@ class LabApp(ctk.CTk):
             )
         row_frame.pack(fill="x", pady=(0, 1))
         row_frame.pack_propagate(False)  # Keep fixed height to ensure visibility
-        print(f"Catalog: Packed row_frame for item {item.get('serial_number', 'N/A')} into table body")
         
         # Configure grid columns for proper alignment
         row_frame.grid_columnconfigure(0, weight=0, minsize=250)  # Component
@@ -5069,32 +9026,9 @@ class LabApp(ctk.CTk):
         row_frame.grid_rowconfigure(0, weight=1)  # Allow content row to expand
         row_frame.grid_rowconfigure(1, weight=0)  # Border row
         
-        # Get component name and course
-        inventory_name = "Unknown"
-        inventory_course = "N/A"
-        if "inventory" in item and item["inventory"]:
-            inventory_name = item["inventory"].get("name", "Unknown")
-            course_val = item["inventory"].get("course")
-            inventory_course = str(course_val) if course_val else "N/A"
-        elif "inventory_id" in item:
-            # PERFORMANCE: Use cache for inventory lookup
-            with self.cache_lock:
-                cached_inventory = self.cache["inventory"]
-            
-            if cached_inventory:
-                inv_list = cached_inventory
-            else:
-                inv_list = self.db.get_all_inventory()
-                with self.cache_lock:
-                    self.cache["inventory"] = inv_list
-            
-            for inv in inv_list:
-                if inv["id"] == item["inventory_id"]:
-                    inventory_name = inv["name"]
-                    course_val = inv.get("course")
-                    inventory_course = str(course_val) if course_val else "N/A"
-                    break
-        
+        # Get component name and course (client-side join on inventory_id)
+        inventory_name, inventory_course = self._resolve_inventory(item)
+
         # Column 1: Component Name
         # Overdue items shown in red for immediate attention
         component_label = ctk.CTkLabel(
@@ -5179,6 +9113,231 @@ class LabApp(ctk.CTk):
         )
         border.grid(row=1, column=0, columnspan=5, sticky="ew", pady=(0, 0))
         row_frame.grid_rowconfigure(0, weight=1)
+        return row_frame
+    
+    def _toggle_performance_view(self):
+        """Show the hidden Performance sidebar button and open the view (Ctrl+Shift+P)."""
+        if not self.performance_btn.winfo_ismapped():
+            self.performance_btn.pack(pady=4, padx=12, fill="x")
+        self._switch_view("performance")
+    
+    def _show_performance_view(self):
+        """
+        Display the Performance view - timing spans collected by PERF.
+        
+        Shows query cache hit rates, coalesced reads and one row per
+        instrumented operation (calls, errors, avg/p95/max latency, rows
+        returned, response KB, recent latency sparkline), slowest total first. See
+        CONFIG ZONE: Instrumentation.
+        """
+        main_container = ctk.CTkScrollableFrame(
+            self.content_frame,
+            fg_color=self.colors["bg_primary"]
+        )
+        main_container.pack(fill="both", expand=True)
+        
+        # Title row with actions
+        title_row = ctk.CTkFrame(main_container, fg_color="transparent")
+        title_row.pack(fill="x", pady=(0, 30))
+        
+        title = ctk.CTkLabel(
+            title_row,
+            text="Performance",
+            font=ctk.CTkFont(size=36, weight="bold"),
+            text_color=self.colors["text_primary"]
+        )
+        title.pack(side="left")
+        
+        for text, command in (("Export JSONL", self._export_performance_log),
+                              ("Reset", self._reset_performance_stats),
+                              ("Refresh", lambda: self._switch_view("performance", refresh=True))):
+            button = ctk.CTkButton(
+                title_row,
+                text=text,
+                command=command,
+                height=36,
+                width=120,
+                font=ctk.CTkFont(size=13, weight="bold"),
+                fg_color="transparent",
+                border_width=1,
+                border_color=self.colors["border"],
+                text_color=self.colors["text_primary"],
+                hover_color="#27272a",
+                corner_radius=8
+            )
+            button.pack(side="right", padx=(8, 0))
+        
+        # ============================================================
+        # SUMMARY CARDS - Cache hit rates
+        # ============================================================
+        cache_stats = self.db.query_cache.stats()
+        hits = sum(stat["hits"] for stat in cache_stats.values())
+        misses = sum(stat["misses"] for stat in cache_stats.values())
+        coalesced = PERF.counters("coalesced.")
+        executed, shared = coalesced.get("executed", 0), coalesced.get("shared", 0)
+        received = PERF.counters("http.").get("bytes", 0)
+        operations = PERF.snapshot()
+        
+        cards_frame = ctk.CTkFrame(main_container, fg_color="transparent")
+        cards_frame.pack(fill="x", pady=(0, 20))
+        cards = [
+            ("Spans Recorded", str(sum(op["count"] for op in operations))),
+            ("Query Cache Hit Rate", f"{hits / max(1, hits + misses) * 100:.0f}%  ({hits}/{hits + misses})"),
+            ("Coalesced Reads", f"{shared} shared / {executed} sent"),
+            ("Data Received", f"{received / 1e6:.2f} MB"),
+        ]
+        for i, (label_text, value_text) in enumerate(cards):
+            cards_frame.grid_columnconfigure(i, weight=1)
+            card = ctk.CTkFrame(
+                cards_frame,
+                corner_radius=12,
+                fg_color=self.colors["bg_secondary"],
+                border_width=1,
+                border_color=self.colors["border"]
+            )
+            card.grid(row=0, column=i, padx=(0 if i == 0 else 8, 0), sticky="ew")
+            ctk.CTkLabel(
+                card,
+                text=label_text.upper(),
+                font=ctk.CTkFont(size=10, weight="bold"),
+                text_color=self.colors["text_secondary"]
+            ).pack(anchor="w", padx=20, pady=(16, 4))
+            ctk.CTkLabel(
+                card,
+                text=value_text,
+                font=ctk.CTkFont(size=20, weight="bold"),
+                text_color=self.colors["text_primary"]
+            ).pack(anchor="w", padx=20, pady=(0, 16))
+        
+        # Per-method cache hit rates
+        cache_text = "   ".join(
+            f"{name}: {stat['hit_rate'] * 100:.0f}% of {stat['hits'] + stat['misses']}"
+            for name, stat in cache_stats.items()
+        )
+        ctk.CTkLabel(
+            main_container,
+            text=cache_text,
+            font=ctk.CTkFont(size=12),
+            text_color=self.colors["text_secondary"],
+            anchor="w"
+        ).pack(fill="x", pady=(0, 20))
+        
+        # Worst main-loop stalls this session (see CONFIG ZONE: Stall Watchdog)
+        if self.stall_watchdog:
+            stalls = self.stall_watchdog.stall_summary()
+            lines = [
+                f"{stall['duration_ms']:.0f} ms  in {stall['method']}  at {datetime.fromtimestamp(stall['ts']):%H:%M:%S}"
+                for stall in stalls
+            ] or [f"No stalls over {STALL_THRESHOLD_MS} ms so far."]
+            ctk.CTkLabel(
+                main_container,
+                text=(f"WORST STALLS ({self.stall_watchdog.stall_count} total, "
+                      f"max heartbeat lag {self.stall_watchdog.max_lag_ms:.0f} ms)\n" + "\n".join(lines)),
+                font=ctk.CTkFont(size=12),
+                text_color=self.colors["status_issued"] if stalls else self.colors["text_secondary"],
+                anchor="w",
+                justify="left"
+            ).pack(fill="x", pady=(0, 20))
+        
+        # N+1 suspects from the query audit (LABTRACK_QUERY_AUDIT=1)
+        if QUERY_AUDIT.enabled:
+            suspects = QUERY_AUDIT.suspects()[-10:]
+            lines = [
+                f"{r['count']}x {r['shape']}  during {r['action']}  from {', '.join(str(c or '-') for c in r['callers'])}"
+                for r in reversed(suspects)
+            ] or ["No N+1 suspects so far."]
+            ctk.CTkLabel(
+                main_container,
+                text="N+1 SUSPECTS (QUERY AUDIT)\n" + "\n".join(lines),
+                font=ctk.CTkFont(size=12),
+                text_color=self.colors["status_damaged"] if suspects else self.colors["text_secondary"],
+                anchor="w",
+                justify="left"
+            ).pack(fill="x", pady=(0, 20))
+        
+        # ============================================================
+        # OPERATIONS TABLE
+        # ============================================================
+        table_card = ctk.CTkFrame(
+            main_container,
+            corner_radius=12,
+            fg_color=self.colors["bg_secondary"],
+            border_width=1,
+            border_color=self.colors["border"]
+        )
+        table_card.pack(fill="x")
+        
+        if not PERF_ENABLED:
+            ctk.CTkLabel(
+                table_card,
+                text="Instrumentation is off (LABTRACK_PERF=0).",
+                font=ctk.CTkFont(size=14),
+                text_color=self.colors["text_secondary"]
+            ).pack(pady=50)
+            return
+        
+        headers = ["Operation", "Calls", "Errors", "Avg ms", "P95 ms", "Max ms", "Avg Rows", "Avg KB", "Recent"]
+        widths = [300, 70, 70, 90, 90, 90, 90, 80, 170]
+        for i, (header, width) in enumerate(zip(headers, widths)):
+            ctk.CTkLabel(
+                table_card,
+                text=header.upper(),
+                font=ctk.CTkFont(size=10, weight="bold"),
+                text_color=self.colors["text_secondary"],
+                width=width,
+                anchor="w"
+            ).grid(row=0, column=i, padx=(20 if i == 0 else 4, 4), pady=(16, 8), sticky="w")
+        
+        for row, op in enumerate(operations[:60], start=1):
+            p95 = "> 5000" if op["p95_ms"] == float("inf") else f"<= {op['p95_ms']:g}"
+            values = [
+                op["name"], str(op["count"]), str(op["errors"]), f"{op['avg_ms']:.1f}", p95,
+                f"{op['max_ms']:.1f}", "-" if op["avg_rows"] is None else f"{op['avg_rows']:g}",
+                "-" if op["avg_bytes"] is None else f"{op['avg_bytes'] / 1024:.1f}"
+            ]
+            for i, value in enumerate(values):
+                ctk.CTkLabel(
+                    table_card,
+                    text=value,
+                    font=ctk.CTkFont(size=12),
+                    text_color=self.colors["status_damaged"] if i == 2 and op["errors"] else self.colors["text_primary"],
+                    width=widths[i],
+                    anchor="w"
+                ).grid(row=row, column=i, padx=(20 if i == 0 else 4, 4), pady=2, sticky="w")
+            sparkline = CanvasSparkline(table_card, self.colors, width=widths[-1], height=24)
+            sparkline.grid(row=row, column=len(values), padx=(4, 20), pady=2, sticky="w")
+            sparkline.set_data(tuple(PERF.recent(op["name"], limit=40)))
+    
+    def _reset_performance_stats(self):
+        """Clear the recorded spans and reload the Performance view."""
+        PERF.reset()
+        self._switch_view("performance", refresh=True)
+    
+    def _export_performance_log(self):
+        """Save PERF spans and cache statistics as JSON lines (for offline analysis)."""
+        file_path = filedialog.asksaveasfilename(
+            title="Export Performance Data",
+            defaultextension=".jsonl",
+            initialfile=f"labtrack_perf_{datetime.now():%Y%m%d_%H%M%S}.jsonl",
+            filetypes=[("JSON Lines", "*.jsonl"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return  # User cancelled
+        
+        extra = {
+            f"cache:{name}": stat for name, stat in self.db.query_cache.stats().items()
+        }
+        for i, report in enumerate(QUERY_AUDIT.suspects()):
+            extra[f"n_plus_one:{i}"] = report
+        if self.stall_watchdog:
+            for i, stall in enumerate(self.stall_watchdog.stall_summary(limit=STALL_WORST_KEPT)):
+                extra[f"stall:{i}"] = stall
+        try:
+            lines = PERF.export_jsonl(file_path, extra)
+        except OSError as e:
+            self._show_error(f"Could not write {file_path}: {e}", "Export Failed")
+            return
+        self._show_success(f"Exported {lines} records to {os.path.basename(file_path)}.")
     
     def _show_students_view(self):
         """
@@ -5274,76 +9433,90 @@ class LabApp(ctk.CTk):
             label.grid(row=0, column=i, padx=30, pady=20, sticky="w")
         
         # Student data rows
-        for student in students_list:
-            row_card = ctk.CTkFrame(
-                parent, 
-                corner_radius=12,
-                fg_color=self.colors["bg_secondary"],
-                border_width=1,
-                border_color=self.colors["border"]
-            )
-            row_card.pack(fill="x", pady=8, padx=0)
-            
-            # Student ID
-            id_label = ctk.CTkLabel(
-                row_card, 
-                text=student.get("student_id", "N/A"), 
-                font=ctk.CTkFont(size=15),
-                text_color=self.colors["text_primary"],
-                width=150,
-                anchor="w"
-            )
-            id_label.grid(row=0, column=0, padx=30, pady=20, sticky="w")
-            
-            # Name
-            name_label = ctk.CTkLabel(
-                row_card, 
-                text=student.get("name", "N/A"), 
-                font=ctk.CTkFont(size=15),
-                text_color=self.colors["text_primary"],
-                width=250,
-                anchor="w"
-            )
-            name_label.grid(row=0, column=1, padx=30, pady=20, sticky="w")
-            
-            # Phone
-            phone_label = ctk.CTkLabel(
-                row_card, 
-                text=student.get("phone", "N/A"), 
-                font=ctk.CTkFont(size=15),
-                text_color=self.colors["text_secondary"],
-                width=180,
-                anchor="w"
-            )
-            phone_label.grid(row=0, column=2, padx=30, pady=20, sticky="w")
-            
-            # Email
-            email_label = ctk.CTkLabel(
-                row_card, 
-                text=student.get("email", "N/A"), 
-                font=ctk.CTkFont(size=15),
-                text_color=self.colors["text_secondary"],
-                width=300,
-                anchor="w"
-            )
-            email_label.grid(row=0, column=3, padx=30, pady=20, sticky="w")
-            
-            # Actions: Remove button
-            actions_frame = ctk.CTkFrame(row_card, fg_color="transparent")
-            actions_frame.grid(row=0, column=4, padx=30, pady=20, sticky="e")
-            
-            remove_btn = ctk.CTkButton(
-                actions_frame,
-                text="Remove",
-                width=100,
-                height=36,
-                font=ctk.CTkFont(size=12, weight="bold"),
-                fg_color=self.colors["status_damaged"],
-                hover_color="#dc2626",
-                corner_radius=8,
-                command=lambda s=student: self._remove_student(s)
-            )
-            remove_btn.pack()
+        # PERFORMANCE: Rows are built in time-budgeted batches (see CONFIG ZONE: Row Rendering)
+        self._row_renderer.start(
+            "students", students_list,
+            lambda student: self._create_student_row(parent, student),
+            parent=parent
+        )
+    
+    def _create_student_row(self, parent, student: Dict):
+        """
+        Create one student row card with a Remove button.
+        
+        Args:
+            parent: The frame the rows are packed into
+            student: Student record
+        """
+        row_card = ctk.CTkFrame(
+            parent, 
+            corner_radius=12,
+            fg_color=self.colors["bg_secondary"],
+            border_width=1,
+            border_color=self.colors["border"]
+        )
+        row_card.pack(fill="x", pady=8, padx=0)
+
+        # Student ID
+        id_label = ctk.CTkLabel(
+            row_card, 
+            text=student.get("student_id", "N/A"), 
+            font=ctk.CTkFont(size=15),
+            text_color=self.colors["text_primary"],
+            width=150,
+            anchor="w"
+        )
+        id_label.grid(row=0, column=0, padx=30, pady=20, sticky="w")
+
+        # Name
+        name_label = ctk.CTkLabel(
+            row_card, 
+            text=student.get("name", "N/A"), 
+            font=ctk.CTkFont(size=15),
+            text_color=self.colors["text_primary"],
+            width=250,
+            anchor="w"
+        )
+        name_label.grid(row=0, column=1, padx=30, pady=20, sticky="w")
+
+        # Phone
+        phone_label = ctk.CTkLabel(
+            row_card, 
+            text=student.get("phone", "N/A"), 
+            font=ctk.CTkFont(size=15),
+            text_color=self.colors["text_secondary"],
+            width=180,
+            anchor="w"
+        )
+        phone_label.grid(row=0, column=2, padx=30, pady=20, sticky="w")
+
+        # Email
+        email_label = ctk.CTkLabel(
+            row_card, 
+            text=student.get("email", "N/A"), 
+            font=ctk.CTkFont(size=15),
+            text_color=self.colors["text_secondary"],
+            width=300,
+            anchor="w"
+        )
+        email_label.grid(row=0, column=3, padx=30, pady=20, sticky="w")
+
+        # Actions: Remove button
+        actions_frame = ctk.CTkFrame(row_card, fg_color="transparent")
+        actions_frame.grid(row=0, column=4, padx=30, pady=20, sticky="e")
+
+        remove_btn = ctk.CTkButton(
+            actions_frame,
+            text="Remove",
+            width=100,
+            height=36,
+            font=ctk.CTkFont(size=12, weight="bold"),
+            fg_color=self.colors["status_damaged"],
+            hover_color="#dc2626",
+            corner_radius=8,
+            command=lambda s=student: self._remove_student(s)
+        )
+        remove_btn.pack()
     
     def _show_add_student_form(self):
         """Show a form to add a new student."""
@@ -5555,8 +9728,7 @@ class LabApp(ctk.CTk):
         student_id_result = self.db.create_student(student_data)
         
         if student_id_result:
-            # PERFORMANCE: Invalidate cache after data mutation
-            self._invalidate_cache(["students"])
+            # PERFORMANCE: The StudentAdded event already added it to the cache
             
             # Success - data has been saved to Supabase (if connected) or mock data
             success_popup = ctk.CTkToplevel(self)
@@ -5602,7 +9774,7 @@ class LabApp(ctk.CTk):
         """Close success popup and form, then refresh students view."""
         success_popup.destroy()
         form_popup.destroy()
-        self._switch_view("students")
+        self._switch_view("students", refresh=True)
     
     def _remove_student(self, student: Dict):
         """Remove a student after confirmation."""
@@ -5665,10 +9837,9 @@ class LabApp(ctk.CTk):
         success = self.db.delete_student(student["id"])
         
         if success:
-            # PERFORMANCE: Invalidate cache after data mutation
-            self._invalidate_cache(["students"])
+            # PERFORMANCE: The StudentRemoved event already removed it from the cache
             
-            self._switch_view("students")
+            self._switch_view("students", refresh=True)
             self._show_success(f"Student '{student.get('name', 'N/A')}' removed successfully.")
         else:
             self._show_error("Failed to remove student. Please try again.", "Error")
@@ -5676,6 +9847,7 @@ class LabApp(ctk.CTk):
 
 def main():
     """Main entry point."""
+    configure_logging()
     app = LabApp()
     app.mainloop()
 
@@ -192,7 +192,366 @@ CREATE POLICY "Allow all for authenticated users" ON transaction_items
     FOR ALL USING (true);
 
 -- ============================================================================
--- 9. SAMPLE DATA (OPTIONAL - FOR TESTING)
+-- 9. OFFLINE WRITE JOURNAL (IDEMPOTENCY KEYS)
+-- ============================================================================
+-- LabTrack journals writes locally while the network is down and replays them
+-- when it returns. Every journaled write carries an op_key:
+-- - client_writes records the op_keys that have been applied, so a replay that
+--   is interrupted and repeated skips them
+-- - transactions.client_ref lets a replayed issue find its transaction instead
+--   of issuing twice (see issue_items() in section 10)
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS client_ref TEXT UNIQUE;
+
+CREATE TABLE IF NOT EXISTS client_writes (
+    op_key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    applied_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE client_writes ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow all for authenticated users" ON client_writes
+    FOR ALL USING (true);
+
+-- ============================================================================
+-- 10. ATOMIC ISSUE FUNCTIONS
+-- ============================================================================
+-- issue_items() claims every cart item in one transaction. The item rows are
+-- locked first, so when two stations issue the same item the second one waits,
+-- then sees it as Issued. If ANY item is already Issued (or missing) nothing is
+-- written and the current status of every requested item is returned, so the
+-- app can report exactly which items lost the race.
+--
+-- Returns: {"transaction_id": <id or null>, "items": [{"id": .., "status": ..}]}
+-- ("items" is only filled in when the issue was refused)
+CREATE OR REPLACE FUNCTION issue_items(
+    p_student_id BIGINT,
+    p_item_ids BIGINT[],
+    p_issuer_id BIGINT DEFAULT NULL,
+    p_issue_date TIMESTAMPTZ DEFAULT NULL,
+    p_expected_return_date DATE DEFAULT NULL,
+    p_client_ref TEXT DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_transaction_id BIGINT;
+    v_items JSONB;
+    v_lost INTEGER;
+BEGIN
+    -- Replayed offline write: the transaction already exists
+    IF p_client_ref IS NOT NULL THEN
+        SELECT id INTO v_transaction_id FROM transactions WHERE client_ref = p_client_ref;
+        IF FOUND THEN
+            RETURN jsonb_build_object('transaction_id', v_transaction_id, 'items', '[]'::jsonb);
+        END IF;
+    END IF;
+
+    -- Lock the cart's rows (in id order, so competing stations cannot deadlock)
+    PERFORM 1 FROM items WHERE id = ANY(p_item_ids) ORDER BY id FOR UPDATE;
+
+    SELECT COUNT(*) INTO v_lost
+    FROM unnest(p_item_ids) AS requested(id)
+    LEFT JOIN items ON items.id = requested.id
+    WHERE items.id IS NULL OR items.status = 'Issued';
+
+    IF v_lost > 0 THEN
+        SELECT jsonb_agg(jsonb_build_object('id', requested.id, 'status', items.status))
+        INTO v_items
+        FROM unnest(p_item_ids) AS requested(id)
+        LEFT JOIN items ON items.id = requested.id;
+        RETURN jsonb_build_object('transaction_id', NULL, 'items', v_items);
+    END IF;
+
+    INSERT INTO transactions (student_id, issuer_id, status, issue_date, expected_return_date, client_ref)
+    VALUES (p_student_id, p_issuer_id, 'Active', COALESCE(p_issue_date::date, CURRENT_DATE),
+            p_expected_return_date, p_client_ref)
+    RETURNING id INTO v_transaction_id;
+
+    INSERT INTO transaction_items (transaction_id, item_id)
+    SELECT v_transaction_id, item_id FROM unnest(p_item_ids) AS item_id;
+
+    UPDATE items SET status = 'Issued' WHERE id = ANY(p_item_ids);
+
+    RETURN jsonb_build_object('transaction_id', v_transaction_id, 'items', '[]'::jsonb);
+END;
+$$;
+
+-- issue_items_batch() runs several issues in one round trip (offline journal
+-- replay). p_issues is a JSON array of objects with the issue_items() argument
+-- names minus the "p_" prefix; the result is the array of issue_items() results.
+CREATE OR REPLACE FUNCTION issue_items_batch(p_issues JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_issue JSONB;
+    v_results JSONB := '[]'::jsonb;
+BEGIN
+    FOR v_issue IN SELECT * FROM jsonb_array_elements(p_issues) LOOP
+        v_results := v_results || jsonb_build_array(issue_items(
+            (v_issue->>'student_id')::BIGINT,
+            ARRAY(SELECT jsonb_array_elements_text(v_issue->'item_ids')::BIGINT),
+            (v_issue->>'issuer_id')::BIGINT,
+            (v_issue->>'issue_date')::TIMESTAMPTZ,
+            (v_issue->>'expected_return_date')::DATE,
+            v_issue->>'client_ref'
+        ));
+    END LOOP;
+    RETURN v_results;
+END;
+$$;
+
+-- ============================================================================
+-- 11. SERIAL NUMBER ALLOCATOR
+-- ============================================================================
+-- One counter per serial prefix ("ARD", "RAS", ...). allocate_serials()
+-- reserves a contiguous block of N serial numbers in one atomic round trip,
+-- instead of downloading every serial of a component and taking the max.
+-- Concurrent restocks of the same prefix queue on the counter row, so they
+-- can never hand out the same numbers.
+CREATE TABLE IF NOT EXISTS serial_counters (
+    prefix TEXT PRIMARY KEY,
+    last_value BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE serial_counters ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow all for authenticated users" ON serial_counters
+    FOR ALL USING (true);
+
+-- Returns the reserved serials, e.g. allocate_serials('ARD', 3) -> {ARD004,ARD005,ARD006}.
+-- Numbers are zero-padded to p_min_width digits, or to the width of the block's
+-- largest number if that is wider, so every serial in a block has the same width.
+CREATE OR REPLACE FUNCTION allocate_serials(
+    p_prefix TEXT,
+    p_count INTEGER,
+    p_min_width INTEGER DEFAULT 3
+) RETURNS TEXT[]
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_last BIGINT;
+    v_width INTEGER;
+BEGIN
+    IF p_count <= 0 THEN
+        RETURN ARRAY[]::TEXT[];
+    END IF;
+
+    -- First use of a prefix: seed the counter from the serials already in items
+    INSERT INTO serial_counters (prefix, last_value)
+    SELECT p_prefix, COALESCE(MAX(substring(serial_number FROM length(p_prefix) + 1)::BIGINT), 0)
+    FROM items
+    WHERE serial_number LIKE p_prefix || '%'
+        AND substring(serial_number FROM length(p_prefix) + 1) ~ '^[0-9]{1,18}$'
+    ON CONFLICT (prefix) DO NOTHING;
+
+    UPDATE serial_counters
+    SET last_value = last_value + p_count, updated_at = NOW()
+    WHERE prefix = p_prefix
+    RETURNING last_value INTO v_last;
+
+    v_width := GREATEST(p_min_width, length(v_last::TEXT));
+    RETURN ARRAY(
+        SELECT p_prefix || lpad(n::TEXT, v_width, '0')
+        FROM generate_series(v_last - p_count + 1, v_last) AS n
+    );
+END;
+$$;
+
+-- ============================================================================
+-- 12. ATOMIC RESTOCK FUNCTIONS
+-- ============================================================================
+-- restock_apply() inserts a component's new items and increments total_qty
+-- in the same transaction (serials come from allocate_serials() unless manual
+-- serials are given). The app calls it through:
+-- - restock_items(): one component, one round trip
+-- - restock_items_batch(): a whole delivery or CSV import, one round trip;
+--   components given by name are created if they do not exist yet
+-- Both accept the offline journal's op_key as p_client_ref and record it in
+-- client_writes in the same transaction, so a replayed restock never adds the
+-- items twice.
+CREATE OR REPLACE FUNCTION restock_apply(
+    p_inventory_id BIGINT,
+    p_quantity INTEGER,
+    p_serials TEXT[] DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_name TEXT;
+    v_serials TEXT[];
+    v_items JSONB;
+    v_inventory JSONB;
+BEGIN
+    -- Lock the component row: concurrent restocks of it apply one after another
+    SELECT name INTO v_name FROM inventory WHERE id = p_inventory_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Inventory % not found', p_inventory_id;
+    END IF;
+
+    -- Same prefix rule as serial_prefix() in the app: first 3 letters, no spaces, X-padded
+    v_serials := COALESCE(
+        p_serials,
+        allocate_serials(rpad(replace(upper(left(v_name, 3)), ' ', ''), 3, 'X'), p_quantity)
+    );
+
+    WITH inserted AS (
+        INSERT INTO items (serial_number, status, inventory_id)
+        SELECT serial, 'Available', p_inventory_id FROM unnest(v_serials) AS serial
+        RETURNING id, serial_number, status, inventory_id
+    )
+    SELECT COALESCE(jsonb_agg(to_jsonb(inserted)), '[]'::jsonb) INTO v_items FROM inserted;
+
+    UPDATE inventory SET total_qty = COALESCE(total_qty, 0) + cardinality(v_serials)
+    WHERE id = p_inventory_id
+    RETURNING to_jsonb(inventory.*) INTO v_inventory;
+
+    RETURN jsonb_build_object('inventory', v_inventory, 'items', v_items);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION restock_items(
+    p_inventory_id BIGINT,
+    p_quantity INTEGER,
+    p_serials TEXT[] DEFAULT NULL,
+    p_client_ref TEXT DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF p_client_ref IS NOT NULL THEN
+        INSERT INTO client_writes (op_key, method) VALUES (p_client_ref, 'restock_inventory')
+        ON CONFLICT (op_key) DO NOTHING;
+        IF NOT FOUND THEN
+            RETURN jsonb_build_object('duplicate', true);
+        END IF;
+    END IF;
+    RETURN restock_apply(p_inventory_id, p_quantity, p_serials);
+END;
+$$;
+
+-- p_restocks: JSON array of {"inventory_id": ..} or {"name": .., "description": ..},
+-- each with "quantity" (auto serials) and/or "serials" (manual serials).
+-- Returns one restock_apply() result per element, plus "created": true/false.
+CREATE OR REPLACE FUNCTION restock_items_batch(
+    p_restocks JSONB,
+    p_client_ref TEXT DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_restock JSONB;
+    v_inventory_id BIGINT;
+    v_created BOOLEAN;
+    v_serials TEXT[];
+    v_results JSONB := '[]'::jsonb;
+BEGIN
+    IF p_client_ref IS NOT NULL THEN
+        INSERT INTO client_writes (op_key, method) VALUES (p_client_ref, 'restock_many')
+        ON CONFLICT (op_key) DO NOTHING;
+        IF NOT FOUND THEN
+            RETURN jsonb_build_array(jsonb_build_object('duplicate', true));
+        END IF;
+    END IF;
+
+    FOR v_restock IN SELECT * FROM jsonb_array_elements(p_restocks) LOOP
+        v_inventory_id := (v_restock->>'inventory_id')::BIGINT;
+        v_created := FALSE;
+        IF v_inventory_id IS NULL THEN
+            SELECT id INTO v_inventory_id FROM inventory WHERE lower(name) = lower(v_restock->>'name');
+            IF NOT FOUND THEN
+                INSERT INTO inventory (name, total_qty, description)
+                VALUES (v_restock->>'name', 0, v_restock->>'description')
+                RETURNING id INTO v_inventory_id;
+                v_created := TRUE;
+            END IF;
+        END IF;
+
+        v_serials := NULL;
+        IF jsonb_typeof(v_restock->'serials') = 'array' THEN
+            v_serials := ARRAY(SELECT jsonb_array_elements_text(v_restock->'serials'));
+        END IF;
+
+        v_results := v_results || jsonb_build_array(
+            restock_apply(v_inventory_id, COALESCE((v_restock->>'quantity')::INTEGER, 0), v_serials)
+            || jsonb_build_object('created', v_created)
+        );
+    END LOOP;
+    RETURN v_results;
+END;
+$$;
+
+-- ============================================================================
+-- 13. DASHBOARD SNAPSHOT FUNCTION
+-- ============================================================================
+-- Everything the Dashboard shows, aggregated in the database and returned as
+-- one JSON document: summary counts, items per status, the top-N components
+-- by available stock, overdue items and the recent activity feed. The app
+-- loads the home screen with this single round trip instead of downloading
+-- the items and students tables plus three more queries.
+CREATE OR REPLACE FUNCTION get_dashboard_snapshot(
+    p_overdue_days INTEGER DEFAULT 7,
+    p_top_n INTEGER DEFAULT 5,
+    p_recent_limit INTEGER DEFAULT 5
+) RETURNS JSONB
+LANGUAGE sql STABLE AS $$
+    SELECT jsonb_build_object(
+        'total_items', (SELECT count(*) FROM items),
+        'issued', (SELECT count(*) FROM items WHERE status = 'Issued'),
+        'total_students', (SELECT count(*) FROM students),
+        'status_counts', COALESCE((
+            SELECT jsonb_object_agg(status, n)
+            FROM (SELECT status, count(*) AS n FROM items GROUP BY status) s
+        ), '{}'::jsonb),
+        'top_components', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('id', id, 'name', name, 'count', n) ORDER BY n DESC, id)
+            FROM (
+                SELECT inv.id, inv.name, count(i.id) AS n
+                FROM inventory inv
+                LEFT JOIN items i ON i.inventory_id = inv.id AND i.status = 'Available'
+                GROUP BY inv.id, inv.name
+                ORDER BY n DESC, inv.id
+                LIMIT p_top_n
+            ) t
+        ), '[]'::jsonb),
+        'overdue', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'id', i.id,
+                'serial_number', i.serial_number,
+                'status', i.status,
+                'inventory_id', i.inventory_id,
+                'transaction_id', t.id,
+                'days_overdue', CURRENT_DATE - t.issue_date
+            ))
+            FROM transactions t
+            JOIN transaction_items ti ON ti.transaction_id = t.id
+            JOIN items i ON i.id = ti.item_id
+            WHERE t.status = 'Active' AND t.issue_date < CURRENT_DATE - p_overdue_days
+        ), '[]'::jsonb),
+        'recent', COALESCE((
+            SELECT jsonb_agg(r.activity ORDER BY r.created_at DESC, r.line)
+            FROM (
+                SELECT jsonb_build_object(
+                           'student_name', COALESCE(s.name, 'Unknown'),
+                           'item_name', COALESCE(inv.name, 'Unknown'),
+                           'serial_number', i.serial_number,
+                           'action', CASE WHEN t.status = 'Active' THEN 'Issue' ELSE 'Return' END,
+                           'timestamp', t.created_at,
+                           'transaction_id', t.id
+                       ) AS activity,
+                       t.created_at,
+                       ti.id AS line
+                FROM (SELECT * FROM transactions ORDER BY created_at DESC LIMIT p_recent_limit) t
+                JOIN transaction_items ti ON ti.transaction_id = t.id
+                JOIN items i ON i.id = ti.item_id
+                LEFT JOIN students s ON s.id = t.student_id
+                LEFT JOIN inventory inv ON inv.id = i.inventory_id
+                ORDER BY t.created_at DESC, ti.id
+                LIMIT p_recent_limit
+            ) r
+        ), '[]'::jsonb)
+    );
+$$;
+
+-- ============================================================================
+-- 14. SAMPLE DATA (OPTIONAL - FOR TESTING)
 -- ============================================================================
 -- Uncomment the section below to insert sample data for testing
 
@@ -265,7 +624,7 @@ END $$;
 */
 
 -- ============================================================================
--- 10. VERIFICATION QUERIES
+-- 15. VERIFICATION QUERIES
 -- ============================================================================
 -- Run these queries to verify your setup:
 